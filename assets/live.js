@@ -0,0 +1,63 @@
+// Stock Oracle Group
+// 10/19/2026
+// Live mode: subscribes to /live/stream and updates the price chart as bars arrive
+
+(function () {
+    let source = null;
+
+    function setText(id, text) {
+        const element = document.getElementById(id);
+        if (element) {
+            element.textContent = text;
+        }
+    }
+
+    function stop() {
+        if (source) {
+            source.close();
+            source = null;
+        }
+        setText("live-btn", "Go Live");
+        setText("live-status", "");
+    }
+
+    function start(ticker) {
+        source = new EventSource("/live/stream?ticker=" + encodeURIComponent(ticker));
+        setText("live-btn", "Stop Live");
+        setText("live-status", "Connecting to " + ticker + "…");
+
+        source.onmessage = function (message) {
+            const bar = JSON.parse(message.data);
+            setText("live-status",
+                bar.ticker + " " + bar.date + ": " + bar.price.toFixed(2) +
+                " | next bar forecast " + bar.forecast.toFixed(2) +
+                " | confidence " + (bar.confidence * 100).toFixed(2) + "%");
+
+            // Extend the first trace of the historical price chart
+            const plot = document.querySelector("#graph-container .js-plotly-plot");
+            if (plot && window.Plotly) {
+                const trace = plot.data && plot.data[0];
+                const last = trace && trace.x.length ? trace.x[trace.x.length - 1] : null;
+                if (last !== bar.date) {
+                    window.Plotly.extendTraces(plot, {x: [[bar.date]], y: [[bar.price]]}, [0]);
+                }
+            }
+        };
+        source.onerror = function () {
+            setText("live-status", "Live connection lost, retrying…");
+        };
+    }
+
+    document.addEventListener("click", function (event) {
+        if (!event.target || event.target.id !== "live-btn") {
+            return;
+        }
+        if (source) {
+            stop();
+            return;
+        }
+        const input = document.getElementById("ticker-input");
+        const ticker = (input && input.value ? input.value : "AAPL").trim().toUpperCase();
+        start(ticker);
+    });
+})();
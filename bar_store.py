@@ -0,0 +1,241 @@
+# Stock Oracle Group
+# 10/19/2026
+# Columnar OHLCV storage with compact dtypes
+
+"""
+The CSV partitions keep only Date,Value (the close). The bar store keeps the whole bar in
+fixed-width columns, one raw file per column, memory-mapped on load:
+
+    <root>/<TICKER>.<interval>/CURRENT           name of the live generation directory
+    <root>/<TICKER>.<interval>/<gen>/date.i8     bar time, int64 nanoseconds since the epoch (UTC)
+    <root>/<TICKER>.<interval>/<gen>/open.f4     float32 (likewise high.f4, low.f4, close.f4)
+    <root>/<TICKER>.<interval>/<gen>/volume.i8   int64
+    <root>/<TICKER>.<interval>/<gen>/meta.json   row count
+
+A bar takes 32 bytes instead of 48 as float64 columns, and a small fraction of what Python
+float objects need. Writes go to a new "<gen>.part" staging directory. Once complete it is
+renamed to <gen> and CURRENT is atomically replaced to point at it, so readers see either the
+old or the new bars, never a half-written or missing ticker. The previous generation is kept
+until the next commit, for readers that resolved CURRENT just before the swap.
+"""
+
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+
+COLUMNS = {
+    "date": np.int64,
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "volume": np.int64,
+}
+EXTENSIONS = {np.int64: "i8", np.float32: "f4"}
+
+
+class Bars:
+    """
+        OHLCV bars of one ticker as columns. Arrays may be in-memory or memory-mapped.
+    """
+
+    def __init__(self, date, open, high, low, close, volume):
+        """
+            Args:
+                date (np.ndarray): int64 nanoseconds since the epoch (UTC), ascending.
+                open, high, low, close (np.ndarray): float32 prices.
+                volume (np.ndarray): int64 traded volume.
+        """
+        self.date = date
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Bars":
+        """
+            Builds bars from a frame with a "Date" column (strings or timestamps) and
+            Open/High/Low/Close/Volume columns. Missing Open/High/Low fall back to Close and a
+            missing Volume to 0.
+        """
+        dates = pd.to_datetime(df["Date"], format="ISO8601")
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+        close = df["Close"].to_numpy(dtype=np.float32)
+
+        def column(name, fallback):
+            return df[name].to_numpy(dtype=fallback.dtype) if name in df else fallback
+
+        volume = df["Volume"].fillna(0).to_numpy(dtype=np.int64) if "Volume" in df else np.zeros(len(df), np.int64)
+        return cls(dates.to_numpy(dtype="datetime64[ns]").astype(np.int64), column("Open", close),
+                   column("High", close), column("Low", close), close, volume)
+
+    def __len__(self):
+        return self.close.size
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    def columns(self) -> dict:
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def timestamps(self) -> np.ndarray:
+        """
+            Bar times as datetime64[ns].
+        """
+        return np.asarray(self.date).view("datetime64[ns]")
+
+    def range(self) -> np.ndarray:
+        """
+            High-low range relative to the close, float32.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num((self.high - self.low) / self.close)
+
+
+POINTER = "CURRENT"
+
+
+def current_generation(directory: str):
+    """
+        Returns the live generation directory of a ticker's bars, or None if nothing is stored.
+    """
+    try:
+        with open(os.path.join(directory, POINTER), "r") as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def publish_generation(directory: str, generation: str):
+    """
+        Atomically points CURRENT at a complete generation directory inside `directory`, then deletes
+        everything older than the generation it replaced. Staging (".part") entries are left alone.
+
+        Args:
+            directory (str): Directory holding the generations and CURRENT.
+            generation (str): Name of the generation to publish.
+    """
+    previous = current_generation(directory)
+    pointer = os.path.join(directory, POINTER)
+    with open(pointer + ".tmp", "w") as f:
+        f.write(generation)
+    os.replace(pointer + ".tmp", pointer)
+
+    keep = {generation, os.path.basename(previous or ""), POINTER}
+    for name in os.listdir(directory):
+        if name in keep or name.endswith((".part", ".tmp")):
+            continue
+        path = os.path.join(directory, name)
+        # Still memory-mapped files (on Windows) are left for a later publish
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class BarWriter:
+    """
+        Streams bars of one ticker into a new generation directory; `commit` publishes it.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.generation = f"{time.time_ns()}-{os.getpid()}"
+        self.staging = os.path.join(directory, self.generation + ".part")
+        self.rows = 0
+        self.last_date = None
+        os.makedirs(self.staging)
+
+    def append(self, bars: Bars) -> int:
+        """
+            Appends the bars newer than the last written one.
+
+            Returns:
+                int: Rows written.
+        """
+        keep = slice(None) if self.last_date is None else np.asarray(bars.date) > self.last_date
+        columns = {name: np.asarray(values)[keep] for name, values in bars.columns().items()}
+        if columns["date"].size == 0:
+            return 0
+        for name, dtype in COLUMNS.items():
+            with open(os.path.join(self.staging, f"{name}.{EXTENSIONS[dtype]}"), "ab") as f:
+                columns[name].astype(dtype).tofile(f)
+        self.rows += columns["date"].size
+        self.last_date = int(columns["date"][-1])
+        return columns["date"].size
+
+    def commit(self):
+        """
+            Publishes the staged columns by pointing CURRENT at them, then deletes the generations
+            older than the one just replaced.
+        """
+        with open(os.path.join(self.staging, "meta.json"), "w") as f:
+            json.dump({"rows": self.rows}, f)
+        os.replace(self.staging, os.path.join(self.directory, self.generation))
+        publish_generation(self.directory, self.generation)
+
+    def abort(self):
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+class BarStore:
+    """
+        Directory of columnar OHLCV bars, one sub-directory per ticker and interval.
+    """
+
+    def __init__(self, root: str = "bars"):
+        """
+            Args:
+                root (str): Directory holding the bars. Default is "bars".
+        """
+        self.root = root
+
+    def path(self, ticker: str, interval: str = "1d") -> str:
+        return os.path.join(self.root, f"{ticker.upper()}.{interval}")
+
+    def writer(self, ticker: str, interval: str = "1d") -> BarWriter:
+        """
+            Starts replacing a ticker's bars; see `BarWriter`.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        return BarWriter(self.path(ticker, interval))
+
+    def write(self, ticker: str, bars: Bars, interval: str = "1d"):
+        """
+            Replaces a ticker's bars.
+        """
+        writer = self.writer(ticker, interval)
+        writer.append(bars)
+        writer.commit()
+
+    def load(self, ticker: str, interval: str = "1d"):
+        """
+            Memory-maps a ticker's bars.
+
+            Returns:
+                Bars or None: None if nothing is stored.
+        """
+        directory = current_generation(self.path(ticker, interval))
+        if directory is None:
+            return None
+        meta = os.path.join(directory, "meta.json")
+        with open(meta, "r") as f:
+            rows = json.load(f)["rows"]
+
+        def mapped(name, dtype):
+            if rows == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(os.path.join(directory, f"{name}.{EXTENSIONS[dtype]}"), dtype=dtype, mode="r",
+                             shape=(rows,))
+
+        return Bars(**{name: mapped(name, dtype) for name, dtype in COLUMNS.items()})
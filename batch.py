@@ -0,0 +1,223 @@
+# Stock Oracle Group
+# 10/19/2026
+# Headless batch runner for universe backtests
+
+"""
+Runs `check_confidence`-style backtests for many tickers and parameter combinations without
+the dashboard. Price history is read from the local partitions written by
+`fetch_stock_data.fetch_and_save_many` (data/<TICKER>.csv), nothing from Dash is imported, and
+results are appended to a directory of Parquet part files as they are produced, so an
+interrupted run keeps everything it flushed. Re-running with the same output directory skips
+every (ticker, model, days, lag_days) combination that is already stored without an error;
+failed combinations are retried.
+
+Usage:
+    python batch.py AAPL MSFT NVDA --days 20 60 --lag-days 5 20 --models default ridge sentimental
+    python batch.py --tickers-file watchlist.txt --output results/nightly
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import sys
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from bar_store import BarStore
+from fetch_stock_data import partition_path
+from models import MODELS as REGISTERED_MODELS
+from fetch_stock_news import get_daily_sentiment
+from predictor_default import PredictedGraph, auc_confidence
+from predictor_sentimental import PredictorSentimental
+
+MODELS = tuple(REGISTERED_MODELS) + ("sentimental",)
+
+SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("model", pa.string()),
+    ("days", pa.int32()),
+    ("lag_days", pa.int32()),
+    ("confidence", pa.float64()),
+    ("mae", pa.float64()),
+    ("rmse", pa.float64()),
+    ("next_prediction", pa.float64()),
+    ("rows", pa.int32()),
+    ("last_date", pa.string()),
+    ("elapsed_seconds", pa.float64()),
+    ("error", pa.string()),
+])
+
+KEY_COLUMNS = ["ticker", "model", "days", "lag_days"]
+
+
+def completed_keys(output: str) -> set:
+    """
+        Collects the (ticker, model, days, lag_days) combinations already computed successfully in an
+        output directory. Rows with an error are not counted, so a resumed run retries them (the failed
+        row stays in its part file next to the new one).
+
+        Args:
+            output (str): Directory of Parquet part files.
+
+        Returns:
+            set of tuple: The stored combinations without an error.
+    """
+    keys = set()
+    for part in sorted(glob.glob(os.path.join(output, "part-*.parquet"))):
+        table = pq.read_table(part, columns=KEY_COLUMNS + ["error"])
+        errors = table.column("error").to_pylist()
+        rows = zip(*(table.column(name).to_pylist() for name in KEY_COLUMNS))
+        keys.update(key for key, error in zip(rows, errors) if not error)
+    return keys
+
+
+def write_part(rows: list, output: str) -> str:
+    """
+        Writes a list of result rows as a new Parquet part file. The file is written under a
+        temporary name and renamed, so readers never see a half-written part.
+
+        Returns:
+            str: Path of the part file.
+    """
+    os.makedirs(output, exist_ok=True)
+    columns = {field.name: [row.get(field.name) for row in rows] for field in SCHEMA}
+    table = pa.table(columns, schema=SCHEMA)
+    name = f"part-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{time.perf_counter_ns() % 10**9:09d}.parquet"
+    path = os.path.join(output, name)
+    pq.write_table(table, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def run_backtest(ticker: str, model: str, days: int, lag_days: int, data_dir: str = "data",
+                 bars_dir: str = "bars") -> dict:
+    """
+        Backtests one combination on a ticker's local price history.
+
+        Registered models (see `models.py`, "default" being the AR model) run the backtest of
+        `PredictedGraph.check_confidence`. The sentimental
+        model replays `PredictorSentimental.predict_days_ahead` and is scored with the same AUC
+        confidence against the real tail. OHLCV bars for the ARX model are read from `bars_dir`, and its
+        daily sentiment regressor comes from `get_daily_sentiment`.
+
+        Returns:
+            dict: One result row (see SCHEMA). Failures are reported in the "error" field.
+    """
+    filename = partition_path(ticker, data_dir)
+    row = {"ticker": ticker, "model": model, "days": days, "lag_days": lag_days}
+    start = time.perf_counter()
+    try:
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"no local data at {filename}")
+        real = PredictedGraph(filename=filename, bars=BarStore(bars_dir).load(ticker))
+        real.read_csv()
+        if not real.data:
+            raise ValueError(f"{filename} is empty")
+
+        if model in REGISTERED_MODELS:
+            if model == "arx":
+                real.sentiment = get_daily_sentiment(ticker)
+            confidence, predicted = real.check_confidence(days, lag_days, return_graph=True, model=model)
+            next_prediction = real.predict_tomorrow(lag_days, model=model)
+        elif model == "sentimental":
+            predictor = PredictorSentimental(ticker, filename=filename)
+            predicted = predictor.predict_days_ahead(days, lag_days)
+            confidence = None
+            next_prediction = predictor.predict_tomorrow(lag_days, 0)
+        else:
+            raise ValueError(f"unknown model: {model}")
+
+        window = min(days, len(real.data) - 1, len(predicted.data))
+        pred_tail = np.array([value for _, value in predicted.data[-window:]], dtype=float)
+        real_tail = np.array([value for _, value in real.data[-window:]], dtype=float)
+        if confidence is None:
+            confidence = auc_confidence(pred_tail, real_tail)
+        errors = pred_tail - real_tail
+
+        row.update(
+            confidence=float(confidence),
+            mae=float(np.mean(np.abs(errors))),
+            rmse=float(np.sqrt(np.mean(errors ** 2))),
+            next_prediction=float(next_prediction),
+            rows=len(real.data),
+            last_date=real.data[-1][0],
+        )
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["elapsed_seconds"] = time.perf_counter() - start
+    return row
+
+
+def run_batch(tickers, days_grid, lag_grid, models=("default",), output: str = "results",
+              data_dir: str = "data", flush_every: int = 25, resume: bool = True) -> dict:
+    """
+        Runs every (ticker, model, days, lag_days) combination and appends the results to `output`.
+
+        Args:
+            tickers (list of str): Tickers to backtest.
+            days_grid (list of int): Backtest windows.
+            lag_grid (list of int): Lag days of the AR model.
+            models (list of str): Registered model names and "sentimental".
+            output (str): Directory of Parquet part files.
+            data_dir (str): Directory of the local price partitions.
+            flush_every (int): Results buffered before a part file is written.
+            resume (bool): Skip combinations already stored without an error in `output`.
+
+        Returns:
+            dict: {"computed": n, "skipped": n, "failed": n}
+    """
+    done = completed_keys(output) if resume else set()
+    buffer = []
+    counts = {"computed": 0, "skipped": 0, "failed": 0}
+
+    for ticker, model, days, lag_days in itertools.product(
+            [t.upper() for t in tickers], models, days_grid, lag_grid):
+        if (ticker, model, days, lag_days) in done:
+            counts["skipped"] += 1
+            continue
+        row = run_backtest(ticker, model, days, lag_days, data_dir)
+        buffer.append(row)
+        counts["computed"] += 1
+        if row.get("error"):
+            counts["failed"] += 1
+            print(f"{ticker} {model} days={days} lag={lag_days}: {row['error']}")
+        if len(buffer) >= flush_every:
+            write_part(buffer, output)
+            buffer = []
+
+    if buffer:
+        write_part(buffer, output)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Stock Oracle backtests for a ticker universe.")
+    parser.add_argument("tickers", nargs="*", help="ticker symbols")
+    parser.add_argument("--tickers-file", help="file with one ticker per line")
+    parser.add_argument("--days", type=int, nargs="+", default=[20], help="backtest windows")
+    parser.add_argument("--lag-days", type=int, nargs="+", default=[20], help="AR lag days")
+    parser.add_argument("--models", nargs="+", default=["default"], choices=MODELS)
+    parser.add_argument("--data-dir", default="data", help="directory of <TICKER>.csv price partitions")
+    parser.add_argument("--output", default="results", help="directory for the Parquet results")
+    parser.add_argument("--flush-every", type=int, default=25, help="results per Parquet part file")
+    parser.add_argument("--no-resume", action="store_true", help="recompute combinations already stored")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file, "r") as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not tickers:
+        parser.error("no tickers given")
+
+    counts = run_batch(tickers, args.days, args.lag_days, args.models, args.output,
+                       args.data_dir, args.flush_every, resume=not args.no_resume)
+    print(f"Computed {counts['computed']} ({counts['failed']} failed), "
+          f"skipped {counts['skipped']} already in {args.output}")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# Stock Oracle Group
+# 10/19/2026
+# Benchmark suite for the ingestion, prediction and dashboard hot paths
+
+"""
+Times the hot paths against offline fixture data generated by `SyntheticProvider`:
+
+- Graph.read_csv
+- PredictedGraph.predict_tomorrow, predict_days_ahead, check_confidence and the bootstrap intervals
+- warm-started backtests of the registered scikit-learn models
+- PredictorSentimental.predict_days_ahead
+- the Dash callback bodies in main.py (load_real_data, check_confidence_callback, update_news)
+
+Cases are parameterized by history length, lag_days and backtest window. Results are written to a
+JSON file and compared against a stored baseline; any case slower than the baseline by more than the
+tolerance is reported and the script exits with status 1.
+
+Usage:
+    python benchmark.py                       # run, save benchmark_results.json, compare to baseline
+    python benchmark.py --update-baseline     # run and store the results as the new baseline
+    python benchmark.py --quick --filter predict_tomorrow
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+RESULTS_FILE = "benchmark_results.json"
+BASELINE_FILE = "benchmark_baseline.json"
+
+# Full and quick parameter grids
+GRID = {
+    "rows": [250, 1000, 2500],
+    "lag_days": [5, 20],
+    "days": [20, 100],
+}
+QUICK_GRID = {
+    "rows": [250],
+    "lag_days": [5],
+    "days": [20],
+}
+
+
+def measure(func, repeat: int = 3) -> float:
+    """
+        Runs `func` once to warm up, then `repeat` times, and returns the fastest run in seconds.
+    """
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25, min_delta: float = 0.001) -> list:
+    """
+        Compares benchmark timings against a baseline.
+
+        Args:
+            results (dict): Case name -> seconds for the current run.
+            baseline (dict): Case name -> seconds for the baseline run.
+            tolerance (float): Allowed relative slowdown (0.25 = 25%).
+            min_delta (float): Slowdowns smaller than this many seconds are ignored as noise.
+
+        Returns:
+            list of tuple: (case, baseline seconds, current seconds) for every regression.
+    """
+    regressions = []
+    for case, current in sorted(results.items()):
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        if current > previous * (1 + tolerance) and current - previous > min_delta:
+            regressions.append((case, previous, current))
+    return regressions
+
+
+def _cases(rows: int, grid: dict):
+    """
+        Yields (name, setup, func) for every benchmark case at one history length.
+        `setup` writes data.csv to the working directory and loads whatever the case needs.
+    """
+    from graph import Graph
+    from predictor_default import PredictedGraph
+    from predictor_sentimental import PredictorSentimental
+    from fetch_stock_data import fetch_and_save_data
+    from cache import article_title_cache, forecast_cache, news_cache, price_cache
+    import main
+
+    ticker = "BENCH"
+    state = {}
+
+    def write_csv():
+        fetch_and_save_data(ticker, "data.csv")
+
+    def cold(func):
+        # Callbacks are timed on the cold path, without the prices, news and forecasts a previous run cached
+        def run():
+            for cache in (price_cache, news_cache, forecast_cache):
+                cache.clear()
+            return func()
+        return run
+
+    def load_graph():
+        write_csv()
+        state["pg"] = PredictedGraph()
+        state["pg"].read_csv()
+
+    yield f"Graph.read_csv[rows={rows}]", write_csv, lambda: Graph().read_csv()
+    yield f"main.load_real_data[rows={rows}]", write_csv, cold(lambda: main.load_real_data(1, None, ticker))
+
+    for lag_days in grid["lag_days"]:
+        yield (f"PredictedGraph.predict_tomorrow[rows={rows},lag={lag_days}]", load_graph,
+               lambda l=lag_days: state["pg"].predict_tomorrow(l))
+
+        for days in grid["days"]:
+            params = f"rows={rows},lag={lag_days},days={days}"
+            yield (f"PredictedGraph.predict_days_ahead[{params}]", load_graph,
+                   lambda d=days, l=lag_days: state["pg"].predict_days_ahead(d, l))
+            yield (f"PredictedGraph.check_confidence[{params}]", load_graph,
+                   lambda d=days, l=lag_days: state["pg"].check_confidence(d, l))
+            yield (f"PredictedGraph.predict_intervals_days_ahead[{params},boot=1000]", load_graph,
+                   lambda d=days, l=lag_days: state["pg"].predict_intervals_days_ahead(d, l, n_boot=1000, seed=0))
+            for model in ("ridge", "elasticnet", "sgd", "gbr"):
+                yield (f"PredictedGraph.predict_days_ahead[{params},model={model}]", load_graph,
+                       lambda d=days, l=lag_days, m=model: state["pg"].predict_days_ahead(d, l, model=m))
+            yield (f"PredictorSentimental.predict_days_ahead[{params}]", write_csv,
+                   lambda d=days, l=lag_days: PredictorSentimental(ticker).predict_days_ahead(d, l))
+            for mode in ("default", "sentimental"):
+                yield (f"main.check_confidence_callback[{mode},{params}]", write_csv,
+                       cold(lambda d=days, l=lag_days, m=mode: main.check_confidence_callback(1, str(d), str(l), m, ticker)))
+
+    # Article pages are pre-resolved so the callback body is timed without network access
+    def warm_titles():
+        from fetch_stock_news import get_yahoo_finance_news
+        for article in get_yahoo_finance_news(ticker):
+            article_title_cache.set(article["url"], article["title"])
+
+    yield f"main.update_news[rows={rows},warm titles]", warm_titles, cold(lambda: main.update_news(ticker))
+
+
+def run(grid: dict, repeat: int = 3, name_filter: str = None) -> dict:
+    """
+        Runs every case of the grid in a scratch directory with a synthetic data provider installed.
+
+        Returns:
+            dict: Case name -> fastest time in seconds.
+    """
+    from providers import SyntheticProvider, set_provider, get_provider
+
+    previous_provider = get_provider()
+    previous_cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for rows in grid["rows"]:
+                set_provider(SyntheticProvider(rows=rows, seed=42))
+                for name, setup, func in _cases(rows, grid):
+                    if name_filter and name_filter not in name:
+                        continue
+                    # The fetch helpers print a line per download; keep the report readable
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        setup()
+                        results[name] = measure(func, repeat)
+                    print(f"{name:<80} {results[name] * 1000:10.2f} ms", flush=True)
+        finally:
+            os.chdir(previous_cwd)
+            set_provider(previous_provider)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Stock Oracle hot paths.")
+    parser.add_argument("--quick", action="store_true", help="run the small parameter grid only")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (fastest is kept)")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this text")
+    parser.add_argument("--output", default=RESULTS_FILE, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run(QUICK_GRID if args.quick else GRID, args.repeat, args.filter)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Saved {len(results)} results to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Stored baseline in {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 2
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSIONS (>{args.tolerance:.0%} slower than {args.baseline}):")
+        for case, previous, current in regressions:
+            print(f"  {case}: {previous * 1000:.2f} ms -> {current * 1000:.2f} ms "
+                  f"({current / previous:.2f}x)")
+        return 1
+    print(f"No regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Stock Oracle Group
+# 10/19/2026
+# Small in-memory cache with optional expiry and hit/miss accounting
+
+import threading
+import time
+from collections import OrderedDict
+from metrics import record_cache
+
+
+class Cache:
+    """
+        A thread-safe in-memory key/value cache with optional time-to-live and size bound.
+        Every lookup is counted as a hit or a miss in the metrics registry under the cache's name.
+    """
+
+    def __init__(self, name: str, ttl: float = None, maxsize: int = None):
+        """
+            Initializes an empty cache.
+
+            Args:
+                name (str): Name used to label the cache's metrics.
+                ttl (float, optional): Default seconds after which an entry expires. None keeps entries forever.
+                maxsize (int, optional): Maximum number of entries; the least recently used is evicted.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored_at, expires_at or None, value)
+
+    def get(self, key, default=None):
+        """
+            Looks up a key.
+
+            Returns:
+                The cached value, or `default` if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and time.time() > entry[1]:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        record_cache(self.name, entry is not None)
+        return entry[2] if entry is not None else default
+
+    def set(self, key, value, ttl: float = None):
+        """
+            Stores a value under a key, evicting the oldest entry if the cache is full.
+
+            Args:
+                ttl (float, optional): Seconds this entry lives, instead of the cache's time-to-live.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (now, None if ttl is None else now + ttl, value)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, compute):
+        """
+            Returns the cached value for a key, computing and storing it with `compute()` on a miss.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def entries(self) -> list:
+        """
+            Returns the live entries as (key, stored_at, expires_at, value), least recently used first.
+            Both times are time.time() timestamps; `expires_at` is None for entries that never expire.
+        """
+        now = time.time()
+        with self._lock:
+            return [(key, *entry) for key, entry in self._entries.items() if entry[1] is None or now <= entry[1]]
+
+    def load(self, entries) -> int:
+        """
+            Adds (key, stored_at, expires_at, value) entries as returned by `entries`, keeping their times.
+            Expired entries and keys already present are skipped.
+
+            Returns:
+                int: Number of entries added.
+        """
+        now = time.time()
+        added = 0
+        with self._lock:
+            for key, stored_at, expires_at, value in entries:
+                if key in self._entries or (expires_at is not None and now > expires_at):
+                    continue
+                self._entries[key] = (stored_at, expires_at, value)
+                self._entries.move_to_end(key)
+                added += 1
+                if self.maxsize is not None and len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return added
+
+    def clear(self):
+        """
+            Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared caches read by the Dash callbacks and filled by requests and the pre-warmer
+price_cache = Cache("prices", ttl=12 * 60 * 60, maxsize=2000)
+news_cache = Cache("news", ttl=60 * 60, maxsize=2000)
+article_title_cache = Cache("article_titles", ttl=24 * 60 * 60, maxsize=10000)
+forecast_cache = Cache("forecasts", maxsize=10000)
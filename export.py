@@ -0,0 +1,293 @@
+# Stock Oracle Group
+# 10/19/2026
+# Streaming export of prices, predictions and backtest metrics over HTTP
+
+"""
+Adds an `/export` route to the Dash server so downstream systems can pull results without
+scraping figure JSON:
+
+    /export?tickers=AAPL,MSFT&kind=prices
+    /export?tickers=*&kind=metrics&days=20&lag_days=20&model=ridge&format=arrow
+
+    tickers   comma-separated symbols, or "*" for every partition in the data directory
+    kind      "prices" (ticker, date, value), "predicted" (backtest tail with real values and,
+              for the default model, 95% prediction intervals) or "metrics" (one `batch.SCHEMA` row per ticker)
+    format    "csv" (default) or "arrow" (Arrow IPC stream)
+
+Tickers are read one at a time from the local partitions (data/<TICKER>.csv) and written in
+chunks of CHUNK_ROWS rows as they are produced, so the response is sent with chunked transfer
+encoding and neither a DataFrame nor the full payload is ever held in memory. Exports bypass the
+dashboard's forecast cache, so a "*" export does not fill it with every ticker's backtest.
+"""
+
+import collections
+import glob
+import os
+import numpy as np
+import pyarrow as pa
+from bar_store import BarStore
+from batch import SCHEMA as METRICS_SCHEMA, run_backtest
+from fetch_stock_data import partition_path
+from fetch_stock_news import get_daily_sentiment
+from models import backtest, get_model
+from predictor_default import PredictedGraph, bootstrap_ar_intervals
+from prewarm import BOOTSTRAP_REPLICATES
+
+# Rows per streamed chunk
+CHUNK_ROWS = 10_000
+
+PRICES_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("date", pa.string()),
+    ("value", pa.float64()),
+])
+
+PREDICTED_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("date", pa.string()),
+    ("real", pa.float64()),
+    ("predicted", pa.float64()),
+    ("lower", pa.float64()),
+    ("upper", pa.float64()),
+])
+
+SCHEMAS = {"prices": PRICES_SCHEMA, "predicted": PREDICTED_SCHEMA, "metrics": METRICS_SCHEMA}
+FORMATS = {"csv": "text/csv", "arrow": "application/vnd.apache.arrow.stream"}
+
+
+def available_tickers(data_dir: str = "data") -> list:
+    """
+        Returns the tickers with a daily price partition in `data_dir`, sorted. Intraday partitions
+        (<TICKER>.<interval>.csv, written by live mode) are skipped.
+    """
+    names = (os.path.basename(path)[:-len(".csv")] for path in glob.glob(os.path.join(data_dir, "*.csv")))
+    return sorted(name for name in names if "." not in name)
+
+
+def _read_chunks(path: str, chunk_rows: int):
+    """
+        Reads a Date,Value partition from disk in chunks of at most `chunk_rows` rows.
+
+        Yields:
+            (list of str, np.ndarray): Dates and float64 values of the chunk.
+    """
+    with open(path, "r") as f:
+        f.readline()  # Skip the header
+        dates, values = [], []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            date, value = line.split(",")
+            dates.append(date)
+            values.append(float(value))
+            if len(dates) == chunk_rows:
+                yield dates, np.array(values)
+                dates, values = [], []
+        if dates:
+            yield dates, np.array(values)
+
+
+def _count_rows(path: str) -> int:
+    """
+        Number of data rows of a partition, counted without parsing them.
+    """
+    with open(path, "rb") as f:
+        f.readline()  # Skip the header
+        return sum(1 for line in f if line.strip())
+
+
+def _price_batches(ticker: str, data_dir: str, chunk_rows: int):
+    for dates, values in _read_chunks(partition_path(ticker, data_dir), chunk_rows):
+        yield {"ticker": [ticker] * len(dates), "date": dates, "value": values}
+
+
+def _predicted_batches(ticker: str, data_dir: str, days: int, lag_days: int, model: str, chunk_rows: int,
+                       bar_store: BarStore):
+    """
+        Backtest tail of one ticker, computed on the partition's values without the forecast cache:
+        the default model's one-step forecasts come with the same seeded bootstrap intervals as the
+        dashboard, other lag models run `models.backtest`. ARX aligns the series with its OHLCV bars
+        and daily sentiment through `PredictedGraph`, reading the bars from `bar_store`.
+    """
+    path = partition_path(ticker, data_dir)
+    tail_dates = collections.deque(maxlen=days)
+    chunks = []
+    for dates, values in _read_chunks(path, CHUNK_ROWS):
+        tail_dates.extend(dates)
+        chunks.append(values)
+    values = np.concatenate(chunks) if chunks else np.empty(0)
+    n = values.size
+    days = min(days, n - lag_days - 1, len(tail_dates))
+    if days < 1:
+        return
+    origins = np.arange(n - days, n)
+    dates = list(tail_dates)[-days:]
+
+    spec = get_model(model)
+    lower = upper = [None] * days
+    if spec.strategy == "lstsq":
+        point, lower, upper = bootstrap_ar_intervals(values, lag_days, origins, BOOTSTRAP_REPLICATES, seed=0)
+    elif spec.strategy == "arx":
+        graph = PredictedGraph(filename=path, bars=bar_store.load(ticker), sentiment=get_daily_sentiment(ticker))
+        graph.read_csv()
+        point = [value for _, value in graph.predict_days_ahead(days, lag_days, model=spec.name).data[-days:]]
+    else:
+        point = backtest(spec.name, values, lag_days, origins)
+
+    for offset in range(0, days, chunk_rows):
+        window = slice(offset, offset + chunk_rows)
+        yield {
+            "ticker": [ticker] * len(dates[window]),
+            "date": dates[window],
+            "real": values[origins[window]],
+            "predicted": np.asarray(point[window], dtype=np.float64),
+            "lower": list(lower[window]),
+            "upper": list(upper[window]),
+        }
+
+
+def iter_batches(kind: str, tickers, data_dir: str = "data", days: int = 20, lag_days: int = 20,
+                 model: str = "default", chunk_rows: int = CHUNK_ROWS, bar_store: BarStore = None):
+    """
+        Produces the rows of an export as column batches, one ticker at a time.
+
+        Args:
+            kind (str): "prices", "predicted" or "metrics".
+            tickers (list of str): Tickers to export.
+            data_dir (str): Directory of the local price partitions.
+            days (int): Backtest window of "predicted" and "metrics".
+            lag_days (int): Lag days of "predicted" and "metrics".
+            model (str): Registered model of "predicted" and "metrics".
+            chunk_rows (int): Maximum rows per batch of "prices" and "predicted"; "metrics" yields
+                each ticker's row on its own.
+            bar_store (BarStore, optional): OHLCV bars of the ARX model. Defaults to BarStore("bars").
+
+        Yields:
+            dict: Column name -> list or array of values, in the order of the kind's schema.
+    """
+    if days < 1 or lag_days < 1:
+        raise ValueError(f"days and lag_days must be at least 1, got {days} and {lag_days}")
+    bar_store = bar_store if bar_store is not None else BarStore()
+    for ticker in tickers:
+        if kind == "prices":
+            yield from _price_batches(ticker, data_dir, chunk_rows)
+        elif kind == "predicted":
+            yield from _predicted_batches(ticker, data_dir, days, lag_days, model, chunk_rows, bar_store)
+        elif kind == "metrics":
+            # One row per backtest, sent as soon as it finishes
+            row = run_backtest(ticker, model, days, lag_days, data_dir, bars_dir=bar_store.root)
+            yield {field.name: [row.get(field.name)] for field in METRICS_SCHEMA}
+        else:
+            raise ValueError(f"unknown export kind: {kind}")
+
+
+def _csv_field(value) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    text = str(value)
+    if any(c in text for c in ',"\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def csv_chunks(schema: pa.Schema, batches):
+    """
+        Encodes column batches as CSV text, one chunk per batch after the header line.
+    """
+    yield ",".join(schema.names) + "\n"
+    for batch in batches:
+        columns = [batch[name] for name in schema.names]
+        yield "".join(",".join(_csv_field(v) for v in row) + "\n" for row in zip(*columns))
+
+
+class _ChunkSink:
+    """
+        Write-only file object collecting the bytes pyarrow writes until they are taken.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def arrow_chunks(schema: pa.Schema, batches):
+    """
+        Encodes column batches as an Arrow IPC stream, one record batch per chunk.
+    """
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+    yield sink.take()
+    for batch in batches:
+        writer.write_batch(pa.record_batch([batch[name] for name in schema.names], schema=schema))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def register_export(server, path: str = "/export", data_dir: str = "data", bar_store: BarStore = None):
+    """
+        Adds the streaming export route to a Flask server (e.g. `app.server` of a Dash app).
+
+        Args:
+            server: The Flask server.
+            path (str): URL path of the endpoint. Default is "/export".
+            data_dir (str): Directory of the local price partitions.
+            bar_store (BarStore, optional): The app's OHLCV bar store, read by the ARX model.
+    """
+    from flask import Response, request
+    from models import MODELS
+
+    def export_view():
+        args = request.args
+        kind = args.get("kind", "prices")
+        fmt = args.get("format", "csv")
+        model = args.get("model", "default").lower()
+        if kind not in SCHEMAS or fmt not in FORMATS or model not in MODELS:
+            return Response(f"kind must be one of {sorted(SCHEMAS)}, format one of {sorted(FORMATS)} "
+                            f"and model one of {sorted(MODELS)}\n", status=400, mimetype="text/plain")
+        try:
+            days = int(args.get("days", 20))
+            lag_days = int(args.get("lag_days", 20))
+        except ValueError:
+            return Response("days and lag_days must be integers\n", status=400, mimetype="text/plain")
+        if days < 1 or lag_days < 1:
+            return Response("days and lag_days must be at least 1\n", status=400, mimetype="text/plain")
+
+        requested = args.get("tickers", "")
+        if requested.strip() == "*":
+            tickers = available_tickers(data_dir)
+        else:
+            tickers = list(dict.fromkeys(t.strip().upper() for t in requested.split(",") if t.strip()))
+        missing = [t for t in tickers if not os.path.exists(partition_path(t, data_dir))]
+        if not tickers or missing:
+            return Response(f"no local data for: {', '.join(missing) or '(no tickers given)'}\n",
+                            status=404, mimetype="text/plain")
+        if kind != "prices":
+            # A backtest needs lag_days rows to fit and one more to forecast
+            short = [t for t in tickers if _count_rows(partition_path(t, data_dir)) < lag_days + 2]
+            if short:
+                return Response(f"lag_days={lag_days} needs at least {lag_days + 2} rows; too short: "
+                                f"{', '.join(short)}\n", status=400, mimetype="text/plain")
+
+        schema = SCHEMAS[kind]
+        batches = iter_batches(kind, tickers, data_dir, days, lag_days, model, bar_store=bar_store)
+        chunks = csv_chunks(schema, batches) if fmt == "csv" else arrow_chunks(schema, batches)
+        name = f"{kind}.{'csv' if fmt == 'csv' else 'arrows'}"
+        return Response(chunks, mimetype=FORMATS[fmt],
+                        headers={"Content-Disposition": f"attachment; filename={name}"})
+
+    server.add_url_rule(path, "export", export_view)
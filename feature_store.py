@@ -0,0 +1,240 @@
+# Stock Oracle Group
+# 10/19/2026
+# Feature store for lag matrices, log returns and rolling statistics
+
+"""
+Features are computed once per (ticker, data version) and persisted as raw memory-mapped arrays:
+
+    <root>/<TICKER>/values.f64        the price series
+    <root>/<TICKER>/log_returns.f64   log(v[i] / v[i-1]) (NaN for the first row)
+    <root>/<TICKER>/mean_<w>.f64      rolling mean over w rows (NaN until w rows are available)
+    <root>/<TICKER>/std_<w>.f64       rolling sample standard deviation over w rows
+    <root>/<TICKER>/meta.json         row count, digest of the stored values and windows
+
+When the series grows by appending bars (the stored rows are an unchanged prefix), only the new
+rows are computed and appended to the files. Any other change rebuilds the features.
+
+Lag matrices are never materialized: `FeatureSet.lag_matrix` returns a strided view over the
+values, so fits across many lags and windows share the same memory.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+DEFAULT_WINDOWS = (5, 20, 60)
+DTYPE = np.float64
+
+
+def digest(values: np.ndarray) -> str:
+    """
+        Data version of a price series: SHA-1 of its float64 values.
+    """
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=DTYPE).tobytes()).hexdigest()
+
+
+def _log_returns(values: np.ndarray, previous: float = None) -> np.ndarray:
+    """
+        Log returns of `values`; the first entry uses `previous` (or is NaN without one).
+    """
+    shifted = np.empty_like(values)
+    shifted[0] = np.nan if previous is None else previous
+    shifted[1:] = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(values / shifted)
+
+
+def _rolling(values: np.ndarray, window: int, skip: int = 0):
+    """
+        Rolling mean and sample std over `window` rows, for every row of `values` after the first `skip`.
+        `values` must contain the `window - 1` rows before the first output row when they exist.
+    """
+    n = values.size
+    csum = np.concatenate([[0.0], np.cumsum(values)])
+    csum2 = np.concatenate([[0.0], np.cumsum(values * values)])
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if n >= window:
+        total = csum[window:] - csum[:-window]
+        total2 = csum2[window:] - csum2[:-window]
+        mean[window - 1:] = total / window
+        if window > 1:
+            var = (total2 - total * total / window) / (window - 1)
+            std[window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return mean[skip:], std[skip:]
+
+
+class FeatureSet:
+    """
+        Read-only features of one price series. Arrays may be in-memory or memory-mapped.
+    """
+
+    def __init__(self, values, log_returns, rolling: dict, version: str):
+        """
+            Args:
+                values (np.ndarray): The price series, oldest first.
+                log_returns (np.ndarray): Log returns aligned with `values`.
+                rolling (dict): {("mean" | "std", window): np.ndarray} aligned with `values`.
+                version (str): Digest of `values`.
+        """
+        self.values = values
+        self.log_returns = log_returns
+        self.rolling = rolling
+        self.version = version
+
+    @classmethod
+    def from_values(cls, values, windows=DEFAULT_WINDOWS) -> "FeatureSet":
+        """
+            Computes an in-memory feature set for a series (no persistence).
+        """
+        values = np.ascontiguousarray(values, dtype=DTYPE)
+        rolling = {}
+        for window in windows:
+            rolling["mean", window], rolling["std", window] = _rolling(values, window)
+        return cls(values, _log_returns(values) if values.size else values.copy(), rolling, digest(values))
+
+    def __len__(self):
+        return self.values.size
+
+    def lag_matrix(self, lag_days: int, rows: int = None):
+        """
+            Zero-copy AR design for the first `rows` values: row j of X is values[j : j + lag_days]
+            and predicts y[j] = values[j + lag_days].
+
+            Args:
+                lag_days (int): Number of lags.
+                rows (int, optional): Use only values[:rows]. Defaults to the whole series.
+
+            Returns:
+                (X, y) views into the stored values.
+        """
+        values = self.values if rows is None else self.values[:rows]
+        X = np.lib.stride_tricks.sliding_window_view(values, lag_days)[:-1]
+        return X, values[lag_days:]
+
+    def rolling_mean(self, window: int) -> np.ndarray:
+        return self.rolling["mean", window]
+
+    def rolling_std(self, window: int) -> np.ndarray:
+        return self.rolling["std", window]
+
+
+class FeatureStore:
+    """
+        Persists feature sets as memory-mapped files and keeps them up to date incrementally.
+    """
+
+    def __init__(self, root: str = "features", windows=DEFAULT_WINDOWS):
+        """
+            Args:
+                root (str): Directory holding one sub-directory per ticker. Default is "features".
+                windows (tuple of int): Rolling-statistic windows to maintain.
+        """
+        self.root = root
+        self.windows = tuple(windows)
+        self._lock = threading.Lock()
+        self._open = {}  # ticker -> FeatureSet currently mapped
+
+    def _dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker.upper())
+
+    def _files(self, ticker: str) -> dict:
+        directory = self._dir(ticker)
+        files = {"values": os.path.join(directory, "values.f64"),
+                 "log_returns": os.path.join(directory, "log_returns.f64")}
+        for window in self.windows:
+            files["mean", window] = os.path.join(directory, f"mean_{window}.f64")
+            files["std", window] = os.path.join(directory, f"std_{window}.f64")
+        return files
+
+    def _read_meta(self, ticker: str):
+        path = os.path.join(self._dir(ticker), "meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            meta = json.load(f)
+        return meta if tuple(meta.get("windows", ())) == self.windows else None
+
+    def _write_meta(self, ticker: str, rows: int, version: str):
+        path = os.path.join(self._dir(ticker), "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump({"rows": rows, "version": version, "windows": list(self.windows)}, f)
+        os.replace(path + ".tmp", path)
+
+    def _map(self, ticker: str, rows: int, version: str) -> FeatureSet:
+        files = self._files(ticker)
+
+        def mapped(key):
+            if rows == 0:
+                return np.empty(0, dtype=DTYPE)
+            return np.memmap(files[key], dtype=DTYPE, mode="r", shape=(rows,))
+
+        rolling = {key: mapped(key) for key in files if isinstance(key, tuple)}
+        return FeatureSet(mapped("values"), mapped("log_returns"), rolling, version)
+
+    def version(self, ticker: str):
+        """
+            Returns the digest of the stored series for a ticker, or None if nothing is stored.
+        """
+        meta = self._read_meta(ticker)
+        return meta["version"] if meta else None
+
+    def get(self, ticker: str, values) -> FeatureSet:
+        """
+            Returns memory-mapped features for a ticker's series, computing only what is missing.
+
+            Args:
+                ticker (str): The stock ticker symbol.
+                values (array-like): The full price series, oldest first.
+
+            Returns:
+                FeatureSet: Features backed by the files of the store.
+        """
+        values = np.ascontiguousarray(values, dtype=DTYPE)
+        version = digest(values)
+        with self._lock:
+            current = self._open.get(ticker.upper())
+            if current is not None and current.version == version:
+                return current
+
+            meta = self._read_meta(ticker)
+            if meta and meta["version"] == version:
+                features = self._map(ticker, meta["rows"], version)
+            elif meta and 0 < meta["rows"] <= values.size and digest(values[:meta["rows"]]) == meta["version"]:
+                features = self._append(ticker, values, meta["rows"], version)
+            else:
+                features = self._rebuild(ticker, values, version)
+            self._open[ticker.upper()] = features
+            return features
+
+    def _rebuild(self, ticker: str, values: np.ndarray, version: str) -> FeatureSet:
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        computed = FeatureSet.from_values(values, self.windows)
+        arrays = {"values": computed.values, "log_returns": computed.log_returns, **computed.rolling}
+        # Replace files instead of truncating them: older mappings keep reading the old data
+        for key, path in self._files(ticker).items():
+            arrays[key].astype(DTYPE).tofile(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        self._write_meta(ticker, values.size, version)
+        return self._map(ticker, values.size, version)
+
+    def _append(self, ticker: str, values: np.ndarray, stored: int, version: str) -> FeatureSet:
+        new = values[stored:]
+        if new.size:
+            files = self._files(ticker)
+            arrays = {"values": new, "log_returns": _log_returns(new, values[stored - 1])}
+            for window in self.windows:
+                # Rolling stats of the new rows need the window - 1 rows before them
+                context = min(window - 1, stored)
+                mean, std = _rolling(values[stored - context:], window, skip=context)
+                arrays["mean", window], arrays["std", window] = mean, std
+            for key, path in files.items():
+                # Drop bytes past the stored rows (left by a crash before meta.json was rewritten)
+                with open(path, "r+b") as f:
+                    f.truncate(stored * np.dtype(DTYPE).itemsize)
+                    f.seek(0, os.SEEK_END)
+                    arrays[key].astype(DTYPE).tofile(f)
+        self._write_meta(ticker, values.size, version)
+        return self._map(ticker, values.size, version)
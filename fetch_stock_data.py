@@ -1,36 +1,223 @@
 # Stock Oracle Group
 # 4/11/2025
 # Script to fetch and save stock data using yfinance
-import yfinance as yf
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from bar_store import Bars
+from metrics import timer
+from profiling import span
+from providers import get_provider, is_intraday, period_to_timedelta, DEFAULT_PERIODS, MAX_WINDOW_DAYS
 
-def fetch_and_save_data(ticker: str, filename: str = "data.csv"):
+# Rows written per CSV append when streaming intraday bars to disk
+CHUNK_ROWS = 50_000
+
+
+def _to_bar_frame(df, interval: str = "1d"):
+    """
+        Converts a provider price frame into a Date column plus the available OHLCV columns, without rounding.
+        Daily bars keep "YYYY-MM-DD" dates; intraday bars get full "YYYY-MM-DD HH:MM:SS" UTC timestamps.
+    """
+    columns = [name for name in ("Open", "High", "Low", "Close", "Volume") if name in df]
+    df = df[columns].dropna(subset=["Close"]).rename_axis("Date").reset_index()
+    if is_intraday(interval):
+        dates = df["Date"]
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+        df["Date"] = dates.dt.strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def partition_path(ticker: str, directory: str = "data", interval: str = "1d") -> str:
+    """
+        Returns the CSV partition a ticker is stored in by the bulk ingestion (daily bars) or by live
+        mode (intraday bars, "<TICKER>.<interval>.csv").
+
+        Parameters:
+            ticker (str): The stock ticker symbol.
+            directory (str): Root directory of the partitions. Default is "data".
+            interval (str): Bar size of the partition. Default is "1d".
+    """
+    if interval == "1d":
+        return os.path.join(directory, f"{ticker.upper()}.csv")
+    return os.path.join(directory, f"{ticker.upper()}.{interval}.csv")
+
+
+def iter_price_windows(ticker: str, interval: str = "1d", period: str = None, provider=None,
+                       window_days: int = None, end=None):
+    """
+        Downloads a ticker's history as a sequence of frames instead of one large frame.
+
+        Daily history comes back in a single request. Intraday history is requested in consecutive
+        [start, end) windows of at most `window_days` (by default the longest window Yahoo serves
+        for the interval), oldest first, so only one window is held in memory at a time.
+
+        Parameters:
+            ticker (str): The stock ticker symbol.
+            interval (str): Bar size, "1d" or an intraday interval such as "5m" or "1h".
+            period (str, optional): History length. Defaults to the longest useful period for the interval.
+            provider (optional): Upstream data provider. Defaults to the process-wide provider.
+            window_days (int, optional): Calendar days per intraday request.
+            end (optional): End of the history. Defaults to now.
+
+        Yields:
+            pd.DataFrame: Provider price frames in chronological order.
+    """
+    provider = provider or get_provider()
+    period = period or DEFAULT_PERIODS.get(interval, "1y")
+    ticker = ticker.upper()
+
+    if not is_intraday(interval):
+        with timer("fetch", source="prices"), span("fetch.prices"):
+            frames = provider.download_prices([ticker], period=period, interval=interval)
+        df = frames.get(ticker)
+        if df is not None and not df.empty:
+            yield df
+        return
+
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz="UTC").ceil("min")
+    if end.tz is None:
+        end = end.tz_localize("UTC")
+    step = pd.Timedelta(days=window_days or MAX_WINDOW_DAYS[interval])
+    window_start = end - period_to_timedelta(period)
+    while window_start < end:
+        window_end = min(window_start + step, end)
+        with timer("fetch", source="prices"), span("fetch.prices"):
+            frames = provider.download_prices([ticker], interval=interval, start=window_start, end=window_end)
+        df = frames.get(ticker)
+        if df is not None and not df.empty:
+            yield df
+        window_start = window_end
+
+
+def fetch_and_save_data(ticker: str, filename: str = "data.csv", provider=None, interval: str = "1d",
+                        period: str = None, window_days: int = None, chunk_rows: int = CHUNK_ROWS, end=None,
+                        bar_store=None):
     """
-        Fetches 1 year of daily historical stock data for the given ticker using Yahoo Finance
-        and saves the data to a CSV file in a format compatible with the Graph class.
+        Fetches historical stock data for the given ticker (1 year of daily bars by default)
+        and saves the closing prices to a CSV file in a format compatible with the Graph class.
+
+        The history is streamed: each downloaded window is appended to the file in chunks of
+        `chunk_rows` rows, and the file only replaces `filename` once the download completes.
 
         Parameters:
             ticker (str): The stock ticker symbol (e.g., "AAPL").
             filename (str): The output CSV filename. Default is "data.csv".
+            provider (optional): Upstream data provider. Defaults to the process-wide provider.
+            interval (str): Bar size, "1d" (default) or intraday ("1m", "5m", "15m", "1h", ...).
+            period (str, optional): History length. Defaults to "1y" for daily bars and to the
+                longest period Yahoo serves for intraday bars.
+            window_days (int, optional): Calendar days requested at once for intraday bars.
+            chunk_rows (int): Rows written per append.
+            end (optional): End of the intraday history. Defaults to now.
+            bar_store (BarStore, optional): Also store the full OHLCV bars in this columnar store.
 
         Returns:
-            None
+            int: Number of rows written. 0 when the ticker has no data, in which case `filename`
+            (and the bar store) are left untouched.
     """
+    partial = filename + ".part"
+    rows = 0
+    last_date = None
+    bars = bar_store.writer(ticker, interval) if bar_store is not None else None
+    try:
+        with open(partial, "w") as f:
+            f.write("Date,Value\n")
+            for window in iter_price_windows(ticker, interval, period, provider, window_days, end):
+                # Format the date; the CSV keeps only the closing price
+                df = _to_bar_frame(window, interval)
 
-    # Download 1 year of historical stock data
-    df = yf.download(ticker, period="1y", interval="1d")
+                # Adjacent windows may overlap at their boundary
+                if last_date is not None:
+                    df = df[df["Date"] > last_date]
+                if df.empty:
+                    continue
+                for offset in range(0, len(df), chunk_rows):
+                    df.iloc[offset:offset + chunk_rows][["Date", "Close"]].to_csv(f, header=False, index=False)
+                if bars is not None:
+                    bars.append(Bars.from_frame(df))
+                rows += len(df)
+                last_date = df["Date"].iloc[-1]
+    except Exception:
+        os.remove(partial)
+        if bars is not None:
+            bars.abort()
+        raise
 
-    if df.empty:
+    if rows == 0:
+        os.remove(partial)
+        if bars is not None:
+            bars.abort()
         print("No data found for ticker:", ticker)
-        return
+        return 0
 
-    # Keep only the closing price and format the date
-    df = df[["Close"]].reset_index()
-    df.columns = ["Date", "Value"]
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    # Save to CSV
+    os.replace(partial, filename)
+    if bars is not None:
+        bars.commit()
+    print(f"Saved {rows} rows to {filename}")
+    return rows
 
-    # Cast to int to match the graph class format
-    df["Value"] = df["Value"].round().astype(int)
 
-    # Save to CSV
-    df.to_csv(filename, index=False)
-    print(f"Saved {len(df)} rows to {filename}")
+def fetch_and_save_many(tickers, directory: str = "data", batch_size: int = 50, max_workers: int = 4,
+                        period: str = "1y", interval: str = "1d", provider=None, bar_store=None) -> dict:
+    """
+        Bulk ingestion for watchlists: requests tickers in grouped batches with bounded concurrency
+        and writes each ticker to its own CSV partition of the interval (see `partition_path`) as its
+        batch arrives, so intraday bars never overwrite a daily partition.
+
+        A ticker that fails (no data, or its whole batch raised) is reported without aborting the others.
+
+        Parameters:
+            tickers (list of str): Ticker symbols to ingest. Duplicates are ignored.
+            directory (str): Directory holding one CSV per ticker. Default is "data".
+            batch_size (int): Number of tickers requested from the provider at once.
+            max_workers (int): Maximum number of batches in flight.
+            period (str): History length passed to the provider.
+            interval (str): Bar size passed to the provider.
+            provider (optional): Upstream data provider. Defaults to the process-wide provider.
+            bar_store (BarStore, optional): Also store the full OHLCV bars in this columnar store.
+
+        Returns:
+            dict: {"saved": {ticker: rows written}, "failed": {ticker: reason}}
+    """
+    provider = provider or get_provider()
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), max(1, batch_size))]
+    os.makedirs(directory, exist_ok=True)
+
+    def download(batch):
+        with timer("fetch", source="prices_bulk"):
+            return provider.download_prices(batch, period=period, interval=interval)
+
+    saved, failed = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(download, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                frames = future.result()
+            except Exception as e:
+                for ticker in batch:
+                    failed[ticker] = f"batch error: {e}"
+                continue
+
+            for ticker in batch:
+                df = frames.get(ticker)
+                if df is None or df.empty:
+                    failed[ticker] = "no data"
+                    continue
+                try:
+                    df = _to_bar_frame(df, interval)
+                    df[["Date", "Close"]].rename(columns={"Close": "Value"}).to_csv(
+                        partition_path(ticker, directory, interval), index=False)
+                    if bar_store is not None:
+                        bar_store.write(ticker, Bars.from_frame(df), interval)
+                    saved[ticker] = len(df)
+                except Exception as e:
+                    failed[ticker] = str(e)
+
+    print(f"Saved {len(saved)} tickers to {directory}; {len(failed)} failed")
+    return {"saved": saved, "failed": failed}
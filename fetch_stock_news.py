@@ -4,14 +4,21 @@
 import requests
 from textblob import TextBlob
 import datetime
+from urllib.request import urlopen, Request
+from cache import article_title_cache, news_cache
+from metrics import timer
+from profiling import span
+from providers import ProviderError, get_provider
 
-def get_yahoo_finance_news(stock_symbol: str, date: str = None):
+def get_yahoo_finance_news(stock_symbol: str, date: str = None, provider=None, limit: int = 5):
     """
         Fetches news articles related to a given stock symbol from Yahoo Finance and analyzes their sentiment.
 
         Args:
             stock_symbol (str): The stock ticker symbol (e.g., 'AAPL').
             date (str, optional): A date string in 'YYYY-MM-DD' format. If provided, only news from this date is returned.
+            provider (optional): Upstream news provider. Defaults to the process-wide provider.
+            limit (int, optional): Most recent articles kept when no date is given. None keeps all.
 
         Returns:
             list[dict]: A list of dictionaries where each dictionary represents a news article with:
@@ -21,20 +28,17 @@ def get_yahoo_finance_news(stock_symbol: str, date: str = None):
                 - 'date': The article's publication date in 'YYYY-MM-DD' format.
 
         Notes:
-            - Limits to 5 most recent articles if no date filter is provided.
+            - Limits to the `limit` (5) most recent articles if no date filter is provided.
             - Uses TextBlob for sentiment analysis based on the article title.
     """
-    url = f"https://query1.finance.yahoo.com/v1/finance/search?q={stock_symbol}"
-    headers = {"User-Agent": "Mozilla/5.0"}
+    provider = provider or get_provider()
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        items = data.get("news", [])
-        # Limit to top 5 if no date filter
-        if date is None:
-            items = items[:5]
+        with timer("fetch", source="news_search"), span("fetch.news_search"):
+            items = provider.search_news(stock_symbol)
+        # Limit to the most recent articles if no date filter
+        if date is None and limit is not None:
+            items = items[:limit]
 
         news_list = []
         for item in items:
@@ -71,6 +75,66 @@ def get_yahoo_finance_news(stock_symbol: str, date: str = None):
 
         return news_list
 
-    except requests.RequestException as e:
+    except (requests.RequestException, ProviderError) as e:
         print(f"Error fetching news for {stock_symbol}: {e}")
         return []
+
+
+SENTIMENT_SCORES = {"Positive": 1, "Neutral": 0, "Negative": -1}
+
+
+def get_daily_sentiment(stock_symbol: str, provider=None) -> dict:
+    """
+        Scores every headline the news search returns for a symbol with one request and averages
+        the scores per publication day. Results are kept in the news cache.
+
+        Args:
+            stock_symbol (str): The stock ticker symbol (e.g., 'AAPL').
+            provider (optional): Upstream news provider. Defaults to the process-wide provider.
+
+        Returns:
+            dict: {"YYYY-MM-DD": mean score in [-1, 1]} for the days with news.
+    """
+    key = ("daily_sentiment", stock_symbol.upper())
+    cached = news_cache.get(key)
+    if cached is not None:
+        return cached
+
+    articles = get_yahoo_finance_news(stock_symbol, provider=provider, limit=None)
+    totals = {}
+    for article in articles:
+        total, count = totals.get(article["date"], (0, 0))
+        totals[article["date"]] = (total + SENTIMENT_SCORES.get(article["sentiment"], 0), count + 1)
+    daily = {date: total / count for date, (total, count) in totals.items()}
+    if articles:
+        news_cache.set(key, daily)
+    return daily
+
+
+def get_article_title(url: str) -> str:
+    """
+        Fetches the <title> of an article page, serving repeated URLs from the title cache.
+
+        Args:
+            url (str): The article link.
+
+        Returns:
+            str: The page title, or "Error fetching title" if the page could not be read.
+    """
+    cached = article_title_cache.get(url)
+    if cached is not None:
+        return cached
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    try:
+        with timer("fetch", source="article"), span("fetch.article"):
+            req = Request(url, headers=headers)
+            page = urlopen(req)
+            html_content = page.read().decode("utf-8")
+        title_index = html_content.find("<title>") + len("<title>")
+        end_index = html_content.find("</title")
+        final_title = html_content[title_index:end_index]
+    except Exception:
+        # Don't cache failures so the next request retries the page
+        return "Error fetching title"
+    article_title_cache.set(url, final_title)
+    return final_title
@@ -6,28 +6,56 @@ class Graph:
     """
        A class to represent and manipulate stock data stored as (date, value) tuples.
     """
-    def __init__(self, data=None):
+    def __init__(self, data=None, filename="data.csv", start=None, end=None):
         """
             Initializes the Graph object with optional preloaded data.
 
             Parameters:
                 data (list of tuple): List of (date, value) tuples. Defaults to an empty list.
+                filename (str): CSV file read by `read_csv`. Defaults to 'data.csv'.
+                start (str or pd.Timestamp, optional): First date/time `read_csv` loads (inclusive).
+                end (str or pd.Timestamp, optional): Last date/time `read_csv` loads (inclusive).
         """
         if data is None:
             data = []
         self.__data = data
+        self.version = 0
+        self.filename = filename
+        self.start = start
+        self.end = end
 
-    def read_csv(self):
+    def read_csv(self, filename=None, start=None, end=None):
         """
             Reads stock data from 'data.csv', skipping the header.
-            Assumes the CSV format is: Date,Value
+            Assumes the CSV format is: Date,Value with rows sorted by date.
+
+            Only rows inside [start, end] are loaded. The file is binary-searched for `start`, so
+            loading a short range of a large intraday file does not scan the rows before it, and
+            reading stops at the first row after `end`. A date-only `end` includes that whole day.
+
+            Parameters:
+                filename (str, optional): CSV file to read. Defaults to the graph's filename.
+                start (str or pd.Timestamp, optional): Defaults to the graph's start.
+                end (str or pd.Timestamp, optional): Defaults to the graph's end.
         """
+        filename = filename or self.filename
+        start = _range_key(start if start is not None else self.start)
+        end = _range_key(end if end is not None else self.end)
+
         self.__data = []
-        with open("data.csv", "r") as f:
-            lines = f.readlines()[1:]  # Skip the header
-            for line in lines:
-                date, value = line.strip().split(",")
-                self.__data.append((date, int(value)))
+        self.touch()
+        with open(filename, "rb") as f:
+            f.readline()  # Skip the header
+            if start is not None:
+                _seek_to(f, start)
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                date, value = line.decode().split(",")
+                if end is not None and date[:len(end)] > end:
+                    break
+                self.__data.append((date, float(value)))
 
     def clear_csv(self):
         """
@@ -37,6 +65,15 @@ class Graph:
         with open("data.csv", "w") as f:
             f.write("Date,Value\n")
         self.__data = []
+        self.touch()
+
+    def write_csv(self, filename=None):
+        """
+            Writes the internal data list to 'data.csv' (or `filename`) in the Date,Value format.
+        """
+        with open(filename or self.filename, "w") as f:
+            f.write("Date,Value\n")
+            f.writelines(f"{date},{value}\n" for date, value in self.__data)
 
     @property
     def data(self):
@@ -57,3 +94,49 @@ class Graph:
                 value (list of tuple): New data to replace current internal data.
         """
         self.__data = value
+        self.touch()
+
+    def touch(self):
+        """
+            Marks the data as changed. Called by every method that replaces the data; call it after
+            editing the list returned by `data` in place so derived state (e.g. features) is rebuilt.
+        """
+        self.version += 1
+
+
+def _range_key(bound):
+    """
+        Formats a range bound the way dates are written in the CSV files.
+    """
+    if bound is None:
+        return None
+    if isinstance(bound, str):
+        return bound
+    # pd.Timestamp / datetime: date only at midnight, full timestamp otherwise
+    if (bound.hour, bound.minute, bound.second) == (0, 0, 0):
+        return bound.strftime("%Y-%m-%d")
+    return bound.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _seek_to(f, start):
+    """
+        Positions a binary file object, sorted by its first column, at the first row whose date is >= start.
+    """
+    key = start.encode()
+    lo = f.tell()
+    f.seek(0, 2)
+    hi = f.tell()
+
+    # Smallest offset whose next full line sorts at or after `start`
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid - 1)
+        f.readline()
+        line = f.readline()
+        if not line.strip() or line.split(b",", 1)[0] >= key:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    f.seek(lo - 1)
+    f.readline()
@@ -0,0 +1,336 @@
+# Stock Oracle Group
+# 10/19/2026
+# Live mode: bar feed subscriptions, incremental AR updates and server-sent events
+
+"""
+Live mode keeps one in-memory series per subscribed ticker and extends it with the bars of a
+bar feed (see `providers.PollingBarFeed` and `providers.SimulatedBarFeed`). Each new bar updates
+the AR model incrementally: the normal equations X'X and X'y gain one row and the lag_days x
+lag_days system is solved again, so a forecast costs microseconds instead of a refit over the
+history. Price, forecast and rolling confidence are pushed to the browser over a server-sent
+events stream:
+
+    /live/stream?ticker=AAPL      text/event-stream, one JSON event per bar
+
+The dashboard's "Go Live" button opens the stream (assets/live.js) and extends the price chart
+as events arrive.
+"""
+
+import collections
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from cache import price_cache
+from fetch_stock_data import fetch_and_save_data, partition_path
+from graph import Graph
+from metrics import timer
+from predictor_default import PredictedGraph, auc_confidence
+from providers import SESSION_OPEN, feed_from_env, is_intraday, last_session_time
+
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE_SECONDS = 15
+
+# Events buffered per client before the oldest are dropped
+CLIENT_BUFFER = 100
+
+
+class IncrementalAR:
+    """
+        Least-squares AR(lag_days) model (the default model of `PredictedGraph`) updated one bar at a time.
+    """
+
+    def __init__(self, values, lag_days: int):
+        """
+            Args:
+                values (array-like): History, oldest first; needs more than lag_days values.
+                lag_days (int): Number of lags.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.size <= lag_days:
+            raise ValueError(f"Need at least {lag_days+1} points; got {values.size}.")
+        X = np.lib.stride_tricks.sliding_window_view(values, lag_days)[:-1]
+        y = values[lag_days:]
+        self.lag_days = lag_days
+        self.xtx = X.T @ X
+        self.xty = X.T @ y
+        self.window = values[-lag_days:].copy()
+        self._solve()
+
+    def _solve(self):
+        try:
+            self.coeffs = np.linalg.solve(self.xtx, self.xty)
+        except np.linalg.LinAlgError:
+            self.coeffs = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+
+    def forecast(self) -> float:
+        """
+            Forecast of the value after the newest bar.
+        """
+        return float(self.coeffs @ self.window)
+
+    def append(self, value: float) -> float:
+        """
+            Adds a bar and returns the forecast of the next one.
+        """
+        self.xtx += np.outer(self.window, self.window)
+        self.xty += self.window * value
+        self.window[:-1] = self.window[1:]
+        self.window[-1] = value
+        self._solve()
+        return self.forecast()
+
+
+class LiveSeries:
+    """
+        In-memory series of one ticker with its incremental model and recent forecast errors.
+    """
+
+    def __init__(self, ticker: str, data: list, lag_days: int, days: int):
+        """
+            Args:
+                ticker (str): The stock ticker symbol.
+                data (list of tuple): (date, value) history, oldest first.
+                lag_days (int): Lags of the AR model.
+                days (int): Number of recent one-step forecasts scored by the confidence.
+        """
+        self.ticker = ticker
+        self.data = list(data)
+        self.model = IncrementalAR([value for _, value in self.data], lag_days)
+        self.next_forecast = self.model.forecast()
+
+        # Seed the rolling confidence with the backtest of the tail
+        history = PredictedGraph(data=list(self.data))
+        days = max(1, min(days, len(self.data) - lag_days - 1))
+        predicted = history.predict_days_ahead(days, lag_days).data[-days:]
+        self.scored = collections.deque(
+            zip([value for _, value in predicted], [value for _, value in self.data[-days:]]), maxlen=days)
+
+    def confidence(self) -> float:
+        """
+            AUC confidence of the recent one-step forecasts against the real bars.
+        """
+        if len(self.scored) < 2:
+            return 0.0
+        predicted, real = zip(*self.scored)
+        return auc_confidence(np.array(predicted), np.array(real))
+
+    def append(self, date: str, value: float) -> dict:
+        """
+            Appends a bar, scores the forecast made for it and forecasts the next bar.
+
+            Returns:
+                dict: The event pushed to clients.
+        """
+        start = time.perf_counter()
+        self.scored.append((self.next_forecast, value))
+        self.data.append((date, value))
+        self.next_forecast = self.model.append(value)
+        return self.event(elapsed=time.perf_counter() - start)
+
+    def event(self, elapsed: float = 0.0) -> dict:
+        date, price = self.data[-1]
+        return {
+            "ticker": self.ticker,
+            "date": date,
+            "price": float(price),
+            "forecast": self.next_forecast,
+            "confidence": float(self.confidence()),
+            "update_ms": elapsed * 1000,
+        }
+
+
+def load_history(ticker: str, data_dir: str = "data", interval: str = "1d") -> list:
+    """
+        History a live series starts from, at the bar size of the feed: the cached prices, else the
+        ticker's partition (data/<TICKER>.csv, or data/<TICKER>.<interval>.csv for intraday bars),
+        else a fresh download into the partition. An intraday partition written before the current
+        session started is downloaded again, so the series does not jump from its last bar to today's.
+    """
+    ticker = ticker.upper()
+    cached = price_cache.get((ticker, interval))
+    if cached:
+        return list(cached)
+    filename = partition_path(ticker, data_dir, interval)
+    if not os.path.exists(filename) or (
+            is_intraday(interval) and os.path.getmtime(filename) < last_session_time(time.time(), SESSION_OPEN)):
+        os.makedirs(data_dir, exist_ok=True)
+        fetch_and_save_data(ticker, filename, interval=interval)
+    graph = Graph(filename=filename)
+    graph.read_csv()
+    return graph.data
+
+
+class LiveHub:
+    """
+        Polls a bar feed for the subscribed tickers and fans the updates out to client queues.
+    """
+
+    def __init__(self, feed=None, lag_days: int = 20, days: int = 20, history=None):
+        """
+            Args:
+                feed (optional): Bar feed. Defaults to the feed named by STOCKORACLE_FEED.
+                lag_days (int): Lags of the AR model.
+                days (int): Recent forecasts scored by the confidence.
+                history (callable, optional): ticker -> list of (date, value) the series starts from.
+                    Defaults to `load_history` at the feed's bar interval, so daily closes are never
+                    extended with intraday bars.
+        """
+        self.feed = feed or feed_from_env()
+        self.lag_days = lag_days
+        self.days = days
+        self.history = history or functools.partial(load_history, interval=self.feed.interval)
+        self.series = {}  # ticker -> LiveSeries
+        self.clients = {}  # ticker -> set of queue.Queue
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, ticker: str) -> queue.Queue:
+        """
+            Registers a client for a ticker and starts the feed thread if needed.
+
+            Returns:
+                queue.Queue: Receives one event dict per new bar, starting with the current state.
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            series = self.series.get(ticker)
+        if series is None:
+            # Loading the history may download it; don't hold up the feed meanwhile
+            series = LiveSeries(ticker, self.history(ticker), self.lag_days, self.days)
+        with self._lock:
+            series = self.series.setdefault(ticker, series)
+            client = queue.Queue(maxsize=CLIENT_BUFFER)
+            client.put(series.event())
+            self.clients.setdefault(ticker, set()).add(client)
+        self.start()
+        return client
+
+    def unsubscribe(self, ticker: str, client: queue.Queue):
+        """
+            Removes a client; series without clients stop being polled.
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            clients = self.clients.get(ticker, set())
+            clients.discard(client)
+            if not clients:
+                self.clients.pop(ticker, None)
+                self.series.pop(ticker, None)
+
+    def poll(self) -> int:
+        """
+            Fetches new bars for every subscribed ticker and publishes them.
+
+            Returns:
+                int: Number of bars applied.
+        """
+        with self._lock:
+            last = {ticker: series.data[-1] for ticker, series in self.series.items() if series.data}
+        if not last:
+            return 0
+        bars = self.feed.next_bars(last)
+        applied = 0
+        with self._lock:
+            for ticker, date, value in bars:
+                series = self.series.get(ticker)
+                if series is None or date <= series.data[-1][0]:
+                    continue
+                with timer("model", stage="live_update", model="default"):
+                    event = series.append(date, value)
+                applied += 1
+                for client in self.clients.get(ticker, ()):
+                    if client.full():
+                        # Slow client: drop its oldest event rather than block the feed
+                        client.get_nowait()
+                    client.put_nowait(event)
+        return applied
+
+    def _loop(self):
+        while not self._stop.wait(self.feed.poll_seconds):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Live feed error: {e}")
+
+    def start(self):
+        """
+            Starts the feed thread (once).
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="live-feed", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+            Stops the feed thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def event_stream(hub: LiveHub, ticker: str, client: queue.Queue = None, keepalive: float = KEEPALIVE_SECONDS,
+                 limit: int = None):
+    """
+        Server-sent events for one client: a "data:" line per bar and a comment when idle.
+        The client is unsubscribed when the stream ends or the connection drops.
+
+        Args:
+            hub (LiveHub): The hub to subscribe to.
+            ticker (str): The stock ticker symbol.
+            client (queue.Queue, optional): Queue from `hub.subscribe`; subscribes when omitted.
+            keepalive (float): Seconds of silence before a keep-alive comment.
+            limit (int, optional): Stop after this many events (for tests).
+    """
+    client = client or hub.subscribe(ticker)
+    sent = 0
+    try:
+        while limit is None or sent < limit:
+            try:
+                event = client.get(timeout=keepalive)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield f"data: {json.dumps(event)}\n\n"
+            sent += 1
+    finally:
+        hub.unsubscribe(ticker, client)
+
+
+def register_live(server, hub: LiveHub = None, path: str = "/live/stream") -> LiveHub:
+    """
+        Adds the live event stream route to a Flask server (e.g. `app.server` of a Dash app).
+
+        Args:
+            server: The Flask server.
+            hub (LiveHub, optional): Hub serving the stream. A new one is created by default.
+            path (str): URL path of the endpoint. Default is "/live/stream".
+
+        Returns:
+            LiveHub: The hub behind the route.
+    """
+    from flask import Response, request
+
+    hub = hub or LiveHub()
+
+    def live_view():
+        ticker = request.args.get("ticker", "").strip().upper()
+        if not ticker:
+            return Response("ticker is required\n", status=400, mimetype="text/plain")
+        try:
+            client = hub.subscribe(ticker)
+        except Exception as e:
+            return Response(f"cannot start live mode for {ticker}: {e}\n", status=404, mimetype="text/plain")
+        return Response(event_stream(hub, ticker, client), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    server.add_url_rule(path, "live_stream", live_view)
+    return hub
@@ -6,11 +6,23 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output, State
 import os
+import atexit
+import signal
+import sys
 from predictor_default import PredictedGraph
 from predictor_sentimental import PredictorSentimental
-from fetch_stock_news import get_yahoo_finance_news
+from fetch_stock_news import get_article_title, get_daily_sentiment, get_yahoo_finance_news
 from fetch_stock_data import fetch_and_save_data
-from urllib.request import urlopen, Request
+from cache import news_cache, price_cache
+from feature_store import FeatureStore
+from bar_store import BarStore
+from metrics import timed, register_endpoint
+from export import register_export
+from live import register_live
+from profiling import profiled
+from prewarm import default_forecast, prewarmer_from_env
+from snapshot import snapshotter_from_env
+from models import MODELS, model_options
 
 # Initialize the Dash app
 app = dash.Dash(
@@ -19,8 +31,24 @@ app = dash.Dash(
     suppress_callback_exceptions=True,
 )
 
-# Instantiate PredictedGraph
-graph_instance = PredictedGraph(data=[])
+# Expose latency histograms and cache statistics at /metrics
+register_endpoint(app.server)
+
+# Full OHLCV bars (float32/int64 columns) behind the ARX model
+bar_store = BarStore("bars")
+
+# Stream prices, predictions and backtest metrics of the local partitions at /export
+register_export(app.server, bar_store=bar_store)
+
+# Push new bars, forecasts and confidence to "Go Live" clients at /live/stream (assets/live.js)
+live_hub = register_live(app.server)
+
+# Instantiate PredictedGraph; lag matrices and rolling stats are memory-mapped from features/
+graph_instance = PredictedGraph(data=[], feature_store=FeatureStore("features"))
+
+# Bootstrap replicates behind the prediction intervals
+BOOTSTRAP_REPLICATES = 1000
+
 app.layout = dbc.Container(fluid=True, children=[
 
     # Navbar
@@ -52,6 +80,21 @@ app.layout = dbc.Container(fluid=True, children=[
                         placeholder="e.g. AAPL",
                         className="form-control mb-2"
                     ),
+                    html.Label("Bar Interval"),
+                    dcc.Dropdown(
+                        id="interval-input",
+                        options=[
+                            {"label": "Daily (1 year)", "value": "1d"},
+                            {"label": "Hourly (2 years)", "value": "1h"},
+                            {"label": "30 minutes (60 days)", "value": "30m"},
+                            {"label": "15 minutes (60 days)", "value": "15m"},
+                            {"label": "5 minutes (60 days)", "value": "5m"},
+                            {"label": "1 minute (7 days)", "value": "1m"},
+                        ],
+                        value="1d",
+                        clearable=False,
+                        className="mb-2"
+                    ),
                     dbc.Button(
                         "Load Data",
                         id="load-real-data-btn",
@@ -75,6 +118,8 @@ app.layout = dbc.Container(fluid=True, children=[
                             html.Div(id="graph-container"),
                             html.H5("Tomorrow's Prediction", className="mt-4"),
                             html.Div(id="prediction-container"),
+                            html.Button("Go Live", id="live-btn", className="btn btn-outline-success mt-3"),
+                            html.Div(id="live-status", className="mt-2"),
                         ])
                     ])
                 ],
@@ -103,8 +148,7 @@ app.layout = dbc.Container(fluid=True, children=[
                     html.Label("Analysis Type"),
                     dcc.Dropdown(
                         id="analysis-type",
-                        options=[
-                            {"label": "Default", "value": "default"},
+                        options=model_options() + [
                             {"label": "Sentimental", "value": "sentimental"}
                         ],
                         placeholder="Select analysis type",
@@ -147,26 +191,45 @@ app.layout = dbc.Container(fluid=True, children=[
         Input("load-real-data-btn", "n_clicks"),
         Input("ticker-input", "n_submit")
     ],
-    State("ticker-input", "value"),
+    [
+        State("ticker-input", "value"),
+        State("interval-input", "value")
+    ],
     prevent_initial_call=True
 )
-def load_real_data(n_clicks, n_submit, ticker):
+@timed("callback", callback="load_real_data")
+@profiled("load_real_data")
+def load_real_data(n_clicks, n_submit, ticker, interval="1d"):
     """
         Load historical stock data and render it as a line graph.
     """
     ticker = ticker or "AAPL"
-    fetch_and_save_data(ticker, "data.csv")
-    if os.path.exists("data.csv"):
+    interval = interval or "1d"
+
+    # Pre-warmed or recently loaded prices skip the download; data.csv is still written for the other callbacks
+    cached = price_cache.get((ticker.upper(), interval))
+    if cached is None and not fetch_and_save_data(ticker, "data.csv", interval=interval, bar_store=bar_store):
+        # Nothing was written: data.csv still holds the previous ticker, which must not be cached under this one
+        return f"No data found for {ticker.upper()}. Please try again."
+
+    graph_instance.ticker = ticker.upper() if interval == "1d" else f"{ticker.upper()}.{interval}"
+    if cached is not None:
+        graph_instance.data = list(cached)
+        graph_instance.write_csv("data.csv")
+    else:
         graph_instance.read_csv()
-        data = pd.read_csv("data.csv")
-        figure = {
-            "data": [
-                {"x": data["Date"], "y": data["Value"], "type": "line", "name": "Value"}
-            ],
-            "layout": {"title": f"Graph for {ticker.upper()}"}
-        }
-        return dcc.Graph(figure=figure)
-    return "No CSV file found. Please try again."
+        price_cache.set((ticker.upper(), interval), list(graph_instance.data))
+    graph_instance.bars = bar_store.load(ticker, interval)
+
+    dates = [date for date, _ in graph_instance.data]
+    values = [value for _, value in graph_instance.data]
+    figure = {
+        "data": [
+            {"x": dates, "y": values, "type": "line", "name": "Value"}
+        ],
+        "layout": {"title": f"Graph for {ticker.upper()}"}
+    }
+    return dcc.Graph(figure=figure)
 
 
 # Callback for value prediction
@@ -187,6 +250,8 @@ def load_real_data(n_clicks, n_submit, ticker):
     ],
     prevent_initial_call=True
 )
+@timed("callback", callback="check_confidence_callback")
+@profiled("check_confidence_callback")
 def check_confidence_callback(n_clicks, days, lag_days, analysis_type, ticker):
     """
         Run prediction based on the selected model and visualize confidence graph.
@@ -210,32 +275,55 @@ def check_confidence_callback(n_clicks, days, lag_days, analysis_type, ticker):
         f"{graph_instance.predict_tomorrow(lag_days):.2f}"
     )
 
-    # Default (autoregressive) mode
-    if analysis_type is None or analysis_type.lower() == "default":
+    # Lag-feature models from the registry: the default AR model, Ridge, Elastic Net, ...
+    if analysis_type is None or analysis_type.lower() in MODELS:
+        model = (analysis_type or "default").lower()
 
         # ensure we drop any sentimental predictor so we get back to the default model after switching
         graph_instance.predictor = None
+        # The ARX model also regresses on the daily news sentiment
+        graph_instance.sentiment = get_daily_sentiment(ticker or "AAPL") if model == "arx" else None
         try:
-            confidence, prediction_graph = graph_instance.check_confidence(
-                days, lag_days, return_graph=True
-            )
-            data_predicted = pd.DataFrame(prediction_graph.data, columns=['Date', 'Value'])
+            # Served from the forecast cache when pre-warmed or computed before for the same data
+            forecast = default_forecast(graph_instance, graph_instance.ticker or ticker or "data", days, lag_days,
+                                        n_boot=BOOTSTRAP_REPLICATES, model=model)
+            confidence = forecast["confidence"]
+            data_predicted = pd.DataFrame(forecast["predicted"], columns=['Date', 'Value'])
             data_real      = pd.DataFrame(graph_instance.data, columns=['Date', 'Value'])
+            point, lower, upper = forecast["tomorrow"]
+            traces = [
+                {"x": data_predicted["Date"], "y": data_predicted["Value"],
+                 "type": "line", "name": "Predicted"},
+                {"x": data_real["Date"],      "y": data_real["Value"],
+                 "type": "line", "name": "Real"}
+            ]
+            prediction_text = f"Tomorrow's predicted closing value: {point:.2f}"
+            confidence_text = f"Confidence Score: {confidence * 100:.2f}%"
+
+            # Bootstrap prediction intervals for the backtest tail and for tomorrow (AR model only)
+            if forecast["intervals"] is not None:
+                intervals = pd.DataFrame(forecast["intervals"], columns=['Date', 'Value', 'Lower', 'Upper'])
+                real_tail = data_real.set_index('Date')['Value'].reindex(intervals['Date'])
+                coverage = ((real_tail.values >= intervals['Lower']) & (real_tail.values <= intervals['Upper'])).mean()
+                prediction_text += f" (95% prediction interval: {lower:.2f} – {upper:.2f})"
+                confidence_text += f" (95% prediction interval coverage: {coverage * 100:.0f}%)"
+                traces = [
+                    {"x": intervals["Date"], "y": intervals["Upper"], "type": "line",
+                     "name": "95% PI upper", "line": {"width": 0}, "showlegend": False},
+                    {"x": intervals["Date"], "y": intervals["Lower"], "type": "line",
+                     "name": "95% prediction interval", "line": {"width": 0},
+                     "fill": "tonexty", "fillcolor": "rgba(31, 119, 180, 0.2)"},
+                ] + traces
 
             figure = {
-                "data": [
-                    {"x": data_predicted["Date"], "y": data_predicted["Value"],
-                     "type": "line", "name": "Predicted"},
-                    {"x": data_real["Date"],      "y": data_real["Value"],
-                     "type": "line", "name": "Real"}
-                ],
+                "data": traces,
                 "layout": {
-                    "title": f"Prediction for {days} days behind today "
+                    "title": f"{MODELS[model].label} prediction for {days} days behind today "
                              f"(using {lag_days} lag days)",
                     "showlegend": True
                 }
             }
-            return dcc.Graph(figure=figure), f"Confidence Interval: {confidence * 100:.2f}%", prediction_text
+            return dcc.Graph(figure=figure), confidence_text, prediction_text
 
         except Exception as e:
             return "", f"Error generating predictions: {e}", ""
@@ -273,7 +361,7 @@ def check_confidence_callback(n_clicks, days, lag_days, analysis_type, ticker):
                 f"{sentiment_predictor.predict_tomorrow(lag_days, 0):.2f}"
             )
 
-            return dcc.Graph(figure=figure), f"Confidence Interval: {confidence * 100:.2f}%", prediction_text
+            return dcc.Graph(figure=figure), f"Confidence Score: {confidence * 100:.2f}%", prediction_text
 
         except Exception as e:
             return "", f"Error with sentimental predictor: {e}", ""
@@ -289,6 +377,8 @@ def check_confidence_callback(n_clicks, days, lag_days, analysis_type, ticker):
     Input("ticker-input", "value"),
     prevent_initial_call=True
 )
+@timed("callback", callback="update_news")
+@profiled("update_news")
 def update_news(ticker):
     """
         Fetch and display recent headlines and sentiment scores for the given ticker.
@@ -296,7 +386,12 @@ def update_news(ticker):
     # Get the news
     if not ticker:
         return html.P("Please enter a ticker symbol.")
-    news = get_yahoo_finance_news(ticker)
+    news = news_cache.get(ticker.upper())
+    if news is None:
+        news = get_yahoo_finance_news(ticker)
+        # Empty results are usually transient failures, so only real headlines are kept
+        if news:
+            news_cache.set(ticker.upper(), news)
 
     # Check if the news is a dictionary with "articles" key
     if isinstance(news, dict) and "articles" in news:
@@ -316,18 +411,9 @@ def update_news(ticker):
                                            "red" if "Downward" in overall_sentiment else
                                            "gray"}))
         news_elements.append(html.Hr())
-        headers = {'User-Agent': 'Mozilla/5.0'}
         # Fetch titles and sentiments for each article
         for article in news:
-            try:
-                req = Request(article['url'], headers=headers)
-                page = urlopen(req)
-                html_content = page.read().decode("utf-8")
-                title_index = html_content.find("<title>") + len("<title>")
-                end_index = html_content.find("</title")
-                final_title = html_content[title_index:end_index]
-            except Exception:
-                final_title = "Error fetching title"
+            final_title = get_article_title(article['url'])
             sentiment = article.get('sentiment', 'Unknown')
             news_elements.append(
                 html.Div([
@@ -362,6 +448,7 @@ def update_news(ticker):
     State('ticker-input', 'value'),
     prevent_initial_call=True
 )
+@timed("callback", callback="toggle_price_section")
 def toggle_price_section(n_clicks, ticker):
     """
         Show or hide prediction section based on data loading.
@@ -372,4 +459,16 @@ def toggle_price_section(n_clicks, ticker):
 
 
 if __name__ == "__main__":
+    # Start warm from the previous run's snapshot; snapshot periodically and on shutdown (SIGTERM included)
+    snapshotter = snapshotter_from_env()
+    if snapshotter is not None and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        snapshotter.restore()
+        snapshotter.start()
+        atexit.register(snapshotter.stop)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    # Keep STOCKORACLE_WATCHLIST tickers warm in the background (in the reloader's serving process only)
+    prewarmer = prewarmer_from_env()
+    if prewarmer is not None and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        prewarmer.start()
     app.run(debug=True)
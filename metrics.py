@@ -0,0 +1,228 @@
+# Stock Oracle Group
+# 10/19/2026
+# Instrumentation: latency histograms, counters and a scrape-able metrics endpoint
+
+"""
+This module keeps an in-process registry of latency histograms and counters for the
+Dash callbacks, the upstream fetches, the model fits and backtests, and the caches.
+
+Everything is exposed in the Prometheus text format so it can be scraped from the
+`/metrics` route that `register_endpoint` adds to the Dash (Flask) server.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Upper bounds (seconds) of the latency buckets, from a cached lookup to a slow backtest
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PREFIX = "stockoracle_"
+
+
+class Histogram:
+    """
+        A cumulative latency histogram with fixed bucket bounds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+            Initializes an empty histogram.
+
+            Args:
+                buckets (tuple of float): Sorted upper bounds of the buckets, in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+            Records one observation.
+
+            Args:
+                value (float): The observed latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+        Thread-safe store of labelled histograms and counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name: str, text: str):
+        """
+            Sets the HELP text shown for a metric family.
+        """
+        self._help[name] = text
+
+    def observe(self, name: str, value: float, **labels):
+        """
+            Records a latency observation in the histogram `name` with the given labels.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        """
+            Adds `amount` to the counter `name` with the given labels.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter_value(self, name: str, **labels) -> float:
+        """
+            Returns the current value of a counter, or 0 if it was never incremented.
+        """
+        return self._counters.get(self._key(name, labels), 0)
+
+    def histogram(self, name: str, **labels):
+        """
+            Returns the histogram for `name` and labels, or None if nothing was observed.
+        """
+        return self._histograms.get(self._key(name, labels))
+
+    def reset(self):
+        """
+            Drops every recorded metric. Mostly useful in tests.
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+            Context manager that records the elapsed time of its body in the histogram `name`.
+            Exceptions are counted in `<name>_errors_total` and re-raised.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """
+            Decorator form of `timer`.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render(self) -> str:
+        """
+            Renders every metric in the Prometheus text exposition format.
+
+            Returns:
+                str: The exposition text.
+        """
+        with self._lock:
+            histograms = sorted(
+                (key, list(h.counts), h.sum, h.count, h.buckets)
+                for key, h in self._histograms.items()
+            )
+            counters = sorted(self._counters.items())
+
+        lines = []
+        seen = set()
+
+        def header(name, kind):
+            if name in seen:
+                return
+            seen.add(name)
+            if name in self._help:
+                lines.append(f"# HELP {PREFIX}{name} {self._help[name]}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), counts, total, count, buckets in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {count}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+# Process-wide registry used by the rest of the app
+registry = MetricsRegistry()
+registry.describe("callback_seconds", "Latency of Dash callbacks.")
+registry.describe("fetch_seconds", "Latency of upstream fetches (prices, news search, article pages).")
+registry.describe("model_seconds", "Latency of model fits and backtests.")
+registry.describe("cache_requests_total", "Cache lookups by result (hit or miss).")
+
+timer = registry.timer
+timed = registry.timed
+
+
+def record_cache(cache: str, hit: bool):
+    """
+        Counts one lookup against the named cache.
+
+        Args:
+            cache (str): Name of the cache (e.g. 'article_titles').
+            hit (bool): Whether the lookup was served from the cache.
+    """
+    registry.increment("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def register_endpoint(server, path: str = "/metrics"):
+    """
+        Adds a route serving the metrics text to a Flask server (e.g. `app.server` of a Dash app).
+
+        Args:
+            server: The Flask server.
+            path (str): URL path of the endpoint. Default is "/metrics".
+    """
+    from flask import Response
+
+    def metrics_view():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    server.add_url_rule(path, "metrics", metrics_view)
@@ -0,0 +1,216 @@
+# Stock Oracle Group
+# 10/19/2026
+# Registry of regression models that forecast from lag features
+
+"""
+Every registered model forecasts the next value from the same lag windows as the default AR model.
+The scikit-learn models see each window relative to its last value (window / window[-1] - 1) and
+predict the next return, so one set of hyper-parameters works for any price level.
+
+Backtests refit a model on an expanding window once per step. `ExpandingFit` reuses the previous
+step instead of fitting cold, depending on the model's strategy:
+
+    "gram"         Ridge: running sums of X'X and X'y, updated with the new rows and solved in closed form
+    "warm_start"   ElasticNet: coordinate descent starts from the previous coefficients;
+                   GradientBoosting: `grow` trees are added to the existing ensemble per step
+    "partial_fit"  SGD: one online pass over the new rows only
+    "refit"        anything else: a fresh estimator per step
+
+The "default" entry is the least-squares AR model built into `PredictedGraph`, and "arx" its
+extension with volume, range and optional sentiment regressors (needs `PredictedGraph.bars`).
+"""
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import ElasticNet, Ridge, SGDRegressor
+from metrics import timer
+
+STRATEGIES = ("lstsq", "arx", "gram", "warm_start", "partial_fit", "refit")
+
+
+class ModelSpec:
+    """
+        A registered model: how to build it and how to update it across backtest steps.
+    """
+
+    def __init__(self, name: str, label: str, make=None, strategy: str = "refit", grow: int = 0):
+        """
+            Args:
+                name (str): Registry key, also the value of the dashboard's analysis-type option.
+                label (str): Human-readable name.
+                make (callable, optional): Returns a new unfitted estimator.
+                strategy (str): One of STRATEGIES.
+                grow (int): Estimators added per backtest step for warm-started ensembles.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy: {strategy}")
+        self.name = name
+        self.label = label
+        self.make = make
+        self.strategy = strategy
+        self.grow = grow
+
+
+MODELS = {}
+
+
+def register_model(name: str, label: str, make=None, strategy: str = "refit", grow: int = 0) -> ModelSpec:
+    """
+        Adds a model to the registry (replacing any model of the same name).
+
+        Returns:
+            ModelSpec: The registered entry.
+    """
+    spec = ModelSpec(name, label, make, strategy, grow)
+    MODELS[name] = spec
+    return spec
+
+
+def get_model(name: str) -> ModelSpec:
+    """
+        Looks up a registered model by name (case-insensitive).
+
+        Raises:
+            ValueError: If no model of that name is registered.
+    """
+    spec = MODELS.get((name or "default").lower())
+    if spec is None:
+        raise ValueError(f"unknown model: {name}")
+    return spec
+
+
+def model_options() -> list:
+    """
+        Dropdown options ({"label", "value"}) for every registered model, in registration order.
+    """
+    return [{"label": spec.label, "value": spec.name} for spec in MODELS.values()]
+
+
+register_model("default", "Default", strategy="lstsq")
+register_model("arx", "ARX (volume, range)", strategy="arx")
+register_model("ridge", "Ridge", lambda: Ridge(alpha=0.01), strategy="gram")
+register_model("elasticnet", "Elastic Net",
+               lambda: ElasticNet(alpha=1e-5, l1_ratio=0.5, max_iter=5000, warm_start=True),
+               strategy="warm_start")
+register_model("sgd", "SGD",
+               lambda: SGDRegressor(alpha=1e-4, eta0=0.01, max_iter=1000, tol=1e-6, random_state=0),
+               strategy="partial_fit")
+register_model("gbr", "Gradient Boosting",
+               lambda: GradientBoostingRegressor(n_estimators=100, max_depth=3, learning_rate=0.05,
+                                                 random_state=0, warm_start=True),
+               strategy="warm_start", grow=1)
+
+
+class ExpandingFit:
+    """
+        Fits a registered model on the first rows of a series and predicts the value after them,
+        reusing the previous fit whenever the window only grew.
+    """
+
+    def __init__(self, spec: ModelSpec, values, lag_days: int):
+        """
+            Args:
+                spec (ModelSpec): A registered scikit-learn model.
+                values (array-like): The price series, oldest first.
+                lag_days (int): Number of lags.
+        """
+        if spec.make is None:
+            raise ValueError(f"model {spec.name} has no estimator")
+        values = np.asarray(values, dtype=float)
+        self.spec = spec
+        self.lag_days = lag_days
+        # Every lag window, scaled by its last value; window j predicts values[j + lag_days]
+        windows = np.lib.stride_tricks.sliding_window_view(values, lag_days)
+        self.scale = windows[:, -1]
+        self.Z = windows / self.scale[:, None] - 1.0
+        self.target = values[lag_days:] / self.scale[:-1] - 1.0
+        self.reset()
+
+    def reset(self):
+        """
+            Drops the fitted state; the next fit starts cold.
+        """
+        self.estimator = self.spec.make()
+        self.fitted_rows = 0
+        self._sums = None
+
+    def fit(self, rows: int):
+        """
+            Fits the model on values[:rows].
+        """
+        m = rows - self.lag_days
+        if m < 1:
+            raise ValueError(f"Need at least {self.lag_days+1} points; got {rows}.")
+        if m < self.fitted_rows or self.spec.strategy == "refit":
+            self.reset()
+        if m == self.fitted_rows:
+            return
+
+        with timer("model", stage="fit", model=self.spec.name):
+            new = slice(self.fitted_rows, m)
+            if self.spec.strategy == "gram":
+                self._accumulate(self.Z[new], self.target[new])
+            elif self.spec.strategy == "partial_fit" and self.fitted_rows:
+                self.estimator.partial_fit(self.Z[new], self.target[new])
+            else:
+                if self.fitted_rows and self.spec.grow:
+                    self.estimator.n_estimators += self.spec.grow
+                self.estimator.fit(self.Z[:m], self.target[:m])
+        self.fitted_rows = m
+
+    def _accumulate(self, X: np.ndarray, y: np.ndarray):
+        """
+            Adds rows to the running sums and solves the ridge problem (intercept not penalized).
+        """
+        if self._sums is None:
+            k = self.Z.shape[1]
+            self._sums = [0, np.zeros(k), 0.0, np.zeros((k, k)), np.zeros(k)]
+        sums = self._sums
+        sums[0] += len(y)
+        sums[1] += X.sum(axis=0)
+        sums[2] += y.sum()
+        sums[3] += X.T @ X
+        sums[4] += X.T @ y
+        n, sx, sy, sxx, sxy = sums
+        gram = sxx - np.outer(sx, sx) / n + self.estimator.alpha * np.eye(sx.size)
+        coef = np.linalg.solve(gram, sxy - sx * sy / n)
+        self.estimator.coef_ = coef
+        self.estimator.intercept_ = (sy - sx @ coef) / n
+        self.estimator.n_features_in_ = sx.size
+
+    def predict(self, rows: int) -> float:
+        """
+            Predicts the value after values[:rows] with the current fit.
+        """
+        j = rows - self.lag_days
+        z = self.Z[j]
+        if self.spec.strategy == "gram":
+            ret = float(z @ self.estimator.coef_ + self.estimator.intercept_)
+        else:
+            ret = float(self.estimator.predict(z[None, :])[0])
+        return float(self.scale[j] * (1.0 + ret))
+
+    def fit_predict(self, rows: int) -> float:
+        """
+            Fits on values[:rows] and predicts the next value.
+        """
+        self.fit(rows)
+        return self.predict(rows)
+
+
+def backtest(name: str, values, lag_days: int, rows) -> np.ndarray:
+    """
+        One-step forecasts of a registered model for each training length in `rows` (ascending),
+        carrying the fit from one step to the next.
+
+        Args:
+            name (str): Registered model name (not "default").
+            values (array-like): The price series, oldest first.
+            lag_days (int): Number of lags.
+            rows (iterable of int): Training lengths; forecast i predicts values[rows[i]].
+
+        Returns:
+            np.ndarray: One forecast per training length.
+    """
+    model = ExpandingFit(get_model(name), values, lag_days)
+    return np.array([model.fit_predict(int(r)) for r in rows], dtype=float)
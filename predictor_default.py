@@ -4,72 +4,215 @@
 import numpy as np
 import pandas as pd
 from graph import Graph
+from feature_store import FeatureSet
+from metrics import timed, timer
+from models import ExpandingFit, get_model
+from profiling import span
+
+def auc_confidence(predicted, real) -> float:
+    """
+    Confidence score 1 - |AUC(pred) - AUC(real)| / max(AUCs), clipped to [0, 1].
+
+    Parameters:
+        predicted  Predicted values over the compared window.
+        real       Real values over the same window.
+
+    Returns:
+        float     Confidence in [0, 1].
+    """
+    area_pred = np.trapz(predicted)
+    area_real = np.trapz(real)
+    diff = abs(area_pred - area_real)
+    max_area = max(area_pred, area_real)
+    confidence = 1 - (diff / max_area) if max_area else 0.0
+    return max(0.0, min(1.0, confidence))
+
+
+def bootstrap_ar_intervals(series, lag_days: int, origins, n_boot: int = 1000, alpha: float = 0.05,
+                           seed=None):
+    """
+    Residual-bootstrap prediction intervals for AR(lag_days) one-step forecasts.
+
+    For each origin k the model is fitted on series[:k] and predicts series[k]. All `n_boot`
+    replicates of an origin are one batched solve: with P = pinv(X) and the forecast window w,
+    every replicate's forecast is w.(beta + P e*) + e**, so only the vector w P and one
+    (rows x n_boot) gather of resampled residuals are needed. The lag matrix and the uniform
+    draws behind the resampled indices are built once and shared by every origin.
+
+    Parameters:
+        series    1-D array of values in time order.
+        lag_days  Number of lags of the AR model.
+        origins   Iterable of training lengths k (each lag_days < k <= len(series)).
+        n_boot    Number of bootstrap replicates B.
+        alpha     Two-sided miss rate (0.05 gives a 95% interval).
+        seed      Seed of the NumPy generator, for reproducible intervals.
+
+    Returns:
+        (point, lower, upper)  Arrays with one entry per origin.
+    """
+    series = np.asarray(series, dtype=float)
+    origins = np.asarray(list(origins), dtype=int)
+    if origins.size == 0:
+        empty = np.empty(0)
+        return empty, empty, empty
+    if origins.min() <= lag_days:
+        raise ValueError(f"Need at least {lag_days+1} points; got {origins.min()}.")
+
+    # Shared lag matrix: row j is series[j : j + lag_days] and predicts series[j + lag_days]
+    X_all = np.lib.stride_tricks.sliding_window_view(series, lag_days)[:-1]
+    y_all = series[lag_days:]
+
+    # Shared randomness: resample indices are derived from one block of uniforms
+    rng = np.random.default_rng(seed)
+    max_rows = origins.max() - lag_days
+    fit_draws = rng.random((max_rows, n_boot))
+    noise_draws = rng.random(n_boot)
+
+    point = np.empty(origins.size)
+    lower = np.empty(origins.size)
+    upper = np.empty(origins.size)
+    for i, k in enumerate(origins):
+        rows = k - lag_days
+        X, y = X_all[:rows], y_all[:rows]
+        pinv = np.linalg.pinv(X)
+        coeffs = pinv @ y
+        window = series[k - lag_days:k]
+
+        # Centered residuals, inflated for the degrees of freedom used by the fit
+        residuals = y - X @ coeffs
+        residuals = residuals - residuals.mean()
+        if rows > lag_days:
+            residuals *= np.sqrt(rows / (rows - lag_days))
+
+        resampled = residuals[(fit_draws[:rows] * rows).astype(np.intp)]  # (rows, B)
+        forecasts = window @ coeffs + (window @ pinv) @ resampled
+        forecasts += residuals[(noise_draws * rows).astype(np.intp)]
+
+        point[i] = window @ coeffs
+        lower[i], upper[i] = np.quantile(forecasts, [alpha / 2, 1 - alpha / 2])
+    return point, lower, upper
+
 
 class PredictedGraph(Graph):
     """
     Forecast using an AR model fitted on real data, then backtest simulate tail predictions.
     """
 
-    def __init__(self, predictor=None, *args, **kwargs):
+    def __init__(self, predictor=None, *args, feature_store=None, ticker=None, bars=None, sentiment=None,
+                 **kwargs):
+        """
+        Parameters:
+            predictor      Optional alternative predictor attached to this graph.
+            feature_store  Optional FeatureStore; when set together with `ticker`, features are
+                           memory-mapped from the store instead of computed in memory.
+            ticker         Key of this series in the feature store.
+            bars           Optional OHLCV `bar_store.Bars` of the series, used by the ARX model.
+            sentiment      Optional {YYYY-MM-DD: score} daily sentiment, an extra ARX regressor.
+        """
         super().__init__(*args, **kwargs)
         self.predictor = predictor
+        self.feature_store = feature_store
+        self.ticker = ticker
+        self.bars = bars
+        self.sentiment = sentiment
+        self._features_key = None
+        self._features = None
+        self._dates = None
+        self._timestamps = None
 
-    def predict_tomorrow(self, lag_days: int, base_date: str = None) -> float:
+    def features(self) -> FeatureSet:
         """
-        Fit an AR(lag_days) model on data up to `base_date` and predict the next point.
-
-        Parameters:
-            lag_days   Number of past days to use as features.
-            base_date  YYYY-MM-DD string to cutoff training data (inclusive). If None, use all data.
+        Features (values, lag views, returns, rolling stats) of self.data sorted by date.
+        Computed once and reused until the data is replaced, grows or is marked changed with `touch()`.
 
         Returns:
-            float     Forecasted value for the day after base_date.
+            FeatureSet  In memory, or memory-mapped from the feature store.
         """
         if not self.data:
             self.read_csv()
+        data = self.data
+        key = (self.version, len(data), data[-1] if data else None)
+        if key != self._features_key:
+            with span("fit.prepare"):
+                df = pd.DataFrame(data, columns=["Date", "Value"])
+                df["Timestamp"] = pd.to_datetime(df["Date"], format="ISO8601")
+                df.sort_values("Timestamp", inplace=True, kind="stable")
+                values = df["Value"].to_numpy(dtype=float)
+                if self.feature_store is not None and self.ticker:
+                    self._features = self.feature_store.get(self.ticker, values)
+                else:
+                    self._features = FeatureSet.from_values(values)
+                self._dates = df["Date"].tolist()
+                self._timestamps = df["Timestamp"].to_numpy()
+                self._features_key = key
+        return self._features
 
-        # Build DataFrame and filter by base_date
-        df = pd.DataFrame(self.data, columns=["Date", "Value"])
-        df["Date"] = pd.to_datetime(df["Date"])
-        df.sort_values("Date", inplace=True)
-        df.set_index("Date", inplace=True)
-
-        if base_date:
-            cutoff = pd.to_datetime(base_date)
-            df = df.loc[:cutoff]
+    def _rows_through(self, base_dates) -> np.ndarray:
+        """
+        Number of sorted rows dated on or before each base date.
+        """
+        cutoffs = pd.to_datetime(base_dates).to_numpy()
+        return np.searchsorted(self._timestamps, cutoffs, side="right")
 
-        series = df["Value"].to_numpy()
-        n = series.size
-        if n <= lag_days:
-            raise ValueError(f"Need at least {lag_days+1} points; got {n}.")
+    @timed("model", stage="fit", model="default")
+    def _fit_predict(self, features: FeatureSet, lag_days: int, rows: int) -> float:
+        """
+        Fit AR(lag_days) on the first `rows` values of `features` and predict the value after them.
+        """
+        if rows <= lag_days:
+            raise ValueError(f"Need at least {lag_days+1} points; got {rows}.")
 
-        # Build lagged matrix X of shape (n-lag_days, lag_days)
-        X = np.column_stack([
-            series[i : n - lag_days + i]
-            for i in range(lag_days)
-        ])
-        y = series[lag_days:]
+        # Lagged matrix X of shape (rows-lag_days, lag_days), a view into the feature values
+        X, y = features.lag_matrix(lag_days, rows)
 
         # Solve for AR coefficients via least squares
-        coeffs, *_ = np.linalg.lstsq(X, y, rcond=None)
+        with span("fit.lstsq"):
+            coeffs, *_ = np.linalg.lstsq(X, y, rcond=None)
 
-        # Last lag_days values (most recent) for prediction
-        window = series[-lag_days:][::-1]
+        # Last lag_days values, oldest first to line up with the columns of X
+        window = features.values[rows - lag_days:rows]
         return float(np.dot(coeffs, window))
 
-    def predict_days_ahead(self, days: int, lag_days: int) -> 'PredictedGraph':
+    def predict_tomorrow(self, lag_days: int, base_date: str = None, model: str = "default") -> float:
+        """
+        Fit an AR(lag_days) model (or a registered model) on data up to `base_date` and predict the next point.
+
+        Parameters:
+            lag_days   Number of past days to use as features.
+            base_date  YYYY-MM-DD string to cutoff training data (inclusive). If None, use all data.
+            model      Name of a model in the `models` registry.
+
+        Returns:
+            float     Forecasted value for the day after base_date.
+        """
+        features = self.features()
+        rows = int(self._rows_through([base_date])[0]) if base_date else len(features)
+        spec = get_model(model)
+        if spec.strategy == "lstsq":
+            return self._fit_predict(features, lag_days, rows)
+        if spec.strategy == "arx":
+            return float(self._arx_predict(lag_days, np.array([rows]))[0])
+        return ExpandingFit(spec, features.values, lag_days).fit_predict(rows)
+
+    def predict_days_ahead(self, days: int, lag_days: int, model: str = "default") -> 'PredictedGraph':
         """
         Backtest: for the final `days` timepoints in self.data, predict each one using only real history.
+        Registered models carry their fit from one step of the expanding window to the next.
 
         Parameters:
             days     Number of points at the end to forecast.
             lag_days Number of lags for the AR model.
+            model    Name of a model in the `models` registry.
 
         Returns:
             PredictedGraph containing historical data up to divergence and predicted tail.
         """
-        if not self.data:
-            self.read_csv()
+        spec = get_model(model)
+        with timer("model", stage="backtest", model=spec.name):
+            return self._backtest(days, lag_days, spec)
+
+    def _backtest(self, days: int, lag_days: int, spec) -> 'PredictedGraph':
+        features = self.features()
 
         full = list(self.data)
         n = len(full)
@@ -80,14 +223,132 @@ class PredictedGraph(Graph):
         pg = PredictedGraph(predictor=self.predictor, data=list(hist))
 
         # For each true date in the tail, forecast using real history only
-        for idx in range(n - days, n):
-            base_date = full[idx - 1][0]
-            pred_val = self.predict_tomorrow(lag_days, base_date=base_date)
-            pg.data.append((full[idx][0], pred_val))
+        with span("backtest"):
+            rows = self._rows_through([full[idx - 1][0] for idx in range(n - days, n)])
+            if spec.strategy == "arx":
+                # Every origin is solved in one batch
+                pg.data.extend(zip([full[idx][0] for idx in range(n - days, n)],
+                                   self._arx_predict(lag_days, rows).tolist()))
+                return pg
+            if spec.strategy == "lstsq":
+                fit_predict = lambda r: self._fit_predict(features, lag_days, r)
+            else:
+                fit_predict = ExpandingFit(spec, features.values, lag_days).fit_predict
+            for idx, rows_through in zip(range(n - days, n), rows):
+                pred_val = fit_predict(int(rows_through))
+                pg.data.append((full[idx][0], pred_val))
 
         return pg
 
-    def check_confidence(self, days: int, lag_days: int, return_graph=False):
+    def exogenous(self) -> np.ndarray:
+        """
+        ARX regressors aligned with the sorted values: log(1 + volume), the high-low range relative
+        to the close and, when `sentiment` is set, the day's sentiment score. Each row uses the
+        newest bar at or before its date (zeros before the first bar).
+
+        Returns:
+            (n, k) float array.
+        """
+        if self.bars is None:
+            raise ValueError("The ARX model needs OHLCV bars; set PredictedGraph.bars (see bar_store.BarStore).")
+        self.features()
+        idx = np.searchsorted(self.bars.timestamps(), self._timestamps.astype("datetime64[ns]"), side="right") - 1
+        known = idx >= 0
+        idx = np.maximum(idx, 0)
+        columns = [np.log1p(np.asarray(self.bars.volume, dtype=float))[idx],
+                   np.asarray(self.bars.range(), dtype=float)[idx]]
+        if self.sentiment:
+            columns.append(np.array([self.sentiment.get(date[:10], 0.0) for date in self._dates], dtype=float))
+        exog = np.column_stack(columns)
+        exog[~known] = 0.0
+        return exog
+
+    def _arx_predict(self, lag_days: int, rows) -> np.ndarray:
+        """
+        ARX(lag_days) one-step forecasts for several training lengths at once. The regressors of the
+        value at position t are values[t-lag_days:t], the exogenous row of t-1 and an intercept.
+        Normal equations of consecutive origins differ by a few rows, so they are built from one
+        cumulative sum of outer products and all origins are solved in a single batched call.
+
+        Parameters:
+            lag_days  Number of lags.
+            rows      Training lengths (ascending); forecast i predicts the value after values[:rows[i]].
+
+        Returns:
+            np.ndarray of forecasts.
+        """
+        rows = np.asarray(rows, dtype=int)
+        values = np.asarray(self.features().values, dtype=float)
+        if rows.min() <= lag_days:
+            raise ValueError(f"Need at least {lag_days+1} points; got {rows.min()}.")
+
+        with timer("model", stage="fit", model="arx"), span("fit.arx"):
+            # Design row i predicts values[i + lag_days]; the last row is the forecast window
+            windows = np.lib.stride_tricks.sliding_window_view(values, lag_days)
+            design = np.column_stack([windows, self.exogenous()[lag_days - 1:], np.ones(len(windows))])
+            scale = np.abs(design).max(axis=0)
+            design = design[:, scale > 0] / scale[scale > 0]  # drop all-zero regressors, equalize columns
+            X, y = design[:-1], values[lag_days:]
+
+            fitted = rows - lag_days
+            first = fitted.min()
+            tail = X[first:fitted.max()]
+            gram = np.concatenate([(X[:first].T @ X[:first])[None], np.einsum("ij,ik->ijk", tail, tail)])
+            moment = np.concatenate([(X[:first].T @ y[:first])[None], tail * y[first:fitted.max(), None]])
+            gram = np.cumsum(gram, axis=0)[fitted - first]
+            moment = np.cumsum(moment, axis=0)[fitted - first]
+            try:
+                coeffs = np.linalg.solve(gram, moment[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                coeffs = np.einsum("bij,bj->bi", np.linalg.pinv(gram), moment)
+            return np.einsum("ij,ij->i", design[fitted], coeffs)
+
+    def predict_interval(self, lag_days: int, n_boot: int = 1000, alpha: float = 0.05, seed=None):
+        """
+        Forecast the next point with a residual-bootstrap prediction interval.
+
+        Parameters:
+            lag_days  Number of past days to use as features.
+            n_boot    Number of bootstrap replicates.
+            alpha     Two-sided miss rate (0.05 gives a 95% interval).
+            seed      Seed for reproducible intervals.
+
+        Returns:
+            (point, lower, upper) floats.
+        """
+        values = self.features().values
+        point, lower, upper = bootstrap_ar_intervals(values, lag_days, [values.size], n_boot, alpha, seed)
+        return float(point[0]), float(lower[0]), float(upper[0])
+
+    @timed("model", stage="bootstrap", model="default")
+    def predict_intervals_days_ahead(self, days: int, lag_days: int, n_boot: int = 1000,
+                                     alpha: float = 0.05, seed=None) -> list:
+        """
+        Backtest with intervals: for each of the final `days` points, the one-step forecast from
+        real history and its bootstrap prediction interval. Origins share one lag matrix and one
+        block of random draws.
+
+        Parameters:
+            days      Number of points at the end to forecast.
+            lag_days  Number of lags for the AR model.
+            n_boot    Number of bootstrap replicates.
+            alpha     Two-sided miss rate (0.05 gives a 95% interval).
+            seed      Seed for reproducible intervals.
+
+        Returns:
+            list of (date, point, lower, upper) tuples, oldest first.
+        """
+        values = self.features().values
+        dates = self._dates
+        n = values.size
+        days = max(1, min(days, n - lag_days - 1))
+        origins = range(n - days, n)
+        with span("bootstrap"):
+            point, lower, upper = bootstrap_ar_intervals(values, lag_days, origins, n_boot, alpha, seed)
+        return [(dates[k], float(p), float(lo), float(hi))
+                for k, p, lo, hi in zip(origins, point, lower, upper)]
+
+    def check_confidence(self, days: int, lag_days: int, return_graph=False, model: str = "default"):
         """
         Compute confidence as 1 - |AUC(pred) - AUC(real)| / max(AUCs).
 
@@ -95,22 +356,18 @@ class PredictedGraph(Graph):
             days         Number of tail points to compare.
             lag_days     Lag days for AR model.
             return_graph If True, also return the PredictedGraph.
+            model        Name of a model in the `models` registry.
 
         Returns:
             confidence float, and optionally the PredictedGraph.
         """
-        full_pred = self.predict_days_ahead(days, lag_days)
+        full_pred = self.predict_days_ahead(days, lag_days, model=model)
         pred_df = pd.DataFrame(full_pred.data, columns=["Date", "Value"])
         real_df = pd.DataFrame(self.data,      columns=["Date", "Value"])
 
         pred_tail = pred_df.tail(days)
         real_tail = real_df.tail(days)
 
-        area_pred = np.trapz(pred_tail["Value"])
-        area_real = np.trapz(real_tail["Value"])
-        diff = abs(area_pred - area_real)
-        max_area = max(area_pred, area_real)
-        confidence = 1 - (diff / max_area) if max_area else 0.0
-        confidence = max(0.0, min(1.0, confidence))
+        confidence = auc_confidence(pred_tail["Value"], real_tail["Value"])
 
         return (confidence, full_pred) if return_graph else confidence
\ No newline at end of file
@@ -11,46 +11,11 @@ The predictor can estimate tomorrow’s price or simulate multiple days ahead us
 """
 
 import os
-import pandas as pd
-from fetch_stock_news import get_yahoo_finance_news
+import numpy as np
+from fetch_stock_news import SENTIMENT_SCORES, get_daily_sentiment, get_yahoo_finance_news
+from graph import Graph
 from predictor_default import PredictedGraph
-
-# Pycharm wanted me to do this
-def get_historical_price(date: pd.Timestamp) -> float:
-    """
-        Retrieves a historical stock price from 'data.csv' for a given date.
-
-        If the date is not found, uses the last available price before the given date,
-        or falls back to the first available or default value.
-
-        Args:
-            date (pd.Timestamp): Date to retrieve the price for.
-
-        Returns:
-            float: Historical price for the date, or a fallback value.
-    """
-    filename = "data.csv"
-    default_price = 100.0
-    if not os.path.exists(filename):
-        return default_price
-
-    df = pd.read_csv(filename)
-    if df.empty or "Date" not in df or "Value" not in df:
-        return default_price
-
-    df["Date"] = pd.to_datetime(df["Date"])
-    # Exact match
-    exact = df[df["Date"] == date]
-    if not exact.empty:
-        return float(exact.iloc[0]["Value"])
-
-    # Otherwise, use last available date before target
-    before = df[df["Date"] < date]
-    if not before.empty:
-        return float(before.iloc[-1]["Value"])
-
-    # Otherwise fallback to first or default
-    return float(df.iloc[0]["Value"]) if not df.empty else default_price
+from metrics import timed
 
 
 class PredictorSentimental:
@@ -58,20 +23,63 @@ class PredictorSentimental:
         A predictor that uses sentiment analysis of recent news headlines to estimate stock price movement.
     """
 
-    def __init__(self, ticker: str):
+    # Relative price change per sentiment point
+    SENTIMENT_WEIGHT = 0.25
+
+    def __init__(self, ticker: str, filename: str = "data.csv", provider=None):
         """
             Initializes the predictor with a stock ticker symbol.
 
             Args:
                 ticker (str): The stock symbol to analyze (e.g., 'AAPL').
+                filename (str): CSV file holding the ticker's price history. Default is 'data.csv'.
+                provider (optional): Upstream news provider. Defaults to the process-wide provider.
         """
         self.ticker = ticker
+        self.filename = filename
+        self.provider = provider
+
+    def _series(self):
+        """
+            Loads the price history once, sorted by date.
+
+            Returns:
+                (list of str, np.ndarray): Dates (the trading calendar of the series) and values.
+        """
+        if not os.path.exists(self.filename):
+            return [], np.empty(0)
+        graph = Graph(filename=self.filename)
+        graph.read_csv()
+        data = sorted(graph.data, key=lambda row: row[0])
+        return [date for date, _ in data], np.fromiter((value for _, value in data), dtype=float, count=len(data))
+
+    def simulate(self, dates: list, values: np.ndarray, targets, lag_days: int) -> np.ndarray:
+        """
+            Sentiment-adjusted predictions for several trading days in one pass. The prediction for
+            row t of the series starts from the price `lag_days` trading days earlier and moves it
+            by SENTIMENT_WEIGHT per point of that day's average headline sentiment.
 
+            Args:
+                dates (list of str): Trading calendar of the series.
+                values (np.ndarray): Prices aligned with `dates`.
+                targets (array-like of int): Rows of the series to predict.
+                lag_days (int): Trading days between the source day and the predicted day.
+
+            Returns:
+                np.ndarray: One prediction per target.
+        """
+        sources = np.clip(np.asarray(targets, dtype=int) - lag_days, 0, len(values) - 1)
+        daily = get_daily_sentiment(self.ticker, provider=self.provider)
+        scores = np.fromiter((daily.get(dates[row][:10], 0.0) for row in sources), dtype=float, count=sources.size)
+        return values[sources] * (1 + self.SENTIMENT_WEIGHT * scores)
+
+    @timed("model", stage="fit", model="sentimental")
     def predict_tomorrow(self, lag_days: int, lag_day_number: int = None) -> float:
         """
             Predicts the next day's stock price using sentiment scores from recent news.
 
-            If lag_day_number is provided, it performs a simulation-like prediction for a prior day.
+            If lag_day_number is provided, it performs a simulation-like prediction for a prior day:
+            the nth trading day before the last row of the series, counted after `lag_days`.
             Otherwise, it uses current sentiment to predict tomorrow's price.
 
             Args:
@@ -82,95 +90,50 @@ class PredictorSentimental:
                 float: The predicted closing price.
         """
         if lag_day_number:
-            # Compute target date for sentiment and base price lookup
-            today = pd.Timestamp.today().normalize()
-            offset = lag_days + lag_day_number
-            target_date = today - pd.Timedelta(days=offset)
-            target_str = target_date.strftime("%Y-%m-%d")
+            dates, values = self._series()
+            if not dates:
+                return 100.0
+            return float(self.simulate(dates, values, [len(values) - 1 - lag_day_number], lag_days)[0])
 
-            # Fetch news for the target date
-            articles = get_yahoo_finance_news(self.ticker, date=target_str)
-
-            # Compute average sentiment score
-            if articles:
-                mapping = {"Positive": 1, "Neutral": 0, "Negative": -1}
-                scores = [mapping.get(a.get("sentiment", "Neutral"), 0) for a in articles]
-                avg_sentiment = sum(scores) / len(scores)
-            else:
-                avg_sentiment = 0.0
+        # If no lag day number, use the normal prediction logic
+        news = get_yahoo_finance_news(self.ticker, provider=self.provider)
+        if not news:
+            return 0.0
 
-            # Determine the base price from historical data.csv
-            base_price = get_historical_price(target_date)
+        # Map sentiment labels to numerical scores
+        scores = [SENTIMENT_SCORES.get(article.get("sentiment", "Neutral"), 0) for article in news]
+        avg_sentiment = sum(scores) / len(scores)
 
-            # Apply sentiment adjustment: ±25% per sentiment point
-            return base_price * (1 + 0.25 * avg_sentiment)
+        # Base price: the last row of the history
+        _, values = self._series()
+        base = values[-1] if values.size else 100.0
 
-        # If no lag day number, use the normal prediction logic
-        else:
-            news = get_yahoo_finance_news(self.ticker)
-            if not news:
-                return 0.0
-
-            # Map sentiment labels to numerical scores
-            sentiment_mapping = {"Positive": 1, "Neutral": 0, "Negative": -1}
-            total, count = 0, 0
-            for article in news:
-                score = sentiment_mapping.get(article.get("sentiment", "Neutral"), 0)
-                total += score
-                count += 1
-            avg_sentiment = total / count if count > 0 else 0.0
-
-            # Determine base price: use the last_value passed in if available, otherwise read the last CSV row as before
-            if os.path.exists("data.csv"):
-                try:
-                    df = pd.read_csv("data.csv")
-                    base = df.iloc[-1]["Value"]
-                except Exception:
-                    base = 100.0
-
-            # Adjust prediction: 25% change per sentiment point
-            prediction = base * (1 + 0.25 * avg_sentiment)
-            return prediction
+        # Adjust prediction: 25% change per sentiment point
+        return float(base * (1 + self.SENTIMENT_WEIGHT * avg_sentiment))
 
+    @timed("model", stage="backtest", model="sentimental")
     def predict_days_ahead(self, days: int, lag_days: int) -> 'PredictedGraph':
         """
-            Simulates stock predictions for a future window by applying sentiment scores iteratively.
+            Simulates the last `days` trading days of the series with sentiment-adjusted prices.
+
+            Target dates are the series' own dates, so weekends and holidays are skipped and the
+            result does not depend on today's date. The history, the daily sentiment and the base
+            prices are loaded once and the predictions computed as arrays.
 
             Args:
-                days (int): Number of days to simulate ahead.
+                days (int): Number of trading days to simulate.
                 lag_days (int): Number of lag days used in the simulation logic.
 
             Returns:
-                PredictedGraph: A graph object containing the predicted time series.
+                PredictedGraph: History up to the divergence point followed by the predicted days.
         """
-        if not os.path.exists("data.csv"):
+        dates, values = self._series()
+        n = len(dates)
+        if n < 2:
             return PredictedGraph(predictor=self, data=[])
 
-        df = pd.read_csv("data.csv")
-        if df.empty or "Date" not in df or "Value" not in df:
-            return PredictedGraph(predictor=self, data=[])
-
-        df["Date"] = pd.to_datetime(df["Date"])
-        series = df.set_index("Date")["Value"]
-
-        # Create a new PredictedGraph with the historical slice
-        initial_data = list(zip(series.index.strftime("%Y-%m-%d"), series.values))
-        predictions = PredictedGraph(predictor=self, data=initial_data[: -days])
-
-        days_since_divergence = 0
-
-        # Generate predictions iteratively
-        while True:
-            last_date = predictions.data[-1][0]
-            if isinstance(last_date, str):
-                last_date = pd.Timestamp(last_date)
-
-            if last_date >= series.index[-1]:
-                break
-
-            next_value = self.predict_tomorrow(lag_days, days_since_divergence)
-            next_date = last_date + pd.Timedelta(days=1)
-            predictions.data.append((next_date.strftime("%Y-%m-%d"), next_value))
-            days_since_divergence += 1
-
-        return predictions
+        days = max(1, min(days, n - 1))
+        targets = np.arange(n - days, n)
+        predicted = self.simulate(dates, values, targets, lag_days)
+        data = list(zip(dates[:n - days], values[:n - days].tolist())) + list(zip(dates[n - days:], predicted.tolist()))
+        return PredictedGraph(predictor=self, data=data)
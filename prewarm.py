@@ -0,0 +1,237 @@
+# Stock Oracle Group
+# 10/19/2026
+# Scheduled pre-warming of prices, news and forecasts for a watchlist
+
+"""
+After the market closes (or on a fixed interval), the pre-warmer refreshes a watchlist in the
+background: price history through the bulk ingestion, news headlines and article titles, the
+next-day forecast and the default-parameter backtest. Everything lands in the shared caches of
+`cache.py` that the Dash callbacks read, so the first request of the morning is served warm
+instead of hitting Yahoo.
+
+Enable it for the dashboard with environment variables:
+    STOCKORACLE_WATCHLIST=AAPL,MSFT,NVDA      tickers to keep warm
+    STOCKORACLE_PREWARM_INTERVAL=900          optional: refresh every N seconds instead of after close
+    STOCKORACLE_PREWARM_AFTER_CLOSE=16:15     optional: New York time of the daily refresh
+"""
+
+import datetime
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from bar_store import BarStore
+from cache import article_title_cache, forecast_cache, news_cache, price_cache
+from fetch_stock_data import fetch_and_save_many, partition_path
+from fetch_stock_news import get_article_title, get_yahoo_finance_news
+from metrics import timer
+from models import get_model
+from predictor_default import PredictedGraph
+
+EXCHANGE_TZ = "America/New_York"
+
+# Backtest parameters the dashboard suggests (days behind today, lag days)
+DEFAULT_PARAMETERS = ((20, 20),)
+
+# Bootstrap replicates behind the cached prediction intervals
+BOOTSTRAP_REPLICATES = 1000
+
+# Pre-warmed entries outlive the next scheduled run by this many seconds, in case it is late or slow
+EXPIRY_GRACE_SECONDS = 60 * 60
+
+
+def default_forecast(graph: PredictedGraph, ticker: str, days: int, lag_days: int,
+                     n_boot: int = BOOTSTRAP_REPLICATES, model: str = "default") -> dict:
+    """
+        Backtest results shown by the dashboard, served from the forecast cache when the same
+        ticker, data version, model and parameters were computed before.
+
+        Args:
+            graph (PredictedGraph): The loaded price history.
+            ticker (str): Ticker the history belongs to (part of the cache key).
+            days (int): Days behind today of the backtest.
+            lag_days (int): Lag days of the AR model.
+            n_boot (int): Bootstrap replicates of the prediction intervals.
+            model (str): Name of a model in the `models` registry.
+
+        Returns:
+            dict: "confidence", "predicted" (backtest graph data), "intervals" (date, point, lower,
+            upper) and "tomorrow" (point, lower, upper). Prediction intervals exist for the
+            default AR model only; other models get None for "intervals" and the bounds.
+    """
+    model = get_model(model).name
+    key = (model, ticker.upper(), graph.features().version, days, lag_days, n_boot)
+
+    def compute():
+        confidence, predicted = graph.check_confidence(days, lag_days, return_graph=True, model=model)
+        result = {"confidence": confidence, "predicted": list(predicted.data)}
+        if model == "default":
+            result["intervals"] = graph.predict_intervals_days_ahead(days, lag_days, n_boot=n_boot, seed=0)
+            result["tomorrow"] = graph.predict_interval(lag_days, n_boot=n_boot, seed=0)
+        else:
+            result["intervals"] = None
+            result["tomorrow"] = (graph.predict_tomorrow(lag_days, model=model), None, None)
+        return result
+
+    return forecast_cache.get_or_set(key, compute)
+
+
+def next_run_after(now: datetime.datetime, after_close: str = "16:15") -> datetime.datetime:
+    """
+        Returns the next weekday at `after_close` New York time strictly after `now`.
+
+        Args:
+            now (datetime.datetime): Timezone-aware current time.
+            after_close (str): "HH:MM" in New York time.
+    """
+    hour, minute = (int(part) for part in after_close.split(":"))
+    local = pd.Timestamp(now).tz_convert(EXCHANGE_TZ)
+    candidate = local.normalize() + pd.Timedelta(hours=hour, minutes=minute)
+    while candidate <= local or candidate.dayofweek >= 5:
+        candidate = (candidate + pd.Timedelta(days=1)).normalize() + pd.Timedelta(hours=hour, minutes=minute)
+    return candidate.to_pydatetime()
+
+
+class Prewarmer:
+    """
+        Background job that keeps the caches warm for a watchlist.
+    """
+
+    def __init__(self, watchlist, data_dir: str = "data", interval_seconds: float = None,
+                 after_close: str = "16:15", parameters=DEFAULT_PARAMETERS, provider=None,
+                 max_workers: int = 4, bar_store=None):
+        """
+            Args:
+                watchlist (list of str): Tickers to keep warm.
+                data_dir (str): Directory of the price partitions. Default is "data".
+                interval_seconds (float, optional): Refresh period. By default the job runs once
+                    per weekday after the close.
+                after_close (str): New York time ("HH:MM") of the daily refresh.
+                parameters (tuple of (days, lag_days)): Backtests to pre-compute.
+                provider (optional): Upstream data provider. Defaults to the process-wide provider.
+                max_workers (int): Concurrency of the downloads and article fetches.
+                bar_store (BarStore, optional): Also store the full OHLCV bars of the watchlist.
+        """
+        self.watchlist = [ticker.strip().upper() for ticker in watchlist if ticker.strip()]
+        self.data_dir = data_dir
+        self.interval_seconds = interval_seconds
+        self.after_close = after_close
+        self.parameters = tuple(parameters)
+        self.provider = provider
+        self.max_workers = max_workers
+        self.bar_store = bar_store
+        self.last_run = None
+        self.last_result = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def warm_ticker(self, ticker: str):
+        """
+            Loads a freshly ingested ticker into the price, news and forecast caches. The entries
+            live until the next scheduled run (plus EXPIRY_GRACE_SECONDS) instead of the caches'
+            usual time-to-live, so an after-close refresh is still warm at the next open.
+        """
+        ttl = self.seconds_until_next_run() + EXPIRY_GRACE_SECONDS
+        graph = PredictedGraph(filename=partition_path(ticker, self.data_dir))
+        graph.read_csv()
+        if self.bar_store is not None:
+            graph.bars = self.bar_store.load(ticker)
+        price_cache.set((ticker, "1d"), list(graph.data), ttl=ttl)
+
+        news = get_yahoo_finance_news(ticker, provider=self.provider)
+        if news:
+            news_cache.set(ticker, news, ttl=ttl)
+            urls = [article["url"] for article in news]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                titles = list(pool.map(get_article_title, urls))
+            for url, title in zip(urls, titles):
+                if title:
+                    article_title_cache.set(url, title, ttl=ttl)
+
+        for days, lag_days in self.parameters:
+            default_forecast(graph, ticker, days, lag_days)
+
+    def run_once(self) -> dict:
+        """
+            Refreshes every ticker of the watchlist once.
+
+            Returns:
+                dict: {"saved": {...}, "failed": {ticker: reason}} from the ingestion, with
+                warming failures added to "failed".
+        """
+        with timer("prewarm"):
+            result = fetch_and_save_many(self.watchlist, directory=self.data_dir,
+                                         max_workers=self.max_workers, provider=self.provider,
+                                         bar_store=self.bar_store)
+            for ticker in result["saved"]:
+                try:
+                    self.warm_ticker(ticker)
+                except Exception as e:
+                    result["failed"][ticker] = f"warming failed: {e}"
+        self.last_run = datetime.datetime.now(datetime.timezone.utc)
+        self.last_result = result
+        warmed = [ticker for ticker in result["saved"] if ticker not in result["failed"]]
+        print(f"Pre-warmed {len(warmed)} of {len(self.watchlist)} tickers")
+        return result
+
+    def seconds_until_next_run(self) -> float:
+        """
+            Seconds to wait before the next scheduled refresh.
+        """
+        if self.interval_seconds:
+            return self.interval_seconds
+        now = datetime.datetime.fromtimestamp(time.time(), datetime.timezone.utc)
+        return (next_run_after(now, self.after_close) - now).total_seconds()
+
+    def _loop(self, warm_now: bool):
+        if warm_now:
+            self._run_safely()
+        while not self._stop.wait(self.seconds_until_next_run()):
+            self._run_safely()
+
+    def _run_safely(self):
+        try:
+            self.run_once()
+        except Exception as e:
+            print(f"Pre-warm failed: {e}")
+
+    def start(self, warm_now: bool = True):
+        """
+            Starts the background thread.
+
+            Args:
+                warm_now (bool): Also refresh immediately instead of waiting for the first slot.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(warm_now,), name="prewarmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+            Stops the background thread after the current refresh finishes.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def prewarmer_from_env():
+    """
+        Builds a Prewarmer from the STOCKORACLE_WATCHLIST environment variables.
+
+        Returns:
+            Prewarmer or None: None when no watchlist is configured.
+    """
+    watchlist = os.environ.get("STOCKORACLE_WATCHLIST", "")
+    if not watchlist.strip():
+        return None
+    interval = os.environ.get("STOCKORACLE_PREWARM_INTERVAL")
+    return Prewarmer(
+        watchlist.replace(" ", ",").split(","),
+        interval_seconds=float(interval) if interval else None,
+        after_close=os.environ.get("STOCKORACLE_PREWARM_AFTER_CLOSE", "16:15"),
+        bar_store=BarStore("bars"),
+    )
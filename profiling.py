@@ -0,0 +1,194 @@
+# Stock Oracle Group
+# 10/19/2026
+# Opt-in profiling of the fetch, fit and backtest hot paths
+
+"""
+Profiling is off unless STOCKORACLE_PROFILE=1 is set in the environment, or a single request
+asks for it with the `X-StockOracle-Profile: 1` header. While a profiled request runs:
+
+- cProfile records the full call graph,
+- a sampling thread collects the request thread's stacks in collapsed ("folded") form,
+  which flamegraph.pl and speedscope read directly,
+- `span(name)` blocks accumulate wall time per stage.
+
+When the request finishes, `<name>-<timestamp>.prof` and `.folded` files are written to
+STOCKORACLE_PROFILE_DIR (default "profiles") and a one-line timing breakdown is printed.
+When nobody is profiling, `span` returns a shared no-op context manager.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+ENV_SWITCH = "STOCKORACLE_PROFILE"
+HEADER_SWITCH = "X-StockOracle-Profile"
+PROFILE_DIR = os.environ.get("STOCKORACLE_PROFILE_DIR", "profiles")
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+
+_NULL_SPAN = nullcontext()
+_sessions = {}  # thread id -> active ProfileSession
+
+
+def _truthy(value) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def enabled_by_env() -> bool:
+    """
+        Returns True if profiling is switched on for every request through the environment.
+    """
+    return _truthy(os.environ.get(ENV_SWITCH, ""))
+
+
+def enabled_by_request() -> bool:
+    """
+        Returns True if the current Flask request carries the per-request profiling header.
+    """
+    try:
+        from flask import has_request_context, request
+    except ImportError:
+        return False
+    return has_request_context() and _truthy(request.headers.get(HEADER_SWITCH, ""))
+
+
+class ProfileSession:
+    """
+        Collects cProfile stats, stack samples and span timings for one request on one thread.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.thread_id = threading.get_ident()
+        self.spans = defaultdict(lambda: [0.0, 0])  # name -> [seconds, calls]
+        self.stacks = Counter()
+        self.profiler = cProfile.Profile()
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        # Walk the profiled thread's frames and count the root-first stack
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._start = time.perf_counter()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this process; keep sampling and spans only
+            self.profiler = None
+        self._sampler.start()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self._stop.set()
+        self._sampler.join()
+        self.elapsed = time.perf_counter() - self._start
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.spans[name]
+            entry[0] += time.perf_counter() - start
+            entry[1] += 1
+
+    def write(self, directory: str = None):
+        """
+            Writes the cProfile stats and folded stacks, and returns the base path used.
+        """
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+        base = os.path.join(directory, f"{self.name}-{stamp}")
+        if self.profiler is not None:
+            self.profiler.dump_stats(base + ".prof")
+        with open(base + ".folded", "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return base
+
+    def summary(self) -> str:
+        """
+            Returns a compact one-line timing breakdown, slowest span first.
+        """
+        parts = [f"{self.name} {self.elapsed:.3f}s"]
+        for name, (seconds, calls) in sorted(self.spans.items(), key=lambda kv: -kv[1][0]):
+            share = 100 * seconds / self.elapsed if self.elapsed else 0.0
+            parts.append(f"{name} {seconds:.3f}s ({share:.0f}%) x{calls}")
+        return " | ".join(parts)
+
+
+def span(name: str):
+    """
+        Times a stage of the current profiled request. Returns a shared no-op context manager
+        when the current thread is not being profiled.
+
+        Args:
+            name (str): Stage name shown in the timing breakdown (e.g. 'fetch.prices').
+    """
+    if not _sessions:
+        return _NULL_SPAN
+    session = _sessions.get(threading.get_ident())
+    return session.span(name) if session is not None else _NULL_SPAN
+
+
+@contextmanager
+def profile_request(name: str, enabled: bool = None):
+    """
+        Profiles the body if enabled, then writes the artifacts and prints the breakdown.
+
+        Args:
+            name (str): Name used for the artifact files and the log line.
+            enabled (bool, optional): Force profiling on or off. By default the environment
+                variable and the request header decide.
+
+        Yields:
+            ProfileSession or None: The active session, or None when profiling is off.
+    """
+    if enabled is None:
+        enabled = enabled_by_env() or enabled_by_request()
+    thread_id = threading.get_ident()
+    if not enabled or thread_id in _sessions:
+        yield None
+        return
+
+    session = ProfileSession(name)
+    _sessions[thread_id] = session
+    session.start()
+    try:
+        yield session
+    finally:
+        session.stop()
+        del _sessions[thread_id]
+        base = session.write()
+        print(f"[profile] {session.summary()} -> {base}.prof, {base}.folded")
+
+
+def profiled(name: str):
+    """
+        Decorator form of `profile_request`.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_request(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,635 @@
+# Stock Oracle Group
+# 10/19/2026
+# Upstream data providers used by the ingestion pipeline
+
+"""
+A provider is any object implementing two methods:
+
+- `download_prices(tickers, period, interval, start=None, end=None)` returns a dict mapping each
+  ticker to a DataFrame indexed by date (intraday: timestamp) with Open/High/Low/Close/Volume
+  columns. When `start`/`end` are given they replace `period` and select the half-open window
+  [start, end). Tickers the provider could not serve are simply missing from the dict (or map
+  to an empty frame).
+- `search_news(symbol)` returns the raw news items of the Yahoo search API (dicts with "title",
+  "link" and "providerPublishTime"), newest first.
+
+Three implementations are available:
+
+- `YahooProvider` talks to the live Yahoo endpoints.
+- `ReplayProvider` serves payloads recorded on disk (see `RecordingProvider`).
+- `SyntheticProvider` generates price series and headline streams for any number of tickers
+  and rows, so the predictors and the dashboard can be exercised without upstream access.
+
+The process-wide default is chosen by the STOCKORACLE_PROVIDER environment variable
+("yahoo", "synthetic", "synthetic:<rows>" or "replay:<directory>") and can be replaced
+with `set_provider`.
+
+Live mode reads bars from a bar feed: any object with a `poll_seconds` attribute and a
+`next_bars(last)` method that takes {ticker: (date, value)} of the newest known bar per ticker
+and returns the newer bars as (ticker, date, value) tuples, oldest first.
+
+- `PollingBarFeed` asks a provider for today's intraday bars every `poll_seconds`.
+- `SimulatedBarFeed` continues each series with random geometric Brownian motion steps.
+
+STOCKORACLE_FEED ("poll", "poll:<seconds>", "simulated" or "simulated:<seconds>") selects the feed.
+"""
+
+import datetime
+import json
+import os
+import zlib
+import numpy as np
+import pandas as pd
+import requests
+import yfinance as yf
+
+# Trading days in the history periods understood by yfinance
+_PERIOD_UNITS = {"d": 1, "wk": 5, "mo": 21, "y": 252}
+
+# Minutes per bar of the intraday intervals understood by yfinance
+INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+# Longest history Yahoo serves per request for each intraday interval, in calendar days
+MAX_WINDOW_DAYS = {"1m": 7, "2m": 60, "5m": 60, "15m": 60, "30m": 60, "60m": 730, "90m": 60, "1h": 730}
+
+# Default history length per interval when no period is requested
+DEFAULT_PERIODS = {"1m": "7d", "2m": "60d", "5m": "60d", "15m": "60d", "30m": "60d",
+                   "60m": "730d", "90m": "60d", "1h": "730d", "1d": "1y"}
+
+EXCHANGE_TZ = "America/New_York"
+
+# Regular session of the exchange, New York time
+SESSION_OPEN = "09:30"
+SESSION_CLOSE = "16:00"
+
+
+class ProviderError(Exception):
+    """
+        Raised when a provider cannot serve a request at all.
+    """
+
+
+def period_to_rows(period: str) -> int:
+    """
+        Converts a yfinance period string ("5d", "1mo", "1y", ...) to a number of trading days.
+
+        Args:
+            period (str): The period string.
+
+        Returns:
+            int: Approximate number of daily bars in that period.
+    """
+    period = period.strip().lower()
+    if period == "max":
+        return 252 * 20
+    if period == "ytd":
+        return max(1, int(pd.Timestamp.today().dayofyear * 252 / 365))
+    for unit in sorted(_PERIOD_UNITS, key=len, reverse=True):
+        if period.endswith(unit) and period[:-len(unit)].isdigit():
+            return int(period[:-len(unit)]) * _PERIOD_UNITS[unit]
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def is_intraday(interval: str) -> bool:
+    """
+        Returns True for bar sizes below one day (e.g. "1m", "1h").
+    """
+    return interval in INTRADAY_MINUTES
+
+
+def last_session_time(now: float, at: str) -> float:
+    """
+        Most recent weekday time `at` (New York) at or before `now`, e.g. the last session open or close.
+
+        Args:
+            now (float): time.time() timestamp.
+            at (str): "HH:MM" time of day, such as SESSION_OPEN or SESSION_CLOSE.
+
+        Returns:
+            float: time.time() timestamp of that moment.
+    """
+    hour, minute = (int(part) for part in at.split(":"))
+    local = pd.Timestamp(now, unit="s", tz="UTC").tz_convert(EXCHANGE_TZ)
+    moment = local.normalize() + pd.Timedelta(hours=hour, minutes=minute)
+    while moment > local or moment.dayofweek >= 5:
+        moment = (moment - pd.Timedelta(days=1)).normalize() + pd.Timedelta(hours=hour, minutes=minute)
+    return moment.timestamp()
+
+
+def period_to_timedelta(period: str) -> pd.Timedelta:
+    """
+        Converts a yfinance period string to a calendar duration ("7d" -> 7 days, "1y" -> 365 days).
+    """
+    period = period.strip().lower()
+    calendar_days = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+    for unit in sorted(calendar_days, key=len, reverse=True):
+        if period.endswith(unit) and period[:-len(unit)].isdigit():
+            return pd.Timedelta(days=int(period[:-len(unit)]) * calendar_days[unit])
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def _select_window(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    """
+        Keeps the rows of a date-indexed frame inside [start, end), comparing in the index's timezone.
+    """
+    index = df.index
+    if start is not None:
+        start = pd.Timestamp(start)
+        if index.tz is not None and start.tz is None:
+            start = start.tz_localize(index.tz)
+        df = df[df.index >= start]
+    if end is not None:
+        end = pd.Timestamp(end)
+        if index.tz is not None and end.tz is None:
+            end = end.tz_localize(index.tz)
+        df = df[df.index < end]
+    return df
+
+
+class YahooProvider:
+    """
+        Provider backed by the Yahoo Finance download API (through yfinance) and search API.
+    """
+
+    name = "yahoo"
+    search_url = "https://query1.finance.yahoo.com/v1/finance/search?q={symbol}"
+
+    def download_prices(self, tickers: list, period: str = "1y", interval: str = "1d",
+                        start=None, end=None) -> dict:
+        """
+            Downloads price history for a group of tickers in one request.
+
+            Args:
+                tickers (list of str): Ticker symbols to request together.
+                period (str): History length understood by yfinance (e.g. "1y").
+                interval (str): Bar size understood by yfinance (e.g. "1d", "5m").
+                start, end (optional): Window [start, end) to download instead of `period`.
+
+            Returns:
+                dict: Ticker -> DataFrame of OHLCV columns indexed by date.
+        """
+        window = {"start": start, "end": end} if start is not None or end is not None else {"period": period}
+        df = yf.download(
+            list(tickers), interval=interval,
+            group_by="ticker", progress=False, threads=True, **window,
+        )
+        if df is None or df.empty:
+            return {}
+
+        frames = {}
+        if isinstance(df.columns, pd.MultiIndex):
+            # yfinance upper-cases symbols; key the frames by the requested spelling
+            available = {str(symbol).upper(): symbol for symbol in df.columns.get_level_values(0)}
+            for ticker in tickers:
+                symbol = available.get(ticker.upper())
+                if symbol is not None:
+                    frames[ticker] = df[symbol].dropna(how="all")
+        else:
+            frames[tickers[0]] = df.dropna(how="all")
+        return frames
+
+    def search_news(self, symbol: str) -> list:
+        """
+            Queries the Yahoo Finance search API for news about a symbol.
+
+            Returns:
+                list of dict: The raw news items of the search payload.
+        """
+        headers = {"User-Agent": "Mozilla/5.0"}
+        response = requests.get(self.search_url.format(symbol=symbol), headers=headers, timeout=10)
+        response.raise_for_status()
+        return response.json().get("news", [])
+
+
+class ReplayProvider:
+    """
+        Provider that serves payloads previously recorded to disk.
+
+        Layout of the recording directory:
+            prices/<TICKER>.csv   Daily bars: Date index plus OHLCV columns (as written by `RecordingProvider`)
+            prices/<TICKER>.<interval>.csv   Intraday bars of that interval
+            news/<TICKER>.json    Raw Yahoo search payload ({"news": [...]})
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: str):
+        """
+            Args:
+                directory (str): Root of the recording.
+        """
+        self.directory = directory
+
+    def download_prices(self, tickers: list, period: str = "1y", interval: str = "1d",
+                        start=None, end=None) -> dict:
+        """
+            Loads the recorded price frames for the interval, keeping the [start, end) window
+            or otherwise the last `period` worth of rows.
+        """
+        frames = {}
+        for ticker in tickers:
+            path = _recording_path(self.directory, ticker, interval)
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, index_col=0)
+            df.index = pd.to_datetime(df.index, utc=is_intraday(interval))
+            if is_intraday(interval):
+                df.index = df.index.tz_convert(EXCHANGE_TZ)
+            df.index.name = "Date"
+            if start is not None or end is not None:
+                df = _select_window(df, start, end)
+            elif is_intraday(interval):
+                df = df[df.index >= df.index[-1] - period_to_timedelta(period)] if len(df) else df
+            else:
+                df = df.tail(period_to_rows(period))
+            frames[ticker] = df
+        return frames
+
+    def search_news(self, symbol: str) -> list:
+        """
+            Loads the recorded search payload for a symbol. Unrecorded symbols have no news.
+        """
+        path = os.path.join(self.directory, "news", f"{symbol.upper()}.json")
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as f:
+            return json.load(f).get("news", [])
+
+
+def _recording_path(directory: str, ticker: str, interval: str) -> str:
+    suffix = "" if interval == "1d" else f".{interval}"
+    return os.path.join(directory, "prices", f"{ticker.upper()}{suffix}.csv")
+
+
+class RecordingProvider:
+    """
+        Wraps another provider and writes every payload it returns in the `ReplayProvider` layout.
+    """
+
+    def __init__(self, inner, directory: str):
+        """
+            Args:
+                inner: The provider to record (usually a `YahooProvider`).
+                directory (str): Root of the recording.
+        """
+        self.inner = inner
+        self.directory = directory
+        self.name = f"recording:{getattr(inner, 'name', 'provider')}"
+
+    def download_prices(self, tickers: list, period: str = "1y", interval: str = "1d",
+                        start=None, end=None) -> dict:
+        frames = self.inner.download_prices(tickers, period=period, interval=interval, start=start, end=end)
+        os.makedirs(os.path.join(self.directory, "prices"), exist_ok=True)
+        for ticker, df in frames.items():
+            path = _recording_path(self.directory, ticker, interval)
+            # Windowed downloads are merged into what was recorded before
+            if (start is not None or end is not None) and os.path.exists(path) and not df.empty:
+                previous = ReplayProvider(self.directory).download_prices(
+                    [ticker], interval=interval, start=None, end=df.index[0])[ticker]
+                df = pd.concat([previous, df])
+            df.to_csv(path)
+        return frames
+
+    def search_news(self, symbol: str) -> list:
+        items = self.inner.search_news(symbol)
+        os.makedirs(os.path.join(self.directory, "news"), exist_ok=True)
+        with open(os.path.join(self.directory, "news", f"{symbol.upper()}.json"), "w") as f:
+            json.dump({"news": items}, f)
+        return items
+
+
+class SyntheticProvider:
+    """
+        Deterministic generator of realistic-looking markets for scale testing.
+
+        Prices follow a geometric Brownian motion whose drift and volatility switch between
+        market regimes (a Markov chain), or a plain random walk. Headlines are drawn per day with
+        a tone that leans on that day's return, so sentiment carries some signal.
+        Every ticker gets its own stream derived from the provider seed and the symbol, so the
+        same (seed, ticker, rows, end) always yields the same data.
+    """
+
+    name = "synthetic"
+
+    # (daily drift, daily volatility) of each regime
+    REGIMES = {
+        "bull": (0.0008, 0.010),
+        "bear": (-0.0010, 0.022),
+        "calm": (0.0002, 0.006),
+    }
+
+    _POSITIVE = ["beats estimates", "surges on strong demand", "wins major contract",
+                 "raises guidance", "gets analyst upgrade"]
+    _NEGATIVE = ["misses estimates", "falls amid weak outlook", "faces regulatory probe",
+                 "cuts guidance", "gets analyst downgrade"]
+    _NEUTRAL = ["schedules earnings call", "announces board meeting", "files quarterly report",
+                "holds investor day", "updates product lineup"]
+
+    def __init__(self, rows: int = None, seed: int = 0, model: str = "gbm", switch_prob: float = 0.02,
+                 headlines_per_day: int = 2, end: str = None, start_price: float = 100.0):
+        """
+            Args:
+                rows (int, optional): Bars per ticker. By default derived from the requested period.
+                seed (int): Base seed of the generator.
+                model (str): "gbm" (regime-switching geometric Brownian motion) or "random_walk".
+                switch_prob (float): Daily probability of leaving the current regime.
+                headlines_per_day (int): Headlines generated for every trading day.
+                end (str, optional): Last date of the series (YYYY-MM-DD). Defaults to today.
+                start_price (float): Price of the first bar.
+        """
+        if model not in ("gbm", "random_walk"):
+            raise ValueError(f"Unknown model: {model}")
+        self.rows = rows
+        self.seed = seed
+        self.model = model
+        self.switch_prob = switch_prob
+        self.headlines_per_day = headlines_per_day
+        self.end = end
+        self.start_price = start_price
+        self._cache = {}
+
+    def _rng(self, ticker: str, stream: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(f"{ticker.upper()}:{stream}".encode())])
+
+    def _end(self) -> pd.Timestamp:
+        end = pd.Timestamp(self.end) if self.end else pd.Timestamp.today().normalize()
+        return end if end.dayofweek < 5 else end - pd.offsets.BDay(1)
+
+    # Every request is a tail of one history of at least this many days, so all periods agree
+    HISTORY_DAYS = 252 * 10
+
+    def generate_prices(self, ticker: str, rows: int) -> pd.DataFrame:
+        """
+            Generates `rows` business days of OHLCV bars for a ticker, ending at the configured end date.
+
+            Returns:
+                pd.DataFrame: OHLCV columns indexed by a DatetimeIndex named "Date".
+        """
+        return self._history(ticker, max(rows, self.HISTORY_DAYS)).tail(rows)
+
+    def _history(self, ticker: str, rows: int) -> pd.DataFrame:
+        key = (ticker.upper(), rows)
+        if key in self._cache:
+            return self._cache[key]
+
+        rng = self._rng(ticker, "prices")
+        names = list(self.REGIMES)
+        drift = np.array([self.REGIMES[n][0] for n in names])
+        vol = np.array([self.REGIMES[n][1] for n in names])
+
+        # Regime path: stay with probability 1 - switch_prob, otherwise jump to a random regime
+        switches = rng.random(rows) < self.switch_prob
+        jumps = rng.integers(0, len(names), rows)
+        regime = np.empty(rows, dtype=np.int64)
+        current = int(rng.integers(0, len(names)))
+        for i in range(rows):
+            if switches[i]:
+                current = int(jumps[i])
+            regime[i] = current
+
+        shocks = rng.standard_normal(rows)
+        if self.model == "gbm":
+            log_returns = drift[regime] - 0.5 * vol[regime] ** 2 + vol[regime] * shocks
+            close = self.start_price * np.exp(np.cumsum(log_returns))
+        else:
+            steps = self.start_price * vol[regime] * shocks
+            close = np.maximum(self.start_price + np.cumsum(steps), 0.01)
+
+        previous = np.concatenate([[self.start_price], close[:-1]])
+        open_ = previous * (1 + 0.25 * vol[regime] * rng.standard_normal(rows))
+        spread = np.abs(rng.standard_normal(rows)) * vol[regime] * 0.5
+        high = np.maximum(open_, close) * (1 + spread)
+        low = np.minimum(open_, close) * (1 - spread)
+        volume = (1e6 * np.exp(rng.normal(0, 0.3, rows)) * (vol[regime] / vol.min())).astype(np.int64)
+
+        index = pd.bdate_range(end=self._end(), periods=rows, name="Date")
+        df = pd.DataFrame(
+            {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+            index=index,
+        )
+        self._cache[key] = df
+        return df
+
+    def generate_intraday(self, ticker: str, interval: str, start, end) -> pd.DataFrame:
+        """
+            Generates intraday bars for the regular session (9:30-16:00 New York time) of every
+            business day in [start, end).
+
+            Each day's path is a Brownian bridge from that day's daily open to its daily close, seeded
+            by (ticker, day, interval), so any window can be generated on its own and adjacent
+            windows line up exactly.
+
+            Returns:
+                pd.DataFrame: OHLCV columns indexed by tz-aware bar start times.
+        """
+        minutes = INTRADAY_MINUTES[interval]
+        per_day = max(1, 390 // minutes)
+        daily = self.generate_prices(ticker, max(self.rows or 0, self.HISTORY_DAYS))
+        start = pd.Timestamp(start) if start is not None else daily.index[0]
+        end = pd.Timestamp(end) if end is not None else daily.index[-1] + pd.Timedelta(days=1)
+        start_day = start.tz_convert(EXCHANGE_TZ).tz_localize(None) if start.tz else start
+        end_day = end.tz_convert(EXCHANGE_TZ).tz_localize(None) if end.tz else end
+        days = daily.loc[start_day.normalize():end_day]
+
+        offsets = pd.to_timedelta(570 + minutes * np.arange(per_day), unit="min")  # 9:30 + k bars
+        t = np.arange(1, per_day + 1) / per_day
+        frames = []
+        for day, row in days.iterrows():
+            rng = self._rng(ticker, f"{interval}:{day:%Y%m%d}")
+            day_vol = abs(np.log(row["High"] / row["Low"])) / 2 + 1e-4
+            walk = np.cumsum(rng.standard_normal(per_day)) * day_vol / np.sqrt(per_day)
+            target = np.log(row["Close"] / row["Open"])
+            path = row["Open"] * np.exp(walk - t * (walk[-1] - target))
+            opens = np.concatenate([[row["Open"]], path[:-1]])
+            wiggle = np.abs(rng.standard_normal(per_day)) * day_vol / np.sqrt(per_day) * 0.5
+            u_shape = 1.5 - np.sin(np.pi * t)  # heavier volume at the open and close
+            volume = (row["Volume"] * u_shape / u_shape.sum()).astype(np.int64)
+            index = pd.DatetimeIndex(day + offsets).tz_localize(EXCHANGE_TZ)
+            frames.append(pd.DataFrame({
+                "Open": opens, "High": np.maximum(opens, path) * (1 + wiggle),
+                "Low": np.minimum(opens, path) * (1 - wiggle), "Close": path, "Volume": volume,
+            }, index=index))
+
+        if not frames:
+            return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"],
+                                index=pd.DatetimeIndex([], tz=EXCHANGE_TZ, name="Date"))
+        df = _select_window(pd.concat(frames), start, end)
+        df.index.name = "Date"
+        return df
+
+    def download_prices(self, tickers: list, period: str = "1y", interval: str = "1d",
+                        start=None, end=None) -> dict:
+        """
+            Generates a price frame per ticker, daily or intraday.
+        """
+        if is_intraday(interval):
+            if start is None and end is None:
+                end = self._end() + pd.Timedelta(days=1)
+                start = end - period_to_timedelta(period)
+            return {ticker: self.generate_intraday(ticker, interval, start, end) for ticker in tickers}
+        if interval != "1d":
+            raise ProviderError(f"SyntheticProvider does not support interval {interval}")
+        if start is not None or end is not None:
+            rows = max(self.rows or 0, self.HISTORY_DAYS)
+            return {ticker: _select_window(self.generate_prices(ticker, rows), start, end) for ticker in tickers}
+        rows = self.rows or period_to_rows(period)
+        return {ticker: self.generate_prices(ticker, rows) for ticker in tickers}
+
+    def search_news(self, symbol: str) -> list:
+        """
+            Generates a headline stream over the ticker's whole history, newest first, in the
+            layout of the Yahoo search payload.
+        """
+        prices = self.generate_prices(symbol, self.rows or period_to_rows("1y"))
+        returns = prices["Close"].pct_change().fillna(0.0).to_numpy()
+        scale = returns.std() or 1.0
+        rng = self._rng(symbol, "news")
+
+        # Tone probabilities lean towards the sign of the day's return
+        tilt = np.clip(returns / scale, -2, 2) / 4
+        items = []
+        for date, lean in zip(prices.index, tilt):
+            for k in range(self.headlines_per_day):
+                draw = rng.random()
+                if draw < 0.3 + lean:
+                    phrase = self._POSITIVE[rng.integers(len(self._POSITIVE))]
+                elif draw > 0.7 + lean:
+                    phrase = self._NEGATIVE[rng.integers(len(self._NEGATIVE))]
+                else:
+                    phrase = self._NEUTRAL[rng.integers(len(self._NEUTRAL))]
+                published = datetime.datetime.combine(date.date(), datetime.time(9 + 3 * k, 30))
+                slug = f"{symbol.lower()}-{date:%Y%m%d}-{k}"
+                items.append({
+                    "title": f"{symbol.upper()} {phrase}",
+                    "link": f"https://news.example.com/{slug}",
+                    "providerPublishTime": int(published.timestamp()),
+                })
+        items.reverse()
+        return items
+
+
+class PollingBarFeed:
+    """
+        Bar feed polling a provider's intraday bars, for live data from Yahoo. Live series are seeded
+        with history at the feed's `interval`, so every step of the series is one bar.
+    """
+
+    def __init__(self, provider=None, interval: str = "1m", poll_seconds: float = 60.0):
+        """
+            Args:
+                provider (optional): Upstream data provider. Defaults to the process-wide provider.
+                interval (str): Intraday bar size requested from the provider.
+                poll_seconds (float): Seconds between polls.
+        """
+        self.provider = provider
+        self.interval = interval
+        self.poll_seconds = poll_seconds
+
+    def next_bars(self, last: dict) -> list:
+        if not last:
+            return []
+        provider = self.provider or get_provider()
+        frames = provider.download_prices(list(last), period="1d", interval=self.interval)
+        bars = []
+        for ticker, (last_date, _) in last.items():
+            df = frames.get(ticker)
+            if df is None or df.empty:
+                continue
+            closes = df["Close"].dropna()
+            index = closes.index
+            if index.tz is not None:
+                index = index.tz_convert("UTC").tz_localize(None)
+            for date, value in zip(index.strftime("%Y-%m-%d %H:%M:%S"), closes.to_numpy(dtype=float)):
+                if date > last_date:
+                    bars.append((ticker, date, float(value)))
+        return bars
+
+
+class SimulatedBarFeed:
+    """
+        Local bar feed for testing live mode: every poll extends each ticker by one bar whose
+        log return is normally distributed. Deterministic for a given seed and call sequence.
+    """
+
+    def __init__(self, poll_seconds: float = 1.0, interval: str = "1m", volatility: float = 0.001,
+                 seed: int = 0):
+        """
+            Args:
+                poll_seconds (float): Seconds between bars.
+                interval (str): Intraday bar size; the time step between consecutive bars.
+                volatility (float): Standard deviation of the log return per bar.
+                seed (int): Seed of the generator.
+        """
+        self.poll_seconds = poll_seconds
+        self.interval = interval
+        self.bar_seconds = INTRADAY_MINUTES[interval] * 60
+        self.volatility = volatility
+        self._rng = np.random.default_rng(seed)
+
+    def next_bars(self, last: dict) -> list:
+        bars = []
+        for ticker in sorted(last):
+            date, value = last[ticker]
+            step = pd.Timestamp(date) + pd.Timedelta(seconds=self.bar_seconds)
+            value = float(value) * float(np.exp(self.volatility * self._rng.standard_normal()))
+            bars.append((ticker, step.strftime("%Y-%m-%d %H:%M:%S"), value))
+        return bars
+
+
+def feed_from_env():
+    """
+        Builds the bar feed named by the STOCKORACLE_FEED environment variable.
+
+        Returns:
+            The feed; a `PollingBarFeed` over the default provider when the variable is unset.
+    """
+    spec = os.environ.get("STOCKORACLE_FEED", "poll").strip()
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+    if kind == "poll":
+        return PollingBarFeed(poll_seconds=float(arg) if arg else 60.0)
+    if kind == "simulated":
+        return SimulatedBarFeed(poll_seconds=float(arg) if arg else 1.0)
+    raise ValueError(f"Unknown feed: {spec}")
+
+
+def provider_from_env():
+    """
+        Builds the provider named by the STOCKORACLE_PROVIDER environment variable.
+
+        Returns:
+            The provider; `YahooProvider` when the variable is unset.
+    """
+    spec = os.environ.get("STOCKORACLE_PROVIDER", "yahoo").strip()
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+    if kind == "yahoo":
+        return YahooProvider()
+    if kind == "synthetic":
+        return SyntheticProvider(rows=int(arg) if arg else None)
+    if kind == "replay":
+        if not arg:
+            raise ValueError("STOCKORACLE_PROVIDER=replay needs a directory, e.g. replay:recordings")
+        return ReplayProvider(arg)
+    raise ValueError(f"Unknown provider: {spec}")
+
+
+_provider = provider_from_env()
+
+
+def get_provider():
+    """
+        Returns the process-wide default provider.
+    """
+    return _provider
+
+
+def set_provider(provider):
+    """
+        Replaces the process-wide default provider (e.g. with an offline stand-in).
+
+        Args:
+            provider: Any object implementing the provider methods.
+    """
+    global _provider
+    _provider = provider
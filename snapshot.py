@@ -0,0 +1,295 @@
+# Stock Oracle Group
+# 10/19/2026
+# Warm-restart snapshots of the shared caches
+
+"""
+The shared caches of `cache.py` (price series, news and daily sentiment, article titles and the
+forecasts of every model) live in memory only. A snapshot writes them to disk so a restarted or
+redeployed process starts warm instead of re-downloading and refitting everything:
+
+    <root>/CURRENT               name of the live generation directory
+    <root>/<gen>/meta.json       format version, price series index and source versions
+    <root>/<gen>/dates.npy       dates of every cached price series, concatenated
+    <root>/<gen>/values.npy      values of every cached price series, concatenated (float64)
+    <root>/<gen>/entries.pkl     news, article title and forecast entries
+
+Restoring maps dates.npy and values.npy read-only, and the price cache holds `SeriesView`s over
+the mapping. A series is paged in only when a request uses it. Entries keep their store and
+expiry times. Every series is saved with its data version (`feature_store.digest`, the version
+forecasts are keyed by) and is dropped instead of restored when its source moved on:
+
+    - a series with a local partition (data/<TICKER>.csv, or data/<TICKER>.<interval>.csv) is
+      stale when the partition now holds different values (or was removed)
+    - a series fetched straight from upstream (e.g. by the dashboard) is stale when a session
+      closed since it was fetched, since newer bars exist upstream
+
+Forecasts are restored only for data versions of restored series. A snapshot of another format
+version is ignored.
+
+Snapshots are written to "<root>/<gen>.part", renamed to <gen> and published by replacing CURRENT,
+as the bar store does (`bar_store.publish_generation`). A crash at any point keeps the previous
+snapshot, and the generation restored series are mapped from is kept until the next snapshot, so
+files still mapped (which Windows cannot delete) never block a save. Enable snapshots for the
+dashboard with environment variables:
+    STOCKORACLE_SNAPSHOT_DIR=snapshot         directory of the snapshot ("" disables snapshots)
+    STOCKORACLE_SNAPSHOT_INTERVAL=300         seconds between periodic snapshots
+"""
+
+import collections.abc
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+import numpy as np
+from bar_store import current_generation, publish_generation
+from cache import article_title_cache, forecast_cache, news_cache, price_cache
+from feature_store import digest
+from fetch_stock_data import partition_path
+from graph import Graph
+from metrics import timer
+from providers import SESSION_CLOSE, last_session_time
+
+# Bumped whenever the layout or the cached values change shape; other formats are not restored
+FORMAT_VERSION = 4
+
+# Caches stored in entries.pkl, by section name
+PICKLED_CACHES = {"news": news_cache, "article_titles": article_title_cache, "forecasts": forecast_cache}
+
+
+class SeriesView(collections.abc.Sequence):
+    """
+        Read-only (date, value) list over a slice of the mapped snapshot arrays.
+    """
+
+    def __init__(self, dates, values):
+        """
+            Args:
+                dates (np.ndarray): Date strings of the series.
+                values (np.ndarray): Values aligned with `dates`.
+        """
+        self.dates = dates
+        self.values = values
+
+    def __len__(self):
+        return self.values.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [(str(date), float(value)) for date, value in zip(self.dates[index], self.values[index])]
+        return str(self.dates[index]), float(self.values[index])
+
+    def __iter__(self):
+        return ((str(date), float(value)) for date, value in zip(self.dates, self.values))
+
+
+def file_version(path: str):
+    """
+        [size, mtime_ns] of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _is_stale(entry: dict, data_dir: str, now: float) -> bool:
+    """
+        Whether a saved price series no longer matches its source (see the module docstring).
+    """
+    ticker, interval = entry["key"]
+    path = partition_path(ticker, data_dir, interval)
+    current = file_version(path)
+    if entry["source"] is None and current is None:
+        return last_session_time(now, SESSION_CLOSE) > entry["stored_at"]
+    if current is None:
+        return True
+    if current == entry["source"]:
+        return False
+    # The partition was rewritten; compare its values
+    graph = Graph(filename=path)
+    graph.read_csv()
+    return digest(np.array([value for _, value in graph.data], dtype=np.float64)) != entry["version"]
+
+
+def _columns(series):
+    if isinstance(series, SeriesView):
+        return np.asarray(series.dates), np.asarray(series.values, dtype=np.float64)
+    dates = [str(date) for date, _ in series]
+    return np.array(dates, dtype=str), np.fromiter((value for _, value in series), dtype=np.float64,
+                                                    count=len(dates))
+
+
+def save_snapshot(root: str = "snapshot", data_dir: str = "data") -> dict:
+    """
+        Writes the shared caches to a snapshot directory, replacing the previous snapshot.
+
+        Args:
+            root (str): Snapshot directory. Default is "snapshot".
+            data_dir (str): Directory of the price partitions the source versions refer to.
+
+        Returns:
+            dict: Number of entries written per cache.
+    """
+    with timer("snapshot", stage="save"):
+        generation = f"{time.time_ns()}-{os.getpid()}"
+        staging = os.path.join(root, generation + ".part")
+        os.makedirs(staging)
+
+        try:
+            index, dates, values = [], [], []
+            offset = 0
+            for key, stored_at, expires_at, series in price_cache.entries():
+                series_dates, series_values = _columns(series)
+                index.append({"key": list(key), "stored_at": stored_at, "expires_at": expires_at,
+                              "version": digest(series_values),
+                              "source": file_version(partition_path(key[0], data_dir, key[1])),
+                              "start": offset, "stop": offset + series_values.size})
+                dates.append(series_dates)
+                values.append(series_values)
+                offset += series_values.size
+            np.save(os.path.join(staging, "dates.npy"),
+                    np.concatenate(dates) if dates else np.array([], dtype=str))
+            np.save(os.path.join(staging, "values.npy"), np.concatenate(values) if values else np.array([]))
+
+            sections = {name: cache.entries() for name, cache in PICKLED_CACHES.items()}
+            with open(os.path.join(staging, "entries.pkl"), "wb") as f:
+                pickle.dump(sections, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            meta = {"format": FORMAT_VERSION, "created": time.time(), "prices": index}
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # A new generation instead of rewriting files: restored series keep reading the old mapping
+        os.replace(staging, os.path.join(root, generation))
+        publish_generation(root, generation)
+
+    counts = {"prices": len(index), **{name: len(entries) for name, entries in sections.items()}}
+    print(f"Saved snapshot to {root}: {counts}")
+    return counts
+
+
+def restore_snapshot(root: str = "snapshot", data_dir: str = "data") -> dict:
+    """
+        Loads a snapshot into the shared caches, skipping keys that are already cached, expired
+        entries, price series whose source moved on and forecasts of data versions not restored.
+
+        Args:
+            root (str): Snapshot directory. Default is "snapshot".
+            data_dir (str): Directory of the price partitions the source versions refer to.
+
+        Returns:
+            dict: Number of entries restored per cache, and the price series dropped as "stale"
+            ("TICKER" for daily series, "TICKER.<interval>" otherwise).
+    """
+    directory = current_generation(root)
+    if directory is None or not os.path.exists(os.path.join(directory, "meta.json")):
+        return {}
+    with open(os.path.join(directory, "meta.json"), "r") as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT_VERSION:
+        print(f"Ignoring snapshot {root}: format {meta.get('format')}, expected {FORMAT_VERSION}")
+        return {}
+
+    with timer("snapshot", stage="restore"):
+        now = time.time()
+        fresh, stale = [], []
+        for entry in meta["prices"]:
+            ticker, interval = entry["key"]
+            if _is_stale(entry, data_dir, now):
+                stale.append(ticker.upper() if interval == "1d" else f"{ticker.upper()}.{interval}")
+            else:
+                fresh.append(entry)
+
+        restored = {"prices": 0}
+        if fresh:
+            dates = np.load(os.path.join(directory, "dates.npy"), mmap_mode="r")
+            values = np.load(os.path.join(directory, "values.npy"), mmap_mode="r")
+            restored["prices"] = price_cache.load(
+                (tuple(entry["key"]), entry["stored_at"], entry["expires_at"],
+                 SeriesView(dates[entry["start"]:entry["stop"]], values[entry["start"]:entry["stop"]]))
+                for entry in fresh)
+
+        with open(os.path.join(directory, "entries.pkl"), "rb") as f:
+            sections = pickle.load(f)
+        versions = {entry["version"] for entry in fresh}
+        sections["forecasts"] = [entry for entry in sections["forecasts"] if entry[0][2] in versions]
+        for name, cache in PICKLED_CACHES.items():
+            restored[name] = cache.load(sections.get(name, ()))
+
+    restored["stale"] = sorted(stale)
+    print(f"Restored snapshot from {root}: {restored}")
+    return restored
+
+
+class Snapshotter:
+    """
+        Background job that snapshots the shared caches periodically and on shutdown.
+    """
+
+    def __init__(self, root: str = "snapshot", data_dir: str = "data", interval_seconds: float = 300):
+        """
+            Args:
+                root (str): Snapshot directory. Default is "snapshot".
+                data_dir (str): Directory of the price partitions. Default is "data".
+                interval_seconds (float): Seconds between periodic snapshots.
+        """
+        self.root = root
+        self.data_dir = data_dir
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def save(self) -> dict:
+        return save_snapshot(self.root, self.data_dir)
+
+    def restore(self) -> dict:
+        return restore_snapshot(self.root, self.data_dir)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._save_safely()
+
+    def _save_safely(self):
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Snapshot failed: {e}")
+
+    def start(self):
+        """
+            Starts the periodic snapshots.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="snapshotter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+            Stops the periodic snapshots and writes a final one.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._save_safely()
+
+
+def snapshotter_from_env():
+    """
+        Builds a Snapshotter from the STOCKORACLE_SNAPSHOT environment variables.
+
+        Returns:
+            Snapshotter or None: None when STOCKORACLE_SNAPSHOT_DIR is set to "".
+    """
+    root = os.environ.get("STOCKORACLE_SNAPSHOT_DIR", "snapshot")
+    if not root.strip():
+        return None
+    interval = os.environ.get("STOCKORACLE_SNAPSHOT_INTERVAL")
+    return Snapshotter(root, interval_seconds=float(interval) if interval else 300)
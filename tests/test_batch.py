@@ -0,0 +1,34 @@
+from batch import run_batch, completed_keys
+from fetch_stock_data import fetch_and_save_many
+from providers import SyntheticProvider
+import pyarrow.parquet as pq
+import subprocess, sys, os
+
+"""
+Covers the headless runner in `batch.py`: backtests for a ticker x parameter grid are read from local partitions and
+written to Parquet parts, a second run resumes by skipping stored combinations and retrying failed ones, a ticker without local data is reported
+as a failed row, and importing the runner never pulls in Dash.
+"""
+def test_batch_writes_parquet_and_resumes(tmp_path):
+    data_dir, output = str(tmp_path / "data"), str(tmp_path / "results")
+    fetch_and_save_many(["AAPL", "MSFT"], directory=data_dir, provider=SyntheticProvider(seed=1))
+
+    counts = run_batch(["AAPL", "MSFT", "NOPE"], [10, 30], [5], output=output, data_dir=data_dir, flush_every=4)
+    assert counts == {"computed": 6, "skipped": 0, "failed": 2}
+
+    table = pq.read_table(output).to_pandas()
+    assert len(table) == 6
+    ok = table[table["error"].isna()]
+    assert ok["confidence"].between(0, 1).all() and (ok["rows"] == 252).all()
+    assert table.loc[table["ticker"] == "NOPE", "error"].str.contains("no local data").all()
+
+    # Failed rows are retried on resume; successful ones are skipped
+    counts = run_batch(["AAPL", "MSFT", "NOPE"], [10, 30, 60], [5], output=output, data_dir=data_dir)
+    assert counts == {"computed": 5, "skipped": 4, "failed": 3}
+    assert len(completed_keys(output)) == 6
+
+
+def test_batch_does_not_import_dash():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, batch; sys.exit(any(m.split('.')[0] == 'dash' for m in sys.modules))"
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
@@ -0,0 +1,34 @@
+import json
+import os
+import benchmark
+from benchmark import BASELINE_FILE, compare, main, run, QUICK_GRID
+
+"""
+Covers the regression gate of `benchmark.py`: cases slower than the stored baseline beyond the tolerance are reported,
+noise below the absolute threshold and unknown cases are not, a filtered quick run produces timings offline, and
+`--quick` passes against the committed baseline but fails without one.
+"""
+def test_compare_flags_regressions():
+    baseline = {"a": 0.100, "b": 0.100, "tiny": 0.0001}
+    results = {"a": 0.110, "b": 0.200, "tiny": 0.0005, "new": 1.0}
+    assert compare(results, baseline, tolerance=0.25) == [("b", 0.100, 0.200)]
+
+
+def test_quick_run_produces_timings():
+    results = run(QUICK_GRID, repeat=1, name_filter="predict_tomorrow")
+    assert len(results) == 1
+    assert all(t > 0 for t in results.values())
+
+
+def test_quick_gate_against_committed_baseline(tmp_path):
+    committed = os.path.join(os.path.dirname(benchmark.__file__), BASELINE_FILE)
+    with open(committed) as f:
+        baseline = json.load(f)["results"]
+    output = str(tmp_path / "results.json")
+    quick = ["--quick", "--repeat", "1", "--filter", "read_csv", "--output", output]
+
+    # Generous tolerance: the gate must run end to end, not judge this machine's speed
+    assert main(quick + ["--baseline", committed, "--tolerance", "100"]) == 0
+    with open(output) as f:
+        assert set(json.load(f)["results"]) <= set(baseline)
+    assert main(quick + ["--baseline", str(tmp_path / "missing.json")]) == 2
@@ -0,0 +1,41 @@
+from fetch_stock_data import fetch_and_save_many, partition_path
+import pandas as pd
+
+"""
+Drives the bulk ingestion in `fetch_stock_data.py` with a local stand-in provider. Checks that tickers are requested in
+batches, that each ticker lands in its own CSV partition in the Graph format (per interval, so intraday bars leave the
+daily partition alone), and that a missing ticker and a failing batch are reported per ticker without aborting the rest.
+"""
+class StubProvider:
+    def __init__(self):
+        self.calls = []
+
+    def download_prices(self, tickers, period="1y", interval="1d"):
+        self.calls.append(list(tickers))
+        if "BOOM" in tickers:
+            raise RuntimeError("upstream down")
+        index = pd.date_range("2024-01-01", periods=3, freq="D", name="Date")
+        return {t: pd.DataFrame({"Close": [10.4, 11.6, 12.0]}, index=index) for t in tickers if t != "NONE"}
+
+
+def test_bulk_ingest_partitions_and_failures(tmp_path):
+    provider = StubProvider()
+    result = fetch_and_save_many(["aapl", "MSFT", "NONE", "BOOM"], directory=str(tmp_path),
+                                 batch_size=2, max_workers=2, provider=provider)
+
+    assert sorted(map(sorted, provider.calls)) == [["AAPL", "MSFT"], ["BOOM", "NONE"]]
+    assert result["saved"] == {"AAPL": 3, "MSFT": 3}
+    assert set(result["failed"]) == {"NONE", "BOOM"}
+
+    df = pd.read_csv(partition_path("AAPL", str(tmp_path)))
+    assert list(df.columns) == ["Date", "Value"]
+    assert df["Value"].tolist() == [10.4, 11.6, 12.0]
+
+
+def test_intraday_bulk_ingest_keeps_daily_partition(tmp_path):
+    fetch_and_save_many(["AAPL"], directory=str(tmp_path), provider=StubProvider())
+    fetch_and_save_many(["AAPL"], directory=str(tmp_path), interval="1h", provider=StubProvider())
+
+    assert pd.read_csv(partition_path("AAPL", str(tmp_path)))["Date"].tolist()[0] == "2024-01-01"
+    hourly = pd.read_csv(partition_path("AAPL", str(tmp_path), "1h"))
+    assert hourly["Date"].tolist()[0] == "2024-01-01 00:00:00"
@@ -0,0 +1,121 @@
+import export
+from bar_store import BarStore
+from cache import forecast_cache
+from export import register_export, SCHEMAS
+from fetch_stock_data import fetch_and_save_many, partition_path
+from predictor_default import PredictedGraph
+from prewarm import default_forecast
+from providers import SyntheticProvider
+from flask import Flask
+import io
+import numpy as np
+import pyarrow as pa
+
+"""
+Drives the `/export` route in `export.py` through a Flask test client over partitions written by the synthetic
+provider. CSV and Arrow IPC responses must be streamed (no content length), contain every requested ticker, and
+agree with each other; metrics rows are sent as each backtest finishes; predicted tails match the dashboard's forecasts
+without filling the forecast cache; ARX exports read the app's bar store; "*" skips live mode's intraday partitions;
+unknown tickers and parameters are rejected before streaming starts.
+"""
+def _client(tmp_path):
+    fetch_and_save_many(["AAA", "BBB"], directory=str(tmp_path), provider=SyntheticProvider(rows=80, seed=2))
+    server = Flask(__name__)
+    register_export(server, data_dir=str(tmp_path))
+    return server.test_client()
+
+
+def test_prices_csv_and_arrow_agree(tmp_path):
+    client = _client(tmp_path)
+    response = client.get("/export?tickers=aaa,BBB&kind=prices")
+    assert response.status_code == 200 and response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == "ticker,date,value" and len(lines) == 1 + 2 * 80
+
+    response = client.get("/export?tickers=*&kind=prices&format=arrow")
+    table = pa.ipc.open_stream(io.BytesIO(response.get_data())).read_all()
+    assert table.schema == SCHEMAS["prices"]
+    assert table.num_rows == 160
+    assert table.column("ticker").to_pylist()[:1] + table.column("ticker").to_pylist()[-1:] == ["AAA", "BBB"]
+    first = lines[1].split(",")
+    assert (first[1], float(first[2])) == (table.column("date")[0].as_py(), table.column("value")[0].as_py())
+
+
+def test_predicted_and_metrics(tmp_path):
+    client = _client(tmp_path)
+    response = client.get("/export?tickers=AAA&kind=predicted&days=10&lag_days=5&format=arrow")
+    table = pa.ipc.open_stream(io.BytesIO(response.get_data())).read_all()
+    assert table.num_rows == 10
+    assert all(lo <= hi for lo, hi in zip(table.column("lower").to_pylist(), table.column("upper").to_pylist()))
+
+    text = client.get("/export?tickers=*&kind=metrics&days=10&lag_days=5&model=ridge").get_data(as_text=True)
+    rows = text.splitlines()
+    assert len(rows) == 3 and rows[1].startswith("AAA,ridge,10,5,")
+
+
+def test_rejects_bad_requests(tmp_path):
+    client = _client(tmp_path)
+    assert client.get("/export?tickers=AAA,ZZZ").status_code == 404
+    assert client.get("/export?tickers=AAA&format=xml").status_code == 400
+    assert client.get("/export?tickers=AAA&days=abc").status_code == 400
+    for params in ("days=-1", "days=0", "lag_days=-3", "lag_days=0"):
+        assert client.get(f"/export?tickers=AAA&kind=predicted&{params}").status_code == 400
+    # 80 rows leave no backtest origin for 79 lags
+    response = client.get("/export?tickers=AAA,BBB&kind=predicted&lag_days=79")
+    assert response.status_code == 400 and b"AAA, BBB" in response.get_data()
+    assert client.get("/export?tickers=AAA&kind=metrics&lag_days=79").status_code == 400
+    assert client.get("/export?tickers=AAA&kind=predicted&lag_days=78&days=5").status_code == 200
+
+
+def test_metrics_stream_one_ticker_at_a_time(tmp_path, monkeypatch):
+    fetch_and_save_many(["AAA", "BBB"], directory=str(tmp_path), provider=SyntheticProvider(rows=80, seed=2))
+    finished = []
+    backtest = export.run_backtest
+    monkeypatch.setattr(export, "run_backtest",
+                        lambda ticker, *args, **kwargs: finished.append(ticker) or backtest(ticker, *args, **kwargs))
+
+    batches = export.iter_batches("metrics", ["AAA", "BBB"], str(tmp_path), days=10, lag_days=5)
+    assert next(batches)["ticker"] == ["AAA"] and finished == ["AAA"]
+    assert next(batches)["ticker"] == ["BBB"]
+
+
+def test_predicted_matches_dashboard_without_caching(tmp_path):
+    fetch_and_save_many(["AAA"], directory=str(tmp_path), provider=SyntheticProvider(rows=80, seed=2))
+    graph = PredictedGraph(filename=partition_path("AAA", str(tmp_path)))
+    graph.read_csv()
+    for model in ("default", "ridge"):
+        forecast_cache.clear()
+        batch, = export.iter_batches("predicted", ["AAA"], str(tmp_path), days=10, lag_days=5, model=model,
+                                     chunk_rows=100)
+        assert len(forecast_cache) == 0
+        expected = default_forecast(graph, "AAA", 10, 5, model=model)
+        assert batch["date"] == [date for date, _ in expected["predicted"][-10:]]
+        assert np.allclose(batch["predicted"], [value for _, value in expected["predicted"][-10:]])
+        assert np.allclose(batch["real"], [value for _, value in graph.data[-10:]])
+        if model == "default":
+            assert np.allclose(batch["lower"], [lower for _, _, lower, _ in expected["intervals"]])
+    forecast_cache.clear()
+
+
+def test_star_skips_intraday_partitions(tmp_path):
+    client = _client(tmp_path)
+    (tmp_path / "AAA.5m.csv").write_text("Date,Value\n2025-06-30 13:30:00,1.0\n")
+    assert export.available_tickers(str(tmp_path)) == ["AAA", "BBB"]
+    response = client.get("/export?tickers=*&kind=prices")
+    assert response.status_code == 200 and len(response.get_data(as_text=True).splitlines()) == 1 + 2 * 80
+
+
+def test_arx_reads_the_configured_bar_store(tmp_path, monkeypatch):
+    store = BarStore(str(tmp_path / "app_bars"))
+    fetch_and_save_many(["AAA"], directory=str(tmp_path), provider=SyntheticProvider(rows=80, seed=2), bar_store=store)
+    monkeypatch.setattr(export, "get_daily_sentiment", lambda ticker: {})
+    monkeypatch.setattr("batch.get_daily_sentiment", lambda ticker: {})
+    monkeypatch.chdir(tmp_path)  # no ./bars to fall back on
+    server = Flask(__name__)
+    register_export(server, data_dir=str(tmp_path), bar_store=store)
+    client = server.test_client()
+
+    lines = client.get("/export?tickers=AAA&kind=predicted&days=10&lag_days=5&model=arx").get_data(as_text=True)
+    assert len(lines.splitlines()) == 11
+    rows = client.get("/export?tickers=AAA&kind=metrics&days=10&lag_days=5&model=arx").get_data(as_text=True)
+    assert rows.splitlines()[1].startswith("AAA,arx,10,5,") and "ARX model needs" not in rows
@@ -0,0 +1,57 @@
+from feature_store import FeatureStore, FeatureSet
+from predictor_default import PredictedGraph
+import numpy as np, pandas as pd
+
+"""
+Covers the memory-mapped feature store in `feature_store.py`. Features must match pandas' rolling statistics, appending
+bars must only extend the stored files and give the same result as a rebuild, lag matrices must be views into the
+mapped values, and a `PredictedGraph` backed by the store must predict exactly like one computing features in memory.
+An interrupted append must not misalign the next one, and edits marked with `Graph.touch` must rebuild the features.
+"""
+def test_feature_store_incremental_and_zero_copy(tmp_path):
+    values = 100 + np.cumsum(np.random.default_rng(0).standard_normal(300))
+    store = FeatureStore(str(tmp_path), windows=(5, 20))
+
+    first = store.get("AAPL", values[:250])
+    assert isinstance(first.values, np.memmap)
+    appended = store.get("AAPL", values)                     # 50 new bars appended incrementally
+    rebuilt = FeatureSet.from_values(values, windows=(5, 20))
+
+    assert appended.version == rebuilt.version == store.version("AAPL")
+    for key in rebuilt.rolling:
+        assert np.allclose(appended.rolling[key], rebuilt.rolling[key], equal_nan=True)
+    assert np.allclose(appended.log_returns, rebuilt.log_returns, equal_nan=True)
+    expected = pd.Series(values).rolling(20)
+    assert np.allclose(appended.rolling_mean(20), expected.mean(), equal_nan=True)
+    assert np.allclose(appended.rolling_std(20), expected.std(), equal_nan=True)
+
+    X, y = appended.lag_matrix(10, rows=200)
+    assert X.shape == (190, 10) and np.shares_memory(X, appended.values) and np.shares_memory(y, appended.values)
+
+    data = [(d.strftime("%Y-%m-%d"), v) for d, v in zip(pd.bdate_range("2024-01-01", periods=300), values)]
+    stored = PredictedGraph(data=data, feature_store=store, ticker="AAPL")
+    in_memory = PredictedGraph(data=data)
+    assert stored.predict_tomorrow(10) == in_memory.predict_tomorrow(10)
+    assert stored.predict_days_ahead(15, 5).data == in_memory.predict_days_ahead(15, 5).data
+
+
+def test_append_after_interrupted_append(tmp_path):
+    values = 100 + np.cumsum(np.random.default_rng(1).standard_normal(120))
+    store = FeatureStore(str(tmp_path), windows=(5,))
+    store.get("AAPL", values[:100])
+
+    # A crash between appending the columns and rewriting meta.json leaves extra bytes behind
+    with open(tmp_path / "AAPL" / "values.f64", "ab") as f:
+        np.full(7, -1.0).tofile(f)
+    fresh = FeatureStore(str(tmp_path), windows=(5,)).get("AAPL", values)
+    assert np.array_equal(np.asarray(fresh.values), values)
+
+
+def test_graph_features_follow_in_place_edits():
+    dates = pd.bdate_range("2025-01-01", periods=60).strftime("%Y-%m-%d")
+    pg = PredictedGraph(data=[(date, float(i)) for i, date in enumerate(dates)])
+    assert pg.features().values[10] == 10.0
+
+    pg.data[10] = (dates[10], 99.0)
+    pg.touch()
+    assert pg.features().values[10] == 99.0
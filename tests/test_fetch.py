@@ -1,16 +1,20 @@
 # tests/test_fetch.py
 from fetch_stock_data import fetch_and_save_data
+from providers import ReplayProvider
 import os, pandas as pd
 
+RECORDING = os.path.join(os.path.dirname(__file__), "fixtures", "recording")
+
 """
-Verifies that 'fetch_and_save_data()' retrieves one year of price data from Yahoo Finance and writes a non-empty CSV with 
-the expected two columns ('Date','Value'). Ensures basic data-ingestion pipeline is working and that external I/O succeeds
-(API -> disk).
+Verifies that 'fetch_and_save_data()' retrieves one year of price data and writes a non-empty CSV with the expected two
+columns ('Date','Value'). The prices are replayed from `tests/fixtures/recording`, a recording of `SyntheticProvider`
+made with `RecordingProvider` in the Yahoo payload layout, so the ingestion pipeline (provider -> disk) is exercised
+without network access.
 """
 def test_fetch_creates_csv(tmp_path):
-    """yfinance fetch writes non‑empty CSV."""
+    """Replayed fetch writes non‑empty CSV."""
     file = tmp_path / "sample.csv"
-    fetch_and_save_data("AAPL", str(file))
+    fetch_and_save_data("AAPL", str(file), provider=ReplayProvider(RECORDING))
     assert file.exists()
     df = pd.read_csv(file)
     assert not df.empty
@@ -0,0 +1,50 @@
+from predictor_default import PredictedGraph, bootstrap_ar_intervals
+import numpy as np
+
+"""
+Covers the bootstrap prediction intervals in `predictor_default.py`. The batched solve must match refitting every
+replicate with `lstsq`, seeded runs must be reproducible, the interval must bracket the point forecast, and the backtest
+points must agree with `predict_days_ahead()`.
+"""
+def _walk(n=120, seed=0):
+    return 100 + np.cumsum(np.random.default_rng(seed).standard_normal(n))
+
+
+def test_batched_bootstrap_matches_refits():
+    series, lag, n_boot = _walk(), 3, 50
+    point, lower, upper = bootstrap_ar_intervals(series, lag, [len(series)], n_boot, 0.1, seed=7)
+
+    # Reference: one lstsq per replicate, using the same random draws
+    rng = np.random.default_rng(7)
+    rows = len(series) - lag
+    fit_draws, noise_draws = rng.random((rows, n_boot)), rng.random(n_boot)
+    X = np.lib.stride_tricks.sliding_window_view(series, lag)[:-1]
+    y = series[lag:]
+    coeffs = np.linalg.lstsq(X, y, rcond=None)[0]
+    resid = y - X @ coeffs
+    resid = (resid - resid.mean()) * np.sqrt(rows / (rows - lag))
+    window = series[-lag:]
+    forecasts = []
+    for b in range(n_boot):
+        y_star = X @ coeffs + resid[(fit_draws[:, b] * rows).astype(int)]
+        beta_star = np.linalg.lstsq(X, y_star, rcond=None)[0]
+        forecasts.append(window @ beta_star + resid[int(noise_draws[b] * rows)])
+
+    assert np.isclose(point[0], window @ coeffs)
+    assert np.allclose([lower[0], upper[0]], np.quantile(forecasts, [0.05, 0.95]))
+
+
+def test_backtest_intervals_are_seeded_and_consistent():
+    data = [(f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}", v) for i, v in enumerate(_walk())]
+    pg = PredictedGraph(data=data)
+
+    intervals = pg.predict_intervals_days_ahead(10, 4, n_boot=200, seed=1)
+    assert intervals == pg.predict_intervals_days_ahead(10, 4, n_boot=200, seed=1)
+    assert all(lo <= p <= hi for _, p, lo, hi in intervals)
+
+    backtest = pg.predict_days_ahead(10, 4).data[-10:]
+    assert [d for d, *_ in intervals] == [d for d, _ in backtest]
+    assert np.allclose([p for _, p, _, _ in intervals], [v for _, v in backtest])
+
+    point, lower, upper = pg.predict_interval(4, n_boot=200, seed=1)
+    assert np.isclose(point, pg.predict_tomorrow(4)) and lower < point < upper
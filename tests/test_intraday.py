@@ -0,0 +1,25 @@
+from fetch_stock_data import fetch_and_save_data
+from predictor_default import PredictedGraph
+from providers import SyntheticProvider
+import pandas as pd
+
+"""
+Covers intraday support end to end: `fetch_and_save_data()` streams 5-minute bars window by window into a CSV with full
+timestamps (no duplicates at window boundaries), and `PredictedGraph` loads and fits only the requested time range.
+"""
+def test_intraday_stream_and_range_load(tmp_path):
+    csv = tmp_path / "bars.csv"
+    provider = SyntheticProvider(seed=5, end="2025-06-30")
+    fetch_and_save_data("AAPL", str(csv), provider=provider, interval="5m", period="10d",
+                        window_days=3, chunk_rows=50, end="2025-07-01")
+
+    df = pd.read_csv(csv)
+    assert df["Date"].is_unique and df["Date"].is_monotonic_increasing
+    assert df["Date"].str.len().eq(19).all()                # YYYY-MM-DD HH:MM:SS
+    assert df["Date"].str.startswith("2025-06-27").sum() == 78   # one full session of 5m bars
+
+    pg = PredictedGraph(filename=str(csv), start="2025-06-26", end="2025-06-27")
+    pg.read_csv()
+    assert len(pg.data) == 2 * 78
+    assert pg.data[0][0].startswith("2025-06-26") and pg.data[-1][0].startswith("2025-06-27")
+    assert isinstance(pg.predict_tomorrow(6), float)
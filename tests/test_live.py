@@ -0,0 +1,109 @@
+from cache import price_cache
+from live import IncrementalAR, LiveHub, load_history, register_live
+from predictor_default import PredictedGraph
+from providers import SimulatedBarFeed, SyntheticProvider, get_provider, set_provider
+from flask import Flask
+import functools
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+
+"""
+Covers live mode in `live.py`. The incremental AR update must give the same forecast as refitting `PredictedGraph`
+on the extended series, the hub must append simulated bars and push one event per bar to every subscribed client, and
+the server-sent events route must stream JSON events and unsubscribe when the client disconnects. Series start from
+history at the feed's bar interval, downloaded into a data directory that may not exist yet, and downloaded again
+when the partition predates the current session.
+"""
+def _history(ticker, n=150):
+    values = 100 + np.cumsum(np.random.default_rng(len(ticker)).standard_normal(n))
+    dates = pd.date_range("2024-01-01", periods=n, freq="B").strftime("%Y-%m-%d")
+    return list(zip(dates, values))
+
+
+def test_incremental_ar_matches_refit():
+    data = _history("AR")
+    model = IncrementalAR([v for _, v in data[:100]], 5)
+    for date, value in data[100:]:
+        forecast = model.append(value)
+    assert forecast == pytest.approx(PredictedGraph(data=data).predict_tomorrow(5), rel=1e-9)
+
+
+def test_hub_pushes_bars_to_clients():
+    hub = LiveHub(feed=SimulatedBarFeed(poll_seconds=3600, seed=1), lag_days=5, days=10, history=_history)
+    first, second = hub.subscribe("aapl"), hub.subscribe("AAPL")
+    try:
+        start = first.get_nowait()
+        assert start["ticker"] == "AAPL" and start["date"] == _history("AAPL")[-1][0]
+        assert hub.poll() == 1 and hub.poll() == 1
+        first.get_nowait()
+        event = first.get_nowait()
+        assert event == second.queue[-1]
+        assert len(hub.series["AAPL"].data) == 152
+        assert event["forecast"] == pytest.approx(
+            PredictedGraph(data=hub.series["AAPL"].data).predict_tomorrow(5), rel=1e-9)
+        assert 0.0 <= event["confidence"] <= 1.0
+    finally:
+        hub.stop()
+
+
+def test_event_stream_route():
+    server = Flask(__name__)
+    hub = register_live(server, LiveHub(feed=SimulatedBarFeed(poll_seconds=3600), lag_days=5, history=_history))
+    client = server.test_client()
+    assert client.get("/live/stream").status_code == 400
+
+    response = client.get("/live/stream?ticker=MSFT", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    chunk = next(response.response)
+    chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+    assert chunk.startswith("data: ")
+    assert json.loads(chunk[len("data: "):])["ticker"] == "MSFT"
+    response.close()
+    assert "MSFT" not in hub.clients
+    hub.stop()
+
+
+def test_default_history_matches_feed_interval(tmp_path):
+    previous = get_provider()
+    set_provider(SyntheticProvider(rows=120, seed=4))
+    price_cache.clear()
+    hub = LiveHub(feed=SimulatedBarFeed(poll_seconds=3600, interval="5m"), lag_days=5, days=10,
+                  history=functools.partial(load_history, data_dir=str(tmp_path / "data"), interval="5m"))
+    try:
+        # No data directory yet: the history is downloaded into a fresh one
+        history = load_history("zzz", data_dir=str(tmp_path / "data"), interval="5m")
+        assert history and (tmp_path / "data" / "ZZZ.5m.csv").exists()
+
+        hub.subscribe("ZZZ")
+        hub.poll()
+        last, new = (pd.Timestamp(date) for date, _ in hub.series["ZZZ"].data[-2:])
+        assert new - last == pd.Timedelta(minutes=5)
+        assert LiveHub(feed=SimulatedBarFeed(interval="5m")).history.keywords == {"interval": "5m"}
+    finally:
+        hub.stop()
+        set_provider(previous)
+        price_cache.clear()
+
+
+def test_history_refreshes_partitions_from_earlier_sessions(tmp_path):
+    previous = get_provider()
+    set_provider(SyntheticProvider(rows=120, seed=4))
+    price_cache.clear()
+    partition = tmp_path / "ZZZ.5m.csv"
+    try:
+        # Written during this session: read as is
+        partition.write_text("Date,Value\n2020-01-02 14:30:00,1.0\n")
+        assert load_history("ZZZ", data_dir=str(tmp_path), interval="5m") == [("2020-01-02 14:30:00", 1.0)]
+
+        # Written days ago: downloaded again
+        old = time.time() - 10 * 24 * 60 * 60
+        os.utime(partition, (old, old))
+        history = load_history("ZZZ", data_dir=str(tmp_path), interval="5m")
+        assert len(history) > 1 and history[0][0] > "2020-01-02"
+    finally:
+        set_provider(previous)
+        price_cache.clear()
@@ -0,0 +1,32 @@
+from bar_store import BarStore
+from cache import price_cache
+from providers import SyntheticProvider, get_provider, set_provider
+import main
+
+"""
+Drives the dashboard's `load_real_data` callback in `main.py` against the synthetic provider. A ticker with no data
+upstream must be reported without touching the graph or the price cache, instead of caching the data.csv the previous
+ticker left behind under the new ticker.
+"""
+class PartialProvider(SyntheticProvider):
+    def download_prices(self, tickers, **kwargs):
+        return {t: df for t, df in super().download_prices(tickers, **kwargs).items() if t != "MSFT"}
+
+
+def test_failed_fetch_keeps_previous_ticker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "bar_store", BarStore(str(tmp_path / "bars")))
+    previous = get_provider()
+    set_provider(PartialProvider(rows=100, seed=3))
+    price_cache.clear()
+    try:
+        main.load_real_data(1, None, "AAPL")
+        aapl = list(main.graph_instance.data)
+        assert len(aapl) == 100 and main.graph_instance.ticker == "AAPL"
+
+        assert main.load_real_data(2, None, "MSFT") == "No data found for MSFT. Please try again."
+        assert price_cache.get(("MSFT", "1d")) is None
+        assert main.graph_instance.ticker == "AAPL" and main.graph_instance.data == aapl
+    finally:
+        set_provider(previous)
+        price_cache.clear()
@@ -0,0 +1,20 @@
+from metrics import MetricsRegistry
+
+"""
+Checks the instrumentation registry in `metrics.py`: a timed block lands in a latency histogram, counters accumulate,
+and both show up in the Prometheus text rendered for the `/metrics` endpoint.
+"""
+def test_timer_and_counter_render():
+    reg = MetricsRegistry()
+    with reg.timer("fetch", source="prices"):
+        pass
+    reg.increment("cache_requests_total", cache="article_titles", result="hit")
+    reg.increment("cache_requests_total", cache="article_titles", result="hit")
+
+    assert reg.histogram("fetch_seconds", source="prices").count == 1
+    assert reg.counter_value("cache_requests_total", cache="article_titles", result="hit") == 2
+
+    text = reg.render()
+    assert 'stockoracle_fetch_seconds_bucket{source="prices",le="+Inf"} 1' in text
+    assert 'stockoracle_fetch_seconds_count{source="prices"} 1' in text
+    assert 'stockoracle_cache_requests_total{cache="article_titles",result="hit"} 2' in text
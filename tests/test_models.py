@@ -0,0 +1,44 @@
+from models import ExpandingFit, get_model, model_options, MODELS
+from predictor_default import PredictedGraph
+from sklearn.linear_model import Ridge
+import numpy as np
+import pandas as pd
+import pytest
+
+"""
+Covers the model registry in `models.py`. The incremental Ridge backtest must match a cold scikit-learn fit at every
+step, warm-started and online models must run through `predict_days_ahead`/`check_confidence` deterministically, and
+the dashboard options must list every registered model.
+"""
+def _graph(n=200, seed=0):
+    values = 100 + np.cumsum(np.random.default_rng(seed).standard_normal(n))
+    dates = pd.date_range("2024-01-01", periods=n, freq="B").strftime("%Y-%m-%d")
+    return PredictedGraph(data=list(zip(dates, values)))
+
+
+def test_incremental_ridge_matches_cold_fits():
+    values = _graph().features().values
+    model = ExpandingFit(get_model("ridge"), values, 5)
+    for rows in (40, 41, 60, 150):
+        m = rows - 5
+        cold = Ridge(alpha=0.01).fit(model.Z[:m], model.target[:m])
+        expected = model.scale[m] * (1 + cold.predict(model.Z[m][None, :])[0])
+        assert model.fit_predict(rows) == pytest.approx(expected, rel=1e-10)
+
+
+@pytest.mark.parametrize("name", ["ridge", "elasticnet", "sgd", "gbr"])
+def test_registered_models_backtest(name):
+    pg = _graph()
+    first = pg.predict_days_ahead(15, 5, model=name).data[-15:]
+    second = pg.predict_days_ahead(15, 5, model=name).data[-15:]
+    assert first == second
+    assert [d for d, _ in first] == [d for d, _ in pg.data[-15:]]
+    assert np.all(np.isfinite([v for _, v in first]))
+    assert 0.0 <= pg.check_confidence(15, 5, model=name) <= 1.0
+
+
+def test_options_and_unknown_model():
+    assert [o["value"] for o in model_options()] == list(MODELS)
+    assert model_options()[0] == {"label": "Default", "value": "default"}
+    with pytest.raises(ValueError):
+        get_model("nope")
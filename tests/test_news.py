@@ -1,10 +1,17 @@
 from fetch_stock_news import get_yahoo_finance_news
+from providers import ReplayProvider
+import os
+
+RECORDING = os.path.join(os.path.dirname(__file__), "fixtures", "recording")
 
 """
-Lightweight test for the news‑scraping helper in `fetch_stock_news.py`. Simply verifies that `get_yahoo_finance_news
-(<ticker>)` returns a Python list, indicating the HTTP request, parsing, and basic error handling succeeded.
+Lightweight test for the news helper in `fetch_stock_news.py`. Verifies that `get_yahoo_finance_news(<ticker>)` returns
+a Python list of at most 5 tagged articles when fed a recorded search payload, and an empty list for an unknown ticker.
 """
 
 def test_news_returns_list():
-    news = get_yahoo_finance_news("AAPL")
+    news = get_yahoo_finance_news("AAPL", provider=ReplayProvider(RECORDING))
     assert isinstance(news, list)
+    assert 0 < len(news) <= 5
+    assert {"title", "url", "sentiment", "date"} <= set(news[0])
+    assert get_yahoo_finance_news("ZZZZ", provider=ReplayProvider(RECORDING)) == []
@@ -0,0 +1,92 @@
+import batch
+from bar_store import Bars, BarStore
+from fetch_stock_data import fetch_and_save_data, fetch_and_save_many
+from predictor_default import PredictedGraph
+from providers import SyntheticProvider
+import os
+import numpy as np
+import pytest
+
+"""
+Covers full-precision OHLCV storage and the ARX model. Streamed intraday windows must land in the columnar bar store
+once, with float32 prices and int64 volume matching the unrounded closes of the CSV. The batched ARX backtest must
+match a separate least-squares fit per origin, optionally with a sentiment regressor, and must ask for bars when none
+are attached. Batch ARX backtests attach the daily sentiment, and commits swap generations of the stored bars without
+removing the ones readers may still map.
+"""
+def _load(tmp_path, interval="5m"):
+    store = BarStore(str(tmp_path / "bars"))
+    csv = tmp_path / "prices.csv"
+    fetch_and_save_data("AAPL", str(csv), provider=SyntheticProvider(seed=5, end="2025-06-30"), interval=interval,
+                        period="10d", window_days=3, end="2025-07-01", bar_store=store)
+    graph = PredictedGraph(filename=str(csv), bars=store.load("AAPL", interval))
+    graph.read_csv()
+    return graph
+
+
+def test_bars_are_compact_and_full_precision(tmp_path):
+    graph = _load(tmp_path)
+    bars = graph.bars
+    assert len(bars) == len(graph.data)
+    assert bars.close.dtype == np.float32 and bars.volume.dtype == np.int64 and bars.date.dtype == np.int64
+    assert bars.nbytes == 32 * len(bars)
+    assert np.all(np.diff(bars.date) > 0)
+
+    values = np.array([value for _, value in graph.data])
+    assert not np.allclose(values, np.round(values))          # closes are no longer rounded to ints
+    assert np.allclose(bars.close, values, rtol=1e-6)
+    assert np.all(bars.high >= bars.low)
+
+
+def test_arx_batched_matches_lstsq(tmp_path):
+    graph = _load(tmp_path)
+    lag, days = 6, 12
+    tail = graph.predict_days_ahead(days, lag, model="arx").data[-days:]
+
+    values = graph.features().values
+    windows = np.lib.stride_tricks.sliding_window_view(values, lag)
+    design = np.column_stack([windows, graph.exogenous()[lag - 1:], np.ones(len(windows))])
+    n = len(values)
+    for (date, predicted), rows in zip(tail, range(n - days, n)):
+        coeffs = np.linalg.lstsq(design[:rows - lag], values[lag:rows], rcond=None)[0]
+        assert predicted == pytest.approx(design[rows - lag] @ coeffs, rel=1e-6)
+    assert graph.predict_tomorrow(lag, model="arx") == pytest.approx(
+        graph._arx_predict(lag, [n])[0])
+
+
+def test_arx_sentiment_and_missing_bars(tmp_path):
+    graph = _load(tmp_path)
+    assert graph.exogenous().shape[1] == 2
+    graph.sentiment = {date[:10]: float(i % 3 - 1) for i, (date, _) in enumerate(graph.data)}
+    assert graph.exogenous().shape[1] == 3
+    assert np.isfinite(graph.check_confidence(10, 6, model="arx"))
+
+    with pytest.raises(ValueError, match="OHLCV"):
+        PredictedGraph(data=list(graph.data)).predict_tomorrow(6, model="arx")
+
+
+def test_batch_arx_uses_daily_sentiment(tmp_path, monkeypatch):
+    data_dir, bars_dir = str(tmp_path / "data"), str(tmp_path / "bars")
+    fetch_and_save_many(["AAA"], directory=data_dir, provider=SyntheticProvider(rows=120, seed=2),
+                        bar_store=BarStore(bars_dir))
+    calls = []
+    monkeypatch.setattr(batch, "get_daily_sentiment", lambda ticker: calls.append(ticker) or {})
+
+    row = batch.run_backtest("AAA", "arx", 10, 5, data_dir, bars_dir)
+    assert calls == ["AAA"] and row.get("error") is None
+
+
+def test_commit_swaps_generations(tmp_path):
+    store = BarStore(str(tmp_path / "bars"))
+    frame = SyntheticProvider(rows=50, seed=1).download_prices(["AAPL"])["AAPL"].reset_index()
+    store.write("AAPL", Bars.from_frame(frame))
+    first = store.load("AAPL")
+
+    store.write("AAPL", Bars.from_frame(frame.iloc[:40]))
+    assert len(store.load("AAPL")) == 40 and len(first) == 50
+    store.write("AAPL", Bars.from_frame(frame.iloc[:30]))
+
+    # CURRENT plus the live and the previous generation
+    entries = sorted(os.listdir(store.path("AAPL")))
+    assert len(entries) == 3 and "CURRENT" in entries
+    assert len(store.load("AAPL")) == 30
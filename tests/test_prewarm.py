@@ -0,0 +1,60 @@
+import datetime
+import time
+import prewarm
+from cache import article_title_cache, forecast_cache, news_cache, price_cache
+from predictor_default import PredictedGraph
+from providers import SyntheticProvider
+
+"""
+Runs the pre-warmer once against the synthetic provider and checks that prices, news, article titles and the default
+forecast land in the shared caches the dashboard reads, that a second forecast request is a cache hit, that the
+after-close schedule skips weekends, and that entries warmed after Friday's close are still cached at Monday's open.
+"""
+def test_run_once_fills_caches(tmp_path, monkeypatch):
+    for cache in (price_cache, news_cache, forecast_cache):
+        cache.clear()
+    titles = []
+    monkeypatch.setattr(prewarm, "get_article_title", titles.append)
+
+    warmer = prewarm.Prewarmer(["aapl", "msft"], data_dir=str(tmp_path), parameters=((10, 5),),
+                               provider=SyntheticProvider(rows=120, seed=1))
+    result = warmer.run_once()
+
+    assert set(result["saved"]) == {"AAPL", "MSFT"} and not result["failed"]
+    prices = price_cache.get(("AAPL", "1d"))
+    assert len(prices) == 120
+    assert news_cache.get("MSFT") and titles
+
+    graph = PredictedGraph(data=list(prices))
+    cached = prewarm.default_forecast(graph, "AAPL", 10, 5)
+    assert len(forecast_cache) == 2
+    assert cached["confidence"] == graph.check_confidence(10, 5)
+    assert len(cached["intervals"]) == 10
+
+
+def test_next_run_after_close_skips_weekend():
+    friday_evening = datetime.datetime(2026, 10, 16, 21, 0, tzinfo=datetime.timezone.utc)  # 17:00 New York
+    run = prewarm.next_run_after(friday_evening, "16:15")
+    assert run.strftime("%Y-%m-%d %H:%M") == "2026-10-19 16:15"
+
+
+def test_after_close_entries_last_until_next_open(tmp_path, monkeypatch):
+    for cache in (price_cache, news_cache, article_title_cache, forecast_cache):
+        cache.clear()
+    clock = [datetime.datetime(2026, 10, 16, 20, 20, tzinfo=datetime.timezone.utc).timestamp()]  # Fri 16:20 New York
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    monkeypatch.setattr(prewarm, "get_article_title", lambda url: f"title of {url}")
+
+    warmer = prewarm.Prewarmer(["AAPL"], data_dir=str(tmp_path), parameters=((10, 5),),
+                               provider=SyntheticProvider(rows=120, seed=1))
+    warmer.run_once()
+    url = news_cache.get("AAPL")[0]["url"]
+
+    # Monday 09:35 New York: the first requests of the week are served warm
+    clock[0] = datetime.datetime(2026, 10, 19, 13, 35, tzinfo=datetime.timezone.utc).timestamp()
+    assert price_cache.get(("AAPL", "1d")) is not None
+    assert news_cache.get("AAPL") and article_title_cache.get(url) == f"title of {url}"
+
+    # Past Monday's run and its grace period the entries expire as usual
+    clock[0] = datetime.datetime(2026, 10, 19, 21, 30, tzinfo=datetime.timezone.utc).timestamp()
+    assert price_cache.get(("AAPL", "1d")) is None and news_cache.get("AAPL") is None
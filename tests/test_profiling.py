@@ -0,0 +1,24 @@
+from profiling import profile_request, span
+from predictor_default import PredictedGraph
+
+"""
+Covers the opt-in profiler in `profiling.py`. With the switch off, `span()` must hand back the shared no-op context and
+nothing is written; with it forced on for one request, a backtest produces a cProfile stats file, a folded stack dump and
+per-stage span timings.
+"""
+def test_profile_request_writes_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr("profiling.PROFILE_DIR", str(tmp_path))
+    pg = PredictedGraph(data=[(f"2024-01-{i+1:02d}", 100 + i) for i in range(30)])
+
+    with profile_request("off", enabled=False) as session:
+        assert session is None
+        assert span("fit.lstsq") is span("other")
+    assert list(tmp_path.iterdir()) == []
+
+    with profile_request("backtest", enabled=True) as session:
+        pg.predict_days_ahead(5, 3)
+
+    assert session.spans["fit.lstsq"][1] == 5
+    assert session.spans["backtest"][1] == 1
+    names = sorted(p.suffix for p in tmp_path.iterdir())
+    assert names == [".folded", ".prof"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import providers
+from fetch_stock_data import fetch_and_save_data
+from graph import Graph
+from providers import SyntheticProvider, ReplayProvider, RecordingProvider
+
+"""
+Covers the offline providers in `providers.py`. The synthetic market must be deterministic per (seed, ticker), produce
+the requested number of consistent OHLCV business-day bars and a headline stream, and a recording of it must replay
+identically through `ReplayProvider`. Yahoo results are matched to lowercase tickers.
+"""
+def test_synthetic_is_deterministic_and_replayable(tmp_path):
+    synthetic = SyntheticProvider(rows=500, seed=3, end="2025-06-30")
+    frames = synthetic.download_prices(["AAPL", "MSFT"])
+    df = frames["AAPL"]
+
+    assert len(df) == 500
+    assert df.index.is_monotonic_increasing and (df.index.dayofweek < 5).all()
+    assert (df["High"] >= df[["Open", "Close"]].max(axis=1)).all()
+    assert (df["Low"] <= df[["Open", "Close"]].min(axis=1)).all()
+    assert not df["Close"].equals(frames["MSFT"]["Close"])
+    again = SyntheticProvider(rows=500, seed=3, end="2025-06-30").download_prices(["AAPL"])["AAPL"]
+    assert df.equals(again)
+
+    recorder = RecordingProvider(synthetic, str(tmp_path))
+    recorder.download_prices(["AAPL"], period="2y")
+    news = recorder.search_news("AAPL")
+    assert len(news) == 500 * synthetic.headlines_per_day
+
+    replay = ReplayProvider(str(tmp_path))
+    replayed = replay.download_prices(["AAPL"], period="2y")["AAPL"]
+    assert replayed.index.equals(df.index)
+    assert (replayed["Close"] - df["Close"]).abs().max() < 1e-9
+    assert replay.search_news("AAPL") == news
+
+
+def test_yahoo_matches_lowercase_tickers(tmp_path, monkeypatch):
+    index = pd.bdate_range("2025-01-01", periods=3, name="Date")
+    columns = pd.MultiIndex.from_product([["AAPL"], ["Open", "High", "Low", "Close", "Volume"]])
+    payload = pd.DataFrame(np.arange(15, dtype=float).reshape(3, 5), index=index, columns=columns)
+    monkeypatch.setattr(providers.yf, "download", lambda tickers, **kwargs: payload)
+
+    yahoo = providers.YahooProvider()
+    assert list(yahoo.download_prices(["aapl"])) == ["aapl"]
+
+    filename = str(tmp_path / "data.csv")
+    fetch_and_save_data("aapl", filename, provider=yahoo)
+    graph = Graph(filename=filename)
+    graph.read_csv()
+    assert [value for _, value in graph.data] == [3.0, 8.0, 13.0]
@@ -0,0 +1,45 @@
+from cache import news_cache
+from fetch_stock_data import fetch_and_save_data
+from fetch_stock_news import get_daily_sentiment
+from predictor_sentimental import PredictorSentimental
+from providers import SyntheticProvider
+import numpy as np
+import pandas as pd
+
+"""
+Covers the vectorized simulation of `PredictorSentimental.predict_days_ahead()`. Predicted dates must be the series' own
+trading days (no weekends), the headlines must be searched once per run, each prediction must equal the price lag_days
+trading days earlier adjusted by that day's sentiment, and repeated runs must give identical results.
+"""
+class CountingProvider(SyntheticProvider):
+    searches = 0
+
+    def search_news(self, symbol):
+        CountingProvider.searches += 1
+        return super().search_news(symbol)
+
+
+def test_simulation_follows_trading_calendar(tmp_path):
+    news_cache.clear()
+    provider = CountingProvider(rows=300, seed=4, end="2025-06-30")
+    csv = tmp_path / "prices.csv"
+    fetch_and_save_data("AAPL", str(csv), provider=provider)
+    history = pd.read_csv(csv)
+
+    predictor = PredictorSentimental("AAPL", filename=str(csv), provider=provider)
+    graph = predictor.predict_days_ahead(120, 5)
+    assert CountingProvider.searches == 1
+
+    dates = [date for date, _ in graph.data]
+    assert dates == history["Date"].tolist()
+    assert all(pd.Timestamp(date).dayofweek < 5 for date in dates[-120:])
+
+    daily = get_daily_sentiment("AAPL", provider=provider)
+    assert any(daily.get(date) for date in dates[-125:])
+    values = history["Value"].to_numpy()
+    for row in (len(values) - 120, len(values) - 1):
+        expected = values[row - 5] * (1 + 0.25 * daily.get(dates[row - 5], 0.0))
+        assert np.isclose(graph.data[row][1], expected)
+    assert np.allclose([value for _, value in graph.data[:-120]], values[:-120])
+
+    assert predictor.predict_days_ahead(120, 5).data == graph.data
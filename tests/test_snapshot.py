@@ -0,0 +1,158 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import snapshot
+from bar_store import current_generation
+from cache import article_title_cache, forecast_cache, news_cache, price_cache
+from fetch_stock_data import partition_path
+from graph import Graph
+from predictor_default import PredictedGraph
+from prewarm import default_forecast
+
+"""
+Snapshots the shared caches, clears them as a restart would, and restores them: price series come back memory-mapped
+with the same values, forecasts are cache hits again, tickers whose partition changed are dropped, and snapshots of
+another format version are ignored. A failed save keeps the previous snapshot.
+"""
+CACHES = (price_cache, news_cache, article_title_cache, forecast_cache)
+
+
+def _clear():
+    for cache in CACHES:
+        cache.clear()
+
+
+def _fill(data_dir):
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2026-01-01", periods=80).strftime("%Y-%m-%d")
+    for ticker in ("AAPL", "MSFT"):
+        values = 100 + np.cumsum(rng.normal(0, 1, 80))
+        graph = PredictedGraph(data=[(date, float(value)) for date, value in zip(dates, values)])
+        graph.write_csv(partition_path(ticker, data_dir))
+        price_cache.set((ticker, "1d"), list(graph.data))
+        default_forecast(graph, ticker, 10, 5, n_boot=50)
+    news_cache.set("AAPL", [{"title": "Apple rallies", "url": "https://example.com/a"}])
+    article_title_cache.set("https://example.com/a", "Apple rallies")
+
+
+def test_restore_round_trip(tmp_path):
+    _clear()
+    data_dir, root = str(tmp_path / "data"), str(tmp_path / "snapshot")
+    os.makedirs(data_dir)
+    _fill(data_dir)
+    prices = list(price_cache.get(("AAPL", "1d")))
+    forecast = forecast_cache.get(next(key for key, *_ in forecast_cache.entries() if key[1] == "AAPL"))
+
+    counts = snapshot.save_snapshot(root, data_dir)
+    assert counts == {"prices": 2, "news": 1, "article_titles": 1, "forecasts": 2}
+    _clear()
+
+    restored = snapshot.restore_snapshot(root, data_dir)
+    assert restored["prices"] == 2 and restored["forecasts"] == 2 and restored["stale"] == []
+    series = price_cache.get(("AAPL", "1d"))
+    assert isinstance(series, snapshot.SeriesView) and isinstance(series.values, np.memmap)
+    assert list(series) == prices
+    assert article_title_cache.get("https://example.com/a") == "Apple rallies"
+
+    graph = PredictedGraph(data=list(series))
+    assert default_forecast(graph, "AAPL", 10, 5, n_boot=50) == forecast
+    assert len(forecast_cache) == 2
+
+    # A re-snapshot of restored (mapped) series replaces the directory the series are mapped from
+    snapshot.save_snapshot(root, data_dir)
+    assert list(series) == prices
+    _clear()
+
+
+def test_changed_source_is_dropped(tmp_path):
+    _clear()
+    data_dir, root = str(tmp_path / "data"), str(tmp_path / "snapshot")
+    os.makedirs(data_dir)
+    _fill(data_dir)
+    snapshot.save_snapshot(root, data_dir)
+    _clear()
+
+    graph = Graph(filename=partition_path("MSFT", data_dir))
+    graph.read_csv()
+    graph.data.append(("2026-06-01", 1.0))
+    graph.write_csv(partition_path("MSFT", data_dir))
+
+    restored = snapshot.restore_snapshot(root, data_dir)
+    assert restored["stale"] == ["MSFT"]
+    assert price_cache.get(("MSFT", "1d")) is None and price_cache.get(("AAPL", "1d")) is not None
+    assert {key[1] for key, *_ in forecast_cache.entries()} == {"AAPL"}
+    _clear()
+
+
+def test_other_format_is_ignored(tmp_path):
+    _clear()
+    root = str(tmp_path / "snapshot")
+    _fill(str(tmp_path))
+    snapshot.save_snapshot(root, str(tmp_path))
+    _clear()
+
+    path = os.path.join(current_generation(root), "meta.json")
+    with open(path) as f:
+        meta = json.load(f)
+    meta["format"] = snapshot.FORMAT_VERSION + 1
+    with open(path, "w") as f:
+        json.dump(meta, f)
+
+    assert snapshot.restore_snapshot(root, str(tmp_path)) == {}
+    assert len(price_cache) == 0
+
+
+def test_upstream_series_expire_at_the_close(tmp_path, monkeypatch):
+    _clear()
+    root = str(tmp_path / "snapshot")
+    clock = [pd.Timestamp("2026-10-19 11:00", tz="America/New_York").timestamp()]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+
+    # Loaded by the dashboard: no partition behind either series
+    price_cache.set(("NVDA", "5m"), [("2026-10-19 14:55:00", 180.0), ("2026-10-19 15:00:00", 181.0)])
+    price_cache.set(("AMD", "1d"), [("2026-10-16", 230.0), ("2026-10-19", 231.0)])
+    graph = PredictedGraph(data=list(price_cache.get(("AMD", "1d"))))
+    forecast_cache.set(("default", "AMD", graph.features().version, 1, 1, 0), {"confidence": 1.0})
+    snapshot.save_snapshot(root, str(tmp_path))
+
+    # Restarted before the close: both series are still current
+    clock[0] += 60 * 60
+    _clear()
+    restored = snapshot.restore_snapshot(root, str(tmp_path))
+    assert restored["prices"] == 2 and restored["forecasts"] == 1 and restored["stale"] == []
+
+    # Restarted after the close: upstream has newer bars, and the forecast goes with its series
+    clock[0] += 6 * 60 * 60
+    _clear()
+    restored = snapshot.restore_snapshot(root, str(tmp_path))
+    assert restored["prices"] == 0 and restored["forecasts"] == 0 and restored["stale"] == ["AMD", "NVDA.5m"]
+    _clear()
+
+
+def test_failed_save_keeps_previous_snapshot(tmp_path, monkeypatch):
+    _clear()
+    root = str(tmp_path / "snapshot")
+    _fill(str(tmp_path))
+    snapshot.save_snapshot(root, str(tmp_path))
+    first = current_generation(root)
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(snapshot.pickle, "dump", crash)
+    with pytest.raises(OSError):
+        snapshot.save_snapshot(root, str(tmp_path))
+    monkeypatch.undo()
+    assert current_generation(root) == first
+    assert sorted(os.listdir(root)) == sorted(["CURRENT", os.path.basename(first)])
+
+    _clear()
+    assert snapshot.restore_snapshot(root, str(tmp_path))["prices"] == 2
+
+    # Later saves keep the generation the restored series may still be mapped from, and prune older ones
+    for _ in range(3):
+        snapshot.save_snapshot(root, str(tmp_path))
+    assert len(os.listdir(root)) == 3 and current_generation(root) != first
+    _clear()